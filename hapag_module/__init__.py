@@ -12,6 +12,7 @@ Components:
 - data_extractor: Import surcharges table parsing
 - excel_exporter: Excel file management and data export
 - main_runner: Main automation workflow
+- daemon: Long-lived browser that runs can attach to over CDP
 """
 
 __version__ = "1.0.0"
@@ -0,0 +1,29 @@
+"""
+Shared logger for Hapag-Lloyd automation.
+
+Log records are handed to a queue and written to stdout by a single
+background listener thread, so concurrent destination tasks never block
+on console I/O.
+"""
+
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+logger = logging.getLogger("hapag")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+logger.addHandler(QueueHandler(_log_queue))
+
+_listener = QueueListener(_log_queue, _stream_handler)
+_listener.start()
+
+# Flush remaining records before the interpreter exits
+atexit.register(_listener.stop)
@@ -5,11 +5,13 @@ This module handles credential loading and login automation.
 """
 
 import os
-import time
+import asyncio
 from typing import Optional
-from playwright.sync_api import Page
+from playwright.async_api import Page
 from dotenv import load_dotenv
 
+from ._log import logger
+
 
 class AuthManager:
     """Manages authentication and login for Hapag-Lloyd."""
@@ -35,15 +37,15 @@ class AuthManager:
         self.password = os.getenv('HAPAG_PASSWORD')
         
         if not self.email or not self.password:
-            print("❌ ERROR: HAPAG_EMAIL and HAPAG_PASSWORD must be set in .env file")
-            print("💡 Create a .env file with:")
-            print("   HAPAG_EMAIL=your_email@example.com")
-            print("   HAPAG_PASSWORD=your_password")
+            logger.error("❌ ERROR: HAPAG_EMAIL and HAPAG_PASSWORD must be set in .env file")
+            logger.info("💡 Create a .env file with:")
+            logger.info("   HAPAG_EMAIL=your_email@example.com")
+            logger.info("   HAPAG_PASSWORD=your_password")
             raise ValueError("Missing credentials in environment variables")
         
-        print("✅ Credentials loaded from environment")
+        logger.info("✅ Credentials loaded from environment")
     
-    def login(self, page: Page) -> bool:
+    async def login(self, page: Page) -> bool:
         """
         Perform login to Hapag-Lloyd.
         
@@ -54,38 +56,38 @@ class AuthManager:
             True if login successful, False otherwise
         """
         if not self.email or not self.password:
-            print("❌ ERROR: No credentials available")
+            logger.error("❌ ERROR: No credentials available")
             return False
         
-        print("🔐 Logging in to Hapag-Lloyd...")
+        logger.info("🔐 Logging in to Hapag-Lloyd...")
         
         try:
             # Fill email field
-            print("   📧 Entering email...")
+            logger.info("   📧 Entering email...")
             email_field = page.get_by_role("textbox", name="E-mail Address")
-            email_field.click()
-            email_field.fill(self.email)
-            email_field.press("Tab")
+            await email_field.click()
+            await email_field.fill(self.email)
+            await email_field.press("Tab")
             
             # Fill password field
-            print("   🔒 Entering password...")
+            logger.info("   🔒 Entering password...")
             password_field = page.get_by_role("textbox", name="Password")
-            password_field.fill(self.password)
-            password_field.press("Enter")
+            await password_field.fill(self.password)
+            await password_field.press("Enter")
             
             # Wait for redirect back to quote page
-            print("⏳ Waiting for quote page to load after login...")
-            page.get_by_test_id("start-input").wait_for(timeout=30000)
-            time.sleep(2)
+            logger.info("⏳ Waiting for quote page to load after login...")
+            await page.get_by_test_id("start-input").wait_for(timeout=30000)
+            await asyncio.sleep(2)
             
-            print("✅ Login successful!")
+            logger.info("✅ Login successful!")
             return True
             
         except Exception as e:
-            print(f"❌ LOGIN ERROR: {e}")
+            logger.error(f"❌ LOGIN ERROR: {e}")
             return False
     
-    def verify_login_status(self, page: Page) -> bool:
+    async def verify_login_status(self, page: Page) -> bool:
         """
         Verify if user is already logged in.
         
@@ -98,13 +100,13 @@ class AuthManager:
         try:
             # Check if we're already on the quote page (logged in)
             start_input = page.get_by_test_id("start-input")
-            start_input.wait_for(state="visible", timeout=5000)
+            await start_input.wait_for(state="visible", timeout=5000)
             
-            print("ℹ️ Already logged in, skipping authentication")
+            logger.info("ℹ️ Already logged in, skipping authentication")
             return True
             
         except:
-            print("ℹ️ Login required")
+            logger.info("ℹ️ Login required")
             return False
     
     def get_credentials(self) -> tuple[Optional[str], Optional[str]]:
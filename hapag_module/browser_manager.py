@@ -5,29 +5,121 @@ This module handles browser initialization, stealth mode setup, and
 basic navigation functionality.
 """
 
+import asyncio
+import os
 import time
-from typing import Optional, Dict, Any
-from playwright.sync_api import Playwright, Browser, BrowserContext, Page
+from typing import Optional, Dict, Any, List, Tuple
+from playwright.async_api import Playwright, Browser, BrowserContext, Page
 from playwright_stealth import Stealth
 
+from ._log import logger
+
+HAPAG_QUOTE_URL = "https://www.hapag-lloyd.com/solutions/new-quote/#/simple?language=en"
+
+# CDP endpoint of a running browser daemon (python -m hapag_module.daemon)
+BROWSER_WS_ENV = "HAPAG_BROWSER_WS"
+
+# Saved login session (cookies, local storage) reused across runs
+AUTH_STATE_PATH = ".auth_state.json"
+AUTH_STATE_MAX_AGE_HOURS = 12
+
+# Default bounds for auto-waits and navigations; long waits (search results,
+# login, Cloudflare) pass their own timeout explicitly
+DEFAULT_TIMEOUT_MS = 5000
+DEFAULT_NAVIGATION_TIMEOUT_MS = 15000
+
+# Resource types aborted by the request filter; none of them carry quote data
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+
+async def _abort_heavy_resources(route) -> None:
+    """Abort image/font/media requests and let everything else through."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def apply_page_timeouts(page: Page) -> None:
+    """
+    Bound every auto-wait on a page so a mismatched selector fails fast.
+    
+    Args:
+        page: Page to configure
+    """
+    page.set_default_timeout(DEFAULT_TIMEOUT_MS)
+    page.set_default_navigation_timeout(DEFAULT_NAVIGATION_TIMEOUT_MS)
+
+
+async def apply_resource_blocking(context: BrowserContext) -> None:
+    """
+    Stop a context from downloading images, fonts and media.
+    
+    Args:
+        context: Browser context to filter
+    """
+    await context.route("**/*", _abort_heavy_resources)
+
 
 class BrowserManager:
     """Manages browser instances and stealth configuration."""
     
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, block_resources: bool = True):
         """
         Initialize BrowserManager.
         
         Args:
             headless: Whether to run browser in headless mode
+            block_resources: Whether to skip loading images, fonts and media
         """
         self.headless = headless
+        self.block_resources = block_resources
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self.context_pool: Optional["BrowserContextPool"] = None
         self.stealth = Stealth()
+        self.auth_state_loaded = False
+        self.connected_to_daemon = False
     
-    def launch_browser(self, playwright: Playwright) -> Page:
+    def _auth_state_is_fresh(self) -> bool:
+        """
+        Check whether a saved login session exists and is recent enough to reuse.
+        
+        Returns:
+            True if the saved session file can be loaded, False otherwise
+        """
+        if not os.path.exists(AUTH_STATE_PATH):
+            return False
+        
+        age_hours = (time.time() - os.path.getmtime(AUTH_STATE_PATH)) / 3600
+        return age_hours < AUTH_STATE_MAX_AGE_HOURS
+    
+    async def _connect_to_daemon(self, playwright: Playwright) -> Optional[Browser]:
+        """
+        Attach to an already running browser if HAPAG_BROWSER_WS is set.
+        
+        Args:
+            playwright: Playwright instance
+            
+        Returns:
+            Connected Browser, or None to launch a local one
+        """
+        endpoint = os.environ.get(BROWSER_WS_ENV)
+        if not endpoint:
+            return None
+        
+        try:
+            browser = await playwright.chromium.connect_over_cdp(endpoint, slow_mo=100)
+            self.connected_to_daemon = True
+            logger.info(f"🔗 Connected to running browser at {endpoint}")
+            return browser
+            
+        except Exception as e:
+            logger.warning(f"⚠️ WARNING: Could not connect to {endpoint}, launching locally: {e}")
+            return None
+    
+    async def launch_browser(self, playwright: Playwright) -> Page:
         """
         Launch browser with stealth configuration.
         
@@ -37,28 +129,44 @@ class BrowserManager:
         Returns:
             Page object ready for automation
         """
-        print(f"🌐 Launching browser (headless={self.headless})...")
+        self.browser = await self._connect_to_daemon(playwright)
         
-        # Launch browser with slow_mo to appear more human-like
-        self.browser = playwright.chromium.launch(
-            headless=self.headless,
-            slow_mo=100  # 100ms delay between actions to appear human-like
-        )
-        self.context = self.browser.new_context()
-        self.page = self.context.new_page()
+        if self.browser is None:
+            logger.info(f"🌐 Launching browser (headless={self.headless})...")
+            
+            # Launch browser with slow_mo to appear more human-like
+            self.browser = await playwright.chromium.launch(
+                headless=self.headless,
+                slow_mo=100  # 100ms delay between actions to appear human-like
+            )
+        
+        # Reuse the saved login session when it is still fresh
+        if self._auth_state_is_fresh():
+            logger.info(f"🔑 Loading saved session from {AUTH_STATE_PATH}")
+            self.context = await self.browser.new_context(storage_state=AUTH_STATE_PATH)
+            self.auth_state_loaded = True
+        else:
+            self.context = await self.browser.new_context()
+        
+        if self.block_resources:
+            await apply_resource_blocking(self.context)
+        
+        self.page = await self.context.new_page()
+        apply_page_timeouts(self.page)
         
         # Apply stealth mode to avoid detection
-        print("🥷 Applying stealth mode...")
-        self.stealth.apply_stealth_sync(self.page)
+        logger.info("🥷 Applying stealth mode...")
+        await self.stealth.apply_stealth_async(self.page)
         
         return self.page
     
-    def navigate_to_hapag(self, page: Optional[Page] = None) -> None:
+    async def navigate_to_hapag(self, page: Optional[Page] = None, url: Optional[str] = None) -> None:
         """
         Navigate to Hapag-Lloyd quote page.
         
         Args:
             page: Page instance to use. If None, uses self.page
+            url: Quote page URL to open. If None, uses the default quote URL
         """
         if page is None:
             page = self.page
@@ -66,17 +174,18 @@ class BrowserManager:
         if page is None:
             raise ValueError("No page instance available")
         
-        url = "https://www.hapag-lloyd.com/solutions/new-quote/#/simple?language=en"
-        print(f"🌐 Navigating to: {url}")
+        if url is None:
+            url = HAPAG_QUOTE_URL
+        logger.info(f"🌐 Navigating to: {url}")
         
         try:
-            page.goto(url)
-            print("✅ Successfully navigated to Hapag-Lloyd")
+            await page.goto(url)
+            logger.info("✅ Successfully navigated to Hapag-Lloyd")
         except Exception as e:
-            print(f"❌ ERROR navigating to Hapag-Lloyd: {e}")
+            logger.error(f"❌ ERROR navigating to Hapag-Lloyd: {e}")
             raise
     
-    def wait_for_page_load(self, page: Optional[Page] = None, timeout: int = 120000) -> bool:
+    async def wait_for_page_load(self, page: Optional[Page] = None, timeout: int = 120000) -> bool:
         """
         Wait for Hapag-Lloyd page to load completely.
         
@@ -93,20 +202,20 @@ class BrowserManager:
         if page is None:
             raise ValueError("No page instance available")
         
-        print("⏳ Waiting for login page to appear (handle Cloudflare manually if needed)...")
+        logger.info("⏳ Waiting for login page to appear (handle Cloudflare manually if needed)...")
         
         try:
             # Wait for login fields to appear
-            page.get_by_role("textbox", name="E-mail Address").wait_for(timeout=timeout)
-            time.sleep(1)
-            print("✅ Login page loaded successfully")
+            await page.get_by_role("textbox", name="E-mail Address").wait_for(timeout=timeout)
+            await asyncio.sleep(1)
+            logger.info("✅ Login page loaded successfully")
             return True
             
         except Exception as e:
-            print(f"❌ ERROR: Login page did not load within {timeout/1000} seconds: {e}")
+            logger.error(f"❌ ERROR: Login page did not load within {timeout/1000} seconds: {e}")
             return False
     
-    def handle_cookie_consent(self, page: Optional[Page] = None) -> bool:
+    async def handle_cookie_consent(self, page: Optional[Page] = None) -> bool:
         """
         Handle cookie consent dialog if present.
         
@@ -123,16 +232,16 @@ class BrowserManager:
             raise ValueError("No page instance available")
         
         try:
-            page.get_by_role("button", name="Select All").click()
-            time.sleep(0.5)
-            print("✅ Cookie consent accepted")
+            await page.get_by_role("button", name="Select All").click()
+            await asyncio.sleep(0.5)
+            logger.info("✅ Cookie consent accepted")
             return True
             
         except Exception:
-            print("ℹ️ Cookie consent not required or already accepted")
+            logger.info("ℹ️ Cookie consent not required or already accepted")
             return True
     
-    def handle_cloudflare_challenge(self, page: Optional[Page] = None, timeout: int = 60000) -> bool:
+    async def handle_cloudflare_challenge(self, page: Optional[Page] = None, timeout: int = 60000) -> bool:
         """
         Handle Cloudflare challenge/checkbox if present.
         
@@ -149,7 +258,7 @@ class BrowserManager:
         if page is None:
             raise ValueError("No page instance available")
         
-        print("🔍 Checking for Cloudflare challenge...")
+        logger.info("🔍 Checking for Cloudflare challenge...")
         
         try:
             # Look for Cloudflare challenge iframe
@@ -157,27 +266,50 @@ class BrowserManager:
             
             # Try to find and click the checkbox
             checkbox = cf_iframe.locator("input[type='checkbox']")
-            if checkbox.count() > 0:
-                print("🤖 Cloudflare challenge detected, attempting to click checkbox...")
-                checkbox.first.click()
-                time.sleep(3)  # Wait for verification
-                print("✅ Cloudflare checkbox clicked")
+            if await checkbox.count() > 0:
+                logger.info("🤖 Cloudflare challenge detected, attempting to click checkbox...")
+                await checkbox.first.click()
+                await asyncio.sleep(3)  # Wait for verification
+                logger.info("✅ Cloudflare checkbox clicked")
                 return True
             
             # Also try the turnstile checkbox
             turnstile = cf_iframe.locator(".ctp-checkbox-label")
-            if turnstile.count() > 0:
-                print("🤖 Cloudflare Turnstile detected, attempting to click...")
-                turnstile.first.click()
-                time.sleep(3)
-                print("✅ Cloudflare Turnstile clicked")
+            if await turnstile.count() > 0:
+                logger.info("🤖 Cloudflare Turnstile detected, attempting to click...")
+                await turnstile.first.click()
+                await asyncio.sleep(3)
+                logger.info("✅ Cloudflare Turnstile clicked")
                 return True
                 
         except Exception as e:
-            print(f"ℹ️ No Cloudflare challenge found or already passed: {e}")
+            logger.info(f"ℹ️ No Cloudflare challenge found or already passed: {e}")
         
         return True
     
+    async def save_auth_state(self) -> None:
+        """Save the current login session so later runs can skip login."""
+        if not self.context:
+            return
+        
+        try:
+            await self.context.storage_state(path=AUTH_STATE_PATH)
+            logger.info(f"🔑 Session saved to {AUTH_STATE_PATH}")
+        except Exception as e:
+            logger.warning(f"⚠️ WARNING: Could not save session: {e}")
+    
+    def discard_auth_state(self) -> None:
+        """Delete a saved login session that no longer works."""
+        self.auth_state_loaded = False
+        
+        try:
+            os.remove(AUTH_STATE_PATH)
+            logger.info(f"🗑️ Discarded stale session {AUTH_STATE_PATH}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"⚠️ WARNING: Could not delete {AUTH_STATE_PATH}: {e}")
+    
     def get_page(self) -> Optional[Page]:
         """
         Get the current page instance.
@@ -187,30 +319,59 @@ class BrowserManager:
         """
         return self.page
     
-    def close_browser(self) -> None:
+    async def create_context_pool(self, size: int) -> "BrowserContextPool":
+        """
+        Create a pool of contexts that reuse the current login session.
+        
+        The storage state (cookies, local storage) of the logged-in context
+        is captured once and used to seed every pooled context.
+        
+        Args:
+            size: Number of contexts in the pool
+            
+        Returns:
+            Opened BrowserContextPool
+        """
+        if not self.browser or not self.context:
+            raise ValueError("No browser context available")
+        
+        storage_state = await self.context.storage_state()
+        
+        self.context_pool = BrowserContextPool(self.browser, self.stealth, size,
+                                               block_resources=self.block_resources)
+        await self.context_pool.open(storage_state)
+        
+        return self.context_pool
+    
+    async def close_browser(self) -> None:
         """Close browser and clean up resources."""
-        print("🔄 Closing browser...")
+        logger.info("🔄 Closing browser...")
         
         try:
+            if self.context_pool:
+                await self.context_pool.close()
+                self.context_pool = None
+            
             if self.context:
-                self.context.close()
-                print("✅ Browser context closed")
+                await self.context.close()
+                logger.info("✅ Browser context closed")
             
             if self.browser:
-                self.browser.close()
-                print("✅ Browser closed")
+                # For a daemon browser this only disconnects; the process stays up
+                await self.browser.close()
+                logger.info("✅ Browser disconnected" if self.connected_to_daemon else "✅ Browser closed")
                 
         except Exception as e:
-            print(f"⚠️ Warning during browser cleanup: {e}")
+            logger.warning(f"⚠️ Warning during browser cleanup: {e}")
     
-    def keep_browser_open(self) -> None:
+    async def keep_browser_open(self) -> None:
         """Keep browser open for manual review."""
-        print("\n" + "="*60)
-        print("🔍 Browser kept open for review")
-        print("="*60)
-        input("Press Enter to close browser...")
+        logger.info("\n" + "="*60)
+        logger.info("🔍 Browser kept open for review")
+        logger.info("="*60)
+        await asyncio.to_thread(input, "Press Enter to close browser...")
         
-    def restart_page(self) -> Page:
+    async def restart_page(self) -> Page:
         """
         Create a new page instance (useful for starting fresh searches).
         
@@ -220,12 +381,84 @@ class BrowserManager:
         if not self.context:
             raise ValueError("No browser context available")
         
-        print("🔄 Creating new page instance...")
+        logger.info("🔄 Creating new page instance...")
         
         if self.page:
-            self.page.close()
+            await self.page.close()
+        
+        self.page = await self.context.new_page()
+        apply_page_timeouts(self.page)
+        await self.stealth.apply_stealth_async(self.page)
         
-        self.page = self.context.new_page()
-        self.stealth.apply_stealth_sync(self.page)
+        return self.page
+
+
+class BrowserContextPool:
+    """Pool of pre-authenticated browser contexts with one page each."""
+    
+    def __init__(self, browser: Browser, stealth: Stealth, size: int,
+                 block_resources: bool = True):
+        """
+        Initialize BrowserContextPool.
+        
+        Args:
+            browser: Browser used to create the contexts
+            stealth: Stealth instance applied to every page
+            size: Number of contexts in the pool
+            block_resources: Whether to skip loading images, fonts and media
+        """
+        self.browser = browser
+        self.stealth = stealth
+        self.size = max(1, size)
+        self.block_resources = block_resources
+        self._entries: List[Tuple[BrowserContext, Page]] = []
+        self._available: asyncio.Queue = asyncio.Queue()
+    
+    async def open(self, storage_state: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Create the pooled contexts and their pages.
+        
+        Args:
+            storage_state: Playwright storage state to seed each context with
+        """
+        logger.info(f"🗂️ Creating {self.size} browser context(s)...")
+        
+        for _ in range(self.size):
+            context = await self.browser.new_context(storage_state=storage_state)
+            if self.block_resources:
+                await apply_resource_blocking(context)
+            page = await context.new_page()
+            apply_page_timeouts(page)
+            await self.stealth.apply_stealth_async(page)
+            
+            entry = (context, page)
+            self._entries.append(entry)
+            self._available.put_nowait(entry)
+    
+    async def acquire(self) -> Tuple[BrowserContext, Page]:
+        """
+        Wait for a free context.
+        
+        Returns:
+            Tuple of (context, page)
+        """
+        return await self._available.get()
+    
+    def release(self, entry: Tuple[BrowserContext, Page]) -> None:
+        """
+        Return a context to the pool.
+        
+        Args:
+            entry: Tuple of (context, page) obtained from acquire()
+        """
+        self._available.put_nowait(entry)
+    
+    async def close(self) -> None:
+        """Close every pooled context."""
+        for context, _ in self._entries:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.warning(f"⚠️ Warning closing pooled context: {e}")
         
-        return self.page
\ No newline at end of file
+        self._entries.clear()
@@ -9,6 +9,8 @@ import os
 import json
 from typing import List, Dict, Any
 
+from ._log import logger
+
 
 class ConfigLoader:
     """Handles loading configuration files and destination data."""
@@ -42,14 +44,14 @@ class ConfigLoader:
                     if line and not line.startswith("#"):  # Skip comments
                         destinations.append(line)
             
-            print(f"✅ Loaded {len(destinations)} destinations from {filename}")
+            logger.info(f"✅ Loaded {len(destinations)} destinations from {filename}")
             return destinations
             
         except FileNotFoundError:
-            print(f"❌ ERROR: {filename} not found in {self.base_dir}")
+            logger.error(f"❌ ERROR: {filename} not found in {self.base_dir}")
             return []
         except Exception as e:
-            print(f"❌ ERROR loading destinations: {e}")
+            logger.error(f"❌ ERROR loading destinations: {e}")
             return []
     
     def load_destination_configs(self, filename: str = "destination_configs.json") -> Dict[str, Any]:
@@ -68,17 +70,17 @@ class ConfigLoader:
             with open(file_path, "r", encoding="utf-8") as f:
                 configs = json.load(f)
             
-            print(f"✅ Loaded configurations for {len(configs)} destinations")
+            logger.info(f"✅ Loaded configurations for {len(configs)} destinations")
             return configs
             
         except FileNotFoundError:
-            print(f"❌ ERROR: {filename} not found in {self.base_dir}")
+            logger.error(f"❌ ERROR: {filename} not found in {self.base_dir}")
             return {}
         except json.JSONDecodeError as e:
-            print(f"❌ ERROR: Invalid JSON in {filename}: {e}")
+            logger.error(f"❌ ERROR: Invalid JSON in {filename}: {e}")
             return {}
         except Exception as e:
-            print(f"❌ ERROR loading destination configs: {e}")
+            logger.error(f"❌ ERROR loading destination configs: {e}")
             return {}
     
     def get_location_code(self, destination: str, configs: Dict[str, Any]) -> str:
@@ -93,12 +95,12 @@ class ConfigLoader:
             Location code string, or empty string if not found
         """
         if destination not in configs:
-            print(f"❌ ERROR: '{destination}' not found in destination configs")
+            logger.error(f"❌ ERROR: '{destination}' not found in destination configs")
             return ""
         
         location_code = configs[destination].get("locationCode", "")
         if not location_code:
-            print(f"❌ ERROR: No locationCode found for '{destination}'")
+            logger.error(f"❌ ERROR: No locationCode found for '{destination}'")
         
         return location_code
     
@@ -123,14 +125,14 @@ class ConfigLoader:
                 invalid_configs.append(dest)
         
         if missing_configs:
-            print(f"❌ Missing configurations: {missing_configs}")
+            logger.error(f"❌ Missing configurations: {missing_configs}")
         
         if invalid_configs:
-            print(f"❌ Invalid configurations (missing locationCode): {invalid_configs}")
+            logger.error(f"❌ Invalid configurations (missing locationCode): {invalid_configs}")
         
         is_valid = len(missing_configs) == 0 and len(invalid_configs) == 0
         
         if is_valid:
-            print("✅ All destination configurations are valid")
+            logger.info("✅ All destination configurations are valid")
         
         return is_valid
\ No newline at end of file
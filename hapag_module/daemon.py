@@ -0,0 +1,56 @@
+"""
+Long-lived Chromium process for repeated Hapag-Lloyd runs.
+
+Starting Chromium costs several seconds per run. This daemon launches it
+once with a remote debugging port; runs then attach to it over CDP when
+HAPAG_BROWSER_WS points at the printed endpoint, creating only a new
+context each time.
+
+Usage:
+    python -m hapag_module.daemon [port] [--headless]
+    set HAPAG_BROWSER_WS=http://localhost:9222  (before running hapag_checker.py)
+"""
+
+import asyncio
+import sys
+from playwright.async_api import async_playwright
+
+DEFAULT_CDP_PORT = 9222
+
+
+async def serve(port: int = DEFAULT_CDP_PORT, headless: bool = False) -> None:
+    """
+    Launch Chromium with a CDP endpoint and keep it alive until Enter is pressed.
+    
+    Args:
+        port: Remote debugging port to expose
+        headless: Whether to run browser in headless mode
+    """
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(
+            headless=headless,
+            args=[f"--remote-debugging-port={port}"]
+        )
+        
+        print(f"🌐 Browser daemon running (headless={headless})")
+        print(f"🔗 Set HAPAG_BROWSER_WS=http://localhost:{port} to reuse it")
+        
+        try:
+            await asyncio.to_thread(input, "Press Enter to stop the browser daemon...")
+        finally:
+            await browser.close()
+            print("✅ Browser daemon stopped")
+
+
+def main() -> None:
+    """Parse command line arguments and run the daemon."""
+    args = sys.argv[1:]
+    headless = "--headless" in args
+    ports = [a for a in args if a.isdigit()]
+    port = int(ports[0]) if ports else DEFAULT_CDP_PORT
+    
+    asyncio.run(serve(port, headless))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,10 @@ from Hapag-Lloyd price breakdown dialogs with dynamic header parsing.
 """
 
 import re
-import time
 from typing import List, Dict, Any, Tuple
-from playwright.sync_api import Page
+from playwright.async_api import Page
+
+from ._log import logger
 
 
 class DataExtractor:
@@ -49,7 +50,7 @@ class DataExtractor:
         
         return lines[0], " ".join(lines[1:])
     
-    def _find_header_row(self, rows, page=None) -> Tuple[Dict[int, str], int]:
+    async def _find_header_row(self, rows, page=None) -> Tuple[Dict[int, str], int]:
         """
         Find header row and build column mapping.
         
@@ -62,19 +63,19 @@ class DataExtractor:
         """
         header_map = {}
         header_row_index = -1
-        row_count = rows.count()
+        row_count = await rows.count()
         
         # Method 1: Try to find column headers using columnheader role (more reliable)
         if page:
             try:
                 col_headers = page.get_by_role("columnheader")
-                ch_count = col_headers.count()
+                ch_count = await col_headers.count()
                 
                 if ch_count >= 3:
                     header_texts = []
                     for i in range(ch_count):
                         try:
-                            text = self._normalize_text(col_headers.nth(i).inner_text())
+                            text = self._normalize_text(await col_headers.nth(i).inner_text())
                             header_texts.append(text)
                         except:
                             header_texts.append("")
@@ -87,11 +88,11 @@ class DataExtractor:
                         for j, text in enumerate(header_texts):
                             header_map[j] = text
                         header_row_index = 0  # Assume first row is header
-                        print(f"   [INFO] Found headers via columnheader role")
-                        print(f"   [INFO] Header columns: {header_map}")
+                        logger.info(f"   [INFO] Found headers via columnheader role")
+                        logger.info(f"   [INFO] Header columns: {header_map}")
                         return header_map, header_row_index
             except Exception as e:
-                print(f"   [WARNING] columnheader detection failed: {e}")
+                logger.warning(f"   [WARNING] columnheader detection failed: {e}")
         
         # Method 2: Check first 20 rows for header using cells
         for i in range(min(row_count, 20)):
@@ -100,17 +101,17 @@ class DataExtractor:
                 
                 # Try both cell and columnheader roles
                 cells = r.get_by_role("cell")
-                if cells.count() < 3:
+                if await cells.count() < 3:
                     cells = r.get_by_role("columnheader")
                 
-                if cells.count() < 3:
+                if await cells.count() < 3:
                     continue
                 
                 # Get all cell texts
                 cell_texts = []
-                for j in range(cells.count()):
+                for j in range(await cells.count()):
                     try:
-                        cell_text = self._normalize_text(cells.nth(j).inner_text())
+                        cell_text = self._normalize_text(await cells.nth(j).inner_text())
                         cell_texts.append(cell_text)
                     except:
                         cell_texts.append("")
@@ -121,12 +122,12 @@ class DataExtractor:
                     for j, text in enumerate(cell_texts):
                         header_map[j] = text
                     
-                    print(f"   [INFO] Found header row at index {i}")
-                    print(f"   [INFO] Header columns: {header_map}")
+                    logger.info(f"   [INFO] Found header row at index {i}")
+                    logger.info(f"   [INFO] Header columns: {header_map}")
                     break
                     
             except Exception as e:
-                print(f"   [WARNING] Error checking row {i} for header: {e}")
+                logger.warning(f"   [WARNING] Error checking row {i} for header: {e}")
                 continue
         
         return header_map, header_row_index
@@ -148,7 +149,7 @@ class DataExtractor:
             if re.match(r'\d+[A-Z]+', col_name):
                 container_columns[idx] = col_name
         
-        print(f"   [INFO] Container columns found: {container_columns}")
+        logger.info(f"   [INFO] Container columns found: {container_columns}")
         return container_columns
     
     def _find_currency_column(self, header_map: Dict[int, str]) -> int:
@@ -166,7 +167,7 @@ class DataExtractor:
                 return idx
         return None
     
-    def _extract_row_data(self, row, desc_idx: int, curr_idx: int, 
+    async def _extract_row_data(self, row, desc_idx: int, curr_idx: int, 
                          container_columns: Dict[int, str], header_row_index: int, 
                          row_index: int) -> Dict[str, Any]:
         """
@@ -188,14 +189,14 @@ class DataExtractor:
         
         try:
             cells = row.get_by_role("cell")
-            cell_count = cells.count()
+            cell_count = await cells.count()
             
             if cell_count < 3:
                 return None
             
             # Extract description and remarks from first cell
             try:
-                first_cell_text = cells.nth(desc_idx).inner_text()
+                first_cell_text = await cells.nth(desc_idx).inner_text()
                 desc, remarks = self._split_first_cell(first_cell_text)
             except:
                 desc, remarks = "", ""
@@ -210,7 +211,7 @@ class DataExtractor:
             curr = ""
             if curr_idx is not None and curr_idx < cell_count:
                 try:
-                    curr = self._normalize_text(cells.nth(curr_idx).inner_text())
+                    curr = self._normalize_text(await cells.nth(curr_idx).inner_text())
                 except:
                     pass
             
@@ -235,10 +236,10 @@ class DataExtractor:
             for i, col_idx in enumerate(sorted_indices):
                 if col_idx < cell_count and i < len(mapping):
                     try:
-                        value = self._normalize_text(cells.nth(col_idx).inner_text())
+                        value = self._normalize_text(await cells.nth(col_idx).inner_text())
                         container_type = mapping[i]
                         container_values[container_type] = value
-                        print(f"      [COL {col_idx}] Position {i+1}/{num_container_cols} → {container_type} = {value}")
+                        logger.info(f"      [COL {col_idx}] Position {i+1}/{num_container_cols} → {container_type} = {value}")
                     except:
                         container_values[mapping[i]] = ""
             
@@ -251,11 +252,11 @@ class DataExtractor:
                 }
             
         except Exception as e:
-            print(f"   [WARNING] Error extracting row {row_index}: {e}")
+            logger.warning(f"   [WARNING] Error extracting row {row_index}: {e}")
         
         return None
     
-    def extract_import_surcharges_table(self, page: Page) -> List[Dict[str, Any]]:
+    async def extract_import_surcharges_table(self, page: Page) -> List[Dict[str, Any]]:
         """
         Extract Import Surcharges table data using dynamic header parsing.
         Works with any combination of container types (20STD, 40STD, 40HC, etc.)
@@ -266,32 +267,32 @@ class DataExtractor:
         Returns:
             List of dictionaries with extracted table data
         """
-        print("📊 Extracting Import Surcharges table...")
-        print("   [INFO] Using dynamic header parsing...")
+        logger.info("📊 Extracting Import Surcharges table...")
+        logger.info("   [INFO] Using dynamic header parsing...")
         
         # Wait until at least one known row is present
         try:
-            page.get_by_role("cell", name="Terminal Handling Charge Dest.").wait_for(timeout=30000)
-            print("   [INFO] Table loaded successfully")
+            await page.get_by_role("cell", name="Terminal Handling Charge Dest.").wait_for(timeout=30000)
+            logger.info("   [INFO] Table loaded successfully")
         except Exception as e:
-            print(f"   [WARNING] Timeout waiting for table: {e}")
+            logger.warning(f"   [WARNING] Timeout waiting for table: {e}")
         
         # Find all rows
         rows = page.get_by_role("row")
-        row_count = rows.count()
-        print(f"   [INFO] Found {row_count} rows")
+        row_count = await rows.count()
+        logger.info(f"   [INFO] Found {row_count} rows")
         
         if row_count == 0:
             # Fallback: try finding <tr> elements directly
             rows = page.locator("tr")
-            row_count = rows.count()
-            print(f"   [INFO] Fallback: Found {row_count} <tr> rows")
+            row_count = await rows.count()
+            logger.info(f"   [INFO] Fallback: Found {row_count} <tr> rows")
         
         # Step 1: Find header row and build column map (pass page for columnheader detection)
-        header_map, header_row_index = self._find_header_row(rows, page)
+        header_map, header_row_index = await self._find_header_row(rows, page)
         
         if not header_map:
-            print("   [WARNING] No header row found, using position-based extraction")
+            logger.warning("   [WARNING] No header row found, using position-based extraction")
             # Fallback: assume standard 5-column structure with all container types
             header_map = {0: "Description", 1: "Curr.", 2: "20STD", 3: "40STD", 4: "40HC"}
         
@@ -309,24 +310,24 @@ class DataExtractor:
         for i in range(row_count):
             try:
                 r = rows.nth(i)
-                row_data = self._extract_row_data(
+                row_data = await self._extract_row_data(
                     r, desc_idx, curr_idx, container_columns, header_row_index, i
                 )
                 
                 if row_data:
                     data.append(row_data)
                     extracted_count += 1
-                    print(f"   [EXTRACTED] {row_data['description']}: {row_data['curr']} "
+                    logger.info(f"   [EXTRACTED] {row_data['description']}: {row_data['curr']} "
                           f"{row_data['container_values']} | Remarks: {row_data['remarks'] or 'N/A'}")
                     
             except Exception as e:
-                print(f"   [ERROR] Failed to process row {i}: {e}")
+                logger.error(f"   [ERROR] Failed to process row {i}: {e}")
                 continue
         
         if not data:
-            print("   [ERROR] No data successfully extracted")
+            logger.error("   [ERROR] No data successfully extracted")
         else:
-            print(f"   [SUCCESS] ✅ Extracted {extracted_count} rows from Import Surcharges")
+            logger.info(f"   [SUCCESS] ✅ Extracted {extracted_count} rows from Import Surcharges")
         
         return data
     
@@ -341,7 +342,7 @@ class DataExtractor:
             True if data appears valid, False otherwise
         """
         if not data:
-            print("   [VALIDATION] ❌ No data to validate")
+            logger.error("   [VALIDATION] ❌ No data to validate")
             return False
         
         valid_rows = 0
@@ -354,8 +355,8 @@ class DataExtractor:
         validation_passed = valid_rows > 0
         
         if validation_passed:
-            print(f"   [VALIDATION] ✅ {valid_rows}/{len(data)} rows have valid data")
+            logger.info(f"   [VALIDATION] ✅ {valid_rows}/{len(data)} rows have valid data")
         else:
-            print(f"   [VALIDATION] ❌ No rows contain valid data")
+            logger.error(f"   [VALIDATION] ❌ No rows contain valid data")
         
         return validation_passed
\ No newline at end of file
@@ -7,10 +7,12 @@ with smart column mapping and file management.
 
 import os
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 
+from ._log import logger
+
 
 class ExcelExporter:
     """Handles Excel file creation and data export."""
@@ -72,7 +74,7 @@ class ExcelExporter:
         Returns:
             Tuple of (workbook, worksheet)
         """
-        print(f"   [INFO] Creating new file: {excel_path}")
+        logger.info(f"   [INFO] Creating new file: {excel_path}")
         
         wb = Workbook()
         ws = wb.active
@@ -103,7 +105,7 @@ class ExcelExporter:
         Returns:
             Tuple of (workbook, worksheet)
         """
-        print(f"   [INFO] Appending to existing file: {excel_path}")
+        logger.info(f"   [INFO] Appending to existing file: {excel_path}")
         
         wb = load_workbook(excel_path)
         ws = wb.active
@@ -195,6 +197,69 @@ class ExcelExporter:
         ws.column_dimensions['H'].width = 12  # 40HC
         ws.column_dimensions['I'].width = 50  # Transport Remarks
     
+    def _open_workbook(self, excel_path: str) -> tuple[Workbook, Any, int]:
+        """
+        Open the run's workbook for appending, creating it if needed.
+        
+        Args:
+            excel_path: Path to the Excel file
+            
+        Returns:
+            Tuple of (workbook, worksheet, first free row)
+        """
+        # Check if file exists for append mode
+        if os.path.exists(excel_path):
+            wb, ws = self._load_existing_workbook(excel_path)
+            return wb, ws, ws.max_row + 1
+        
+        wb, ws = self._create_new_workbook(excel_path)
+        return wb, ws, 5  # First data row after headers
+    
+    def _save_workbook(self, wb: Workbook, ws: Any, excel_path: str) -> str:
+        """
+        Adjust column widths and write the workbook to disk.
+        
+        Args:
+            wb: Workbook object
+            ws: Worksheet object
+            excel_path: Path to save the file to
+            
+        Returns:
+            Path to saved Excel file
+        """
+        # Adjust column widths
+        self._adjust_column_widths(ws)
+        
+        # Save workbook
+        try:
+            wb.save(excel_path)
+            logger.info(f"✅ Data saved successfully to: {excel_path}")
+            return excel_path
+            
+        except Exception as e:
+            logger.error(f"❌ ERROR saving Excel file: {e}")
+            raise
+    
+    def save_batch(self, batches: List[Tuple[str, Dict[str, str], List[Dict[str, Any]]]],
+                   filename: str = "hapag_surcharges.xlsx") -> str:
+        """
+        Save data for several destinations with a single workbook write.
+        
+        Args:
+            batches: List of (destination, route_info, data) tuples, written in order
+            filename: Name of the Excel file
+            
+        Returns:
+            Path to saved Excel file
+        """
+        excel_path = os.path.join(self.downloads_dir, filename)
+        wb, ws, next_row = self._open_workbook(excel_path)
+        
+        for _destination, route_info, data in batches:
+            next_row = self._write_data_rows(ws, data, route_info or {}, next_row)
+        
+        return self._save_workbook(wb, ws, excel_path)
+    
     def save_to_excel(self, data: List[Dict[str, Any]], destination: str = "", 
                      route_info: Optional[Dict[str, str]] = None, 
                      filename: str = "hapag_surcharges.xlsx") -> str:
@@ -217,30 +282,12 @@ class ExcelExporter:
             route_info = {"from": "", "to": "", "via": ""}
         
         excel_path = os.path.join(self.downloads_dir, filename)
-        
-        # Check if file exists for append mode
-        if os.path.exists(excel_path):
-            wb, ws = self._load_existing_workbook(excel_path)
-            start_row = ws.max_row + 1
-        else:
-            wb, ws = self._create_new_workbook(excel_path)
-            start_row = 5  # First data row after headers
+        wb, ws, start_row = self._open_workbook(excel_path)
         
         # Write data rows
-        next_row = self._write_data_rows(ws, data, route_info, start_row)
-        
-        # Adjust column widths
-        self._adjust_column_widths(ws)
+        self._write_data_rows(ws, data, route_info, start_row)
         
-        # Save workbook
-        try:
-            wb.save(excel_path)
-            print(f"✅ Data saved successfully to: {excel_path}")
-            return excel_path
-            
-        except Exception as e:
-            print(f"❌ ERROR saving Excel file: {e}")
-            raise
+        return self._save_workbook(wb, ws, excel_path)
     
     def get_excel_path(self, filename: str) -> str:
         """
@@ -286,7 +333,7 @@ class ExcelExporter:
             True if data is valid for export, False otherwise
         """
         if not data:
-            print("   [EXPORT VALIDATION] ❌ No data to export")
+            logger.error("   [EXPORT VALIDATION] ❌ No data to export")
             return False
         
         valid_count = 0
@@ -297,8 +344,8 @@ class ExcelExporter:
                 valid_count += 1
         
         if valid_count == 0:
-            print("   [EXPORT VALIDATION] ❌ No valid rows found for export")
+            logger.error("   [EXPORT VALIDATION] ❌ No valid rows found for export")
             return False
         
-        print(f"   [EXPORT VALIDATION] ✅ {valid_count}/{len(data)} rows ready for export")
+        logger.info(f"   [EXPORT VALIDATION] ✅ {valid_count}/{len(data)} rows ready for export")
         return True
\ No newline at end of file
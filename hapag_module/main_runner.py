@@ -5,32 +5,46 @@ This module orchestrates the complete automation workflow, coordinating
 all other modules to perform end-to-end quote extraction.
 """
 
-from typing import List, Dict, Any
+import os
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
-from playwright.sync_api import Playwright, sync_playwright, Page
+from playwright.async_api import Playwright, async_playwright, Page
 
 from .config_loader import ConfigLoader
-from .browser_manager import BrowserManager
+from .browser_manager import BrowserManager, BrowserContextPool
 from .auth_manager import AuthManager
 from .quote_scraper import QuoteScraper
 from .data_extractor import DataExtractor
 from .excel_exporter import ExcelExporter
+from ._log import logger
+
+# Upper bound on browser contexts searching destinations concurrently;
+# the pool is further capped by the machine's CPU count
+MAX_PARALLEL_PAGES = 3
 
 
 class MainRunner:
     """Main automation workflow orchestrator."""
     
-    def __init__(self, headless: bool = False, base_dir: str = None):
+    def __init__(self, headless: bool = False, base_dir: str = None,
+                 max_parallel: int = MAX_PARALLEL_PAGES, verbose: bool = True):
         """
         Initialize MainRunner with all required components.
         
         Args:
             headless: Whether to run browser in headless mode
             base_dir: Base directory for configuration files
+            max_parallel: Number of destinations processed concurrently
+            verbose: Whether to log per-step progress while destinations run in parallel
         """
         self.headless = headless
         self.base_dir = base_dir
+        self.max_parallel = max(1, max_parallel)
+        self.verbose = verbose
         
         # Initialize all components
         self.config_loader = ConfigLoader(base_dir)
@@ -44,6 +58,10 @@ class MainRunner:
         self.destinations: List[str] = []
         self.configs: Dict[str, Any] = {}
         self.excel_filename: str = ""
+        self._seed_url: Optional[str] = None
+        
+        # Extracted rows per destination, written to Excel once at the end of the run
+        self._pending_rows: List[Tuple[str, Dict[str, str], List[Dict[str, Any]]]] = []
     
     def _load_configuration(self) -> bool:
         """
@@ -52,23 +70,23 @@ class MainRunner:
         Returns:
             True if configuration loaded successfully, False otherwise
         """
-        print("📋 Loading configuration...")
+        logger.info("📋 Loading configuration...")
         
         # Load destinations
         self.destinations = self.config_loader.load_destinations()
         if not self.destinations:
-            print("❌ ERROR: No destinations loaded")
+            logger.error("❌ ERROR: No destinations loaded")
             return False
         
         # Load destination configs
         self.configs = self.config_loader.load_destination_configs()
         if not self.configs:
-            print("❌ ERROR: No destination configurations loaded")
+            logger.error("❌ ERROR: No destination configurations loaded")
             return False
         
         # Validate configuration
         if not self.config_loader.validate_config(self.destinations, self.configs):
-            print("❌ ERROR: Configuration validation failed")
+            logger.error("❌ ERROR: Configuration validation failed")
             return False
         
         return True
@@ -82,14 +100,14 @@ class MainRunner:
         """
         try:
             self.excel_filename = self.excel_exporter.determine_excel_filename()
-            print(f"📁 Excel file for this run: {self.excel_filename}")
+            logger.info(f"📁 Excel file for this run: {self.excel_filename}")
             return True
             
         except Exception as e:
-            print(f"❌ ERROR preparing Excel file: {e}")
+            logger.error(f"❌ ERROR preparing Excel file: {e}")
             return False
     
-    def _save_error_screenshot(self, page: Page, destination: str, error_type: str) -> None:
+    async def _save_error_screenshot(self, page: Page, destination: str, error_type: str) -> None:
         """
         Save screenshot and error report when destination processing fails.
         
@@ -108,8 +126,8 @@ class MainRunner:
             
             # Save screenshot
             screenshot_path = error_dir / f"{error_type}_{safe_dest}_{timestamp}.png"
-            page.screenshot(path=str(screenshot_path))
-            print(f"📸 Screenshot saved: {screenshot_path}")
+            await page.screenshot(path=str(screenshot_path))
+            logger.info(f"📸 Screenshot saved: {screenshot_path}")
             
             # Save error text file
             error_file = error_dir / f"{error_type}_{safe_dest}_{timestamp}.txt"
@@ -118,25 +136,26 @@ class MainRunner:
                 f.write(f"Destination: {destination}\\n")
                 f.write(f"Timestamp: {timestamp}\\n")
                 f.write(f"URL: {page.url}\\n")
-            print(f"📝 Error report saved: {error_file}")
+            logger.info(f"📝 Error report saved: {error_file}")
             
         except Exception as e:
-            print(f"⚠️ WARNING: Could not save error screenshot/report: {e}")
+            logger.warning(f"⚠️ WARNING: Could not save error screenshot/report: {e}")
     
     def _print_summary(self) -> None:
         """Print processing summary."""
-        print(f"\\n{'='*60}")
-        print(f"📋 Processing {len(self.destinations)} destinations from destinations.txt")
-        print(f"{'='*60}")
-        for dest in self.destinations:
-            print(f"  • {dest}")
-        print(f"{'='*60}\n")
+        logger.info(f"\n{'='*60}")
+        # One record for the whole list instead of one write per destination
+        lines = [f"📋 Processing {len(self.destinations)} destinations from destinations.txt"]
+        lines.extend(f"  • {dest}" for dest in self.destinations)
+        logger.info("\n".join(lines))
+        logger.info(f"{'='*60}\n")
     
-    def _process_destination(self, destination: str, index: int, total: int) -> bool:
+    async def _process_destination_async(self, page: Page, destination: str, index: int, total: int) -> bool:
         """
-        Process a single destination.
+        Process a single destination on the given page.
         
         Args:
+            page: Page instance reserved for this destination
             destination: Destination name to process
             index: Current destination index (1-based)
             total: Total number of destinations
@@ -144,16 +163,16 @@ class MainRunner:
         Returns:
             True if destination processed successfully, False otherwise
         """
-        print(f"\n{'='*60}")
-        print(f"🎯 Processing {index}/{total}: {destination}")
-        print(f"{'='*60}")
+        logger.info(f"\n{'='*60}")
+        logger.info(f"🎯 Processing {index}/{total}: {destination}")
+        logger.info(f"{'='*60}")
         
         # Get location code and alternate codes from config
         config_entry = self.configs.get(destination, {})
         location_code = config_entry.get("hapagLocationCode") or config_entry.get("locationCode")
         
         if not location_code:
-            print(f"❌ ERROR: No location code found for {destination}")
+            logger.error(f"❌ ERROR: No location code found for {destination}")
             return False
         
         # Build list of alternate codes to try
@@ -163,60 +182,46 @@ class MainRunner:
             if config_entry.get("hapagLocationCode") != config_entry.get("locationCode"):
                 alternate_codes.append(config_entry.get("locationCode"))
         
-        print(f"📍 Primary Location Code: {location_code}")
+        logger.info(f"📍 Primary Location Code: {location_code}")
         if alternate_codes:
-            print(f"📍 Alternate Codes: {', '.join(alternate_codes)}")
+            logger.info(f"📍 Alternate Codes: {', '.join(alternate_codes)}")
         
-        page = self.browser_manager.get_page()
         if not page:
-            print("❌ ERROR: No page instance available")
+            logger.error("❌ ERROR: No page instance available")
             return False
         
         # Perform quote search with alternate codes
-        is_first_search = (index == 1)
-        if not self.quote_scraper.perform_full_search(page, location_code, is_first_search, alternate_codes):
+        if not await self.quote_scraper.perform_full_search(page, location_code, alternate_codes=alternate_codes):
             # Take screenshot and save error
-            self._save_error_screenshot(page, destination, "DESTINATION_NOT_FOUND")
+            await self._save_error_screenshot(page, destination, "DESTINATION_NOT_FOUND")
             return False
         
         # Extract route information
-        route_info = self.quote_scraper.extract_route_info(page)
+        route_info = await self.quote_scraper.extract_route_info(page)
         
         # Extract surcharges table data
-        print("📊 Extracting Import Surcharges table...")
-        table_data = self.data_extractor.extract_import_surcharges_table(page)
+        logger.info("📊 Extracting Import Surcharges table...")
+        table_data = await self.data_extractor.extract_import_surcharges_table(page)
         
         if not table_data:
-            print(f"⚠️ WARNING: No data extracted for {destination}")
-            self.quote_scraper.close_price_breakdown(page)
+            logger.warning(f"⚠️ WARNING: No data extracted for {destination}")
+            await self.quote_scraper.close_price_breakdown(page)
             return False
         
         # Validate extracted data
         if not self.data_extractor.validate_extracted_data(table_data):
-            print(f"⚠️ WARNING: Data validation failed for {destination}")
-            self.quote_scraper.close_price_breakdown(page)
+            logger.warning(f"⚠️ WARNING: Data validation failed for {destination}")
+            await self.quote_scraper.close_price_breakdown(page)
             return False
         
-        # Save to Excel
-        print("💾 Saving to Excel...")
-        try:
-            excel_path = self.excel_exporter.save_to_excel(
-                table_data, 
-                destination=destination, 
-                route_info=route_info, 
-                filename=self.excel_filename
-            )
-            print(f"✅ Data saved to: {excel_path}")
-            
-        except Exception as e:
-            print(f"❌ ERROR saving to Excel: {e}")
-            self.quote_scraper.close_price_breakdown(page)
-            return False
+        # Queue rows for the single Excel write at the end of the run
+        self._pending_rows.append((destination, route_info, table_data))
+        logger.info(f"💾 Queued {len(table_data)} rows for Excel")
         
         # Close price breakdown dialog
-        self.quote_scraper.close_price_breakdown(page)
+        await self.quote_scraper.close_price_breakdown(page)
         
-        print(f"✅ Completed {destination}")
+        logger.info(f"✅ Completed {destination}")
         return True
     
     def _print_final_summary(self, successful_count: int) -> None:
@@ -226,26 +231,175 @@ class MainRunner:
         Args:
             successful_count: Number of successfully processed destinations
         """
-        print(f"\n{'='*60}")
-        print(f"🎉 Processing complete!")
-        print(f"✅ Successfully processed: {successful_count}/{len(self.destinations)} destinations")
+        logger.info(f"\n{'='*60}")
+        
+        lines = [
+            "🎉 Processing complete!",
+            f"✅ Successfully processed: {successful_count}/{len(self.destinations)} destinations",
+        ]
+        level = logging.INFO
         
         if successful_count < len(self.destinations):
             failed_count = len(self.destinations) - successful_count
-            print(f"⚠️ Failed to process: {failed_count} destinations")
-        
-        print(f"{'='*60}")
+            lines.append(f"⚠️ Failed to process: {failed_count} destinations")
+            level = logging.WARNING
         
         if successful_count > 0:
             excel_path = self.excel_exporter.get_excel_path(self.excel_filename)
-            print(f"📁 Results saved to: {excel_path}")
+            lines.append(f"📁 Results saved to: {excel_path}")
+        
+        logger.log(level, "\n".join(lines))
+    
+    def _flush_pending_rows(self) -> bool:
+        """
+        Write all queued destination rows to the Excel file in one save.
+        
+        Rows are ordered as in destinations.txt, regardless of which
+        parallel page finished first.
+        
+        Returns:
+            True if there was nothing to write or the save succeeded, False otherwise
+        """
+        if not self._pending_rows:
+            return True
+        
+        order = {dest: i for i, dest in enumerate(self.destinations)}
+        batches = sorted(self._pending_rows, key=lambda b: order.get(b[0], len(order)))
+        
+        logger.info(f"💾 Saving {len(batches)} destinations to Excel...")
+        try:
+            excel_path = self.excel_exporter.save_batch(batches, filename=self.excel_filename)
+            logger.info(f"✅ Data saved to: {excel_path}")
+            self._pending_rows.clear()
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ ERROR saving to Excel: {e}")
+            return False
+    
+    def _get_pool_size(self, pending: int) -> int:
+        """
+        Size the context pool from the parallelism cap and available CPUs.
+        
+        Args:
+            pending: Number of destinations left to process
+            
+        Returns:
+            Number of browser contexts to open
+        """
+        return max(1, min(self.max_parallel, os.cpu_count() or 1, pending))
+    
+    async def _open_search_form(self, page: Page) -> bool:
+        """
+        Load a clean quote search form on the page.
+        
+        The seed URL captured after the first search is preferred, since it
+        lands on the form with the origin already filled in. If it does not
+        show the form, the default quote URL is used from then on.
+        
+        Args:
+            page: Page instance to load the form on
+            
+        Returns:
+            True if the search form is ready, False otherwise
+        """
+        if self._seed_url:
+            await self.browser_manager.navigate_to_hapag(page, self._seed_url)
+            if await self.auth_manager.verify_login_status(page):
+                return True
+            
+            logger.warning("⚠️ WARNING: Seed URL did not open the search form, using default URL")
+            self._seed_url = None
+        
+        await self.browser_manager.navigate_to_hapag(page)
+        return await self.auth_manager.verify_login_status(page)
+    
+    async def _run_destination(self, page: Page, destination: str, index: int, total: int,
+                               reload_form: bool = True) -> bool:
+        """
+        Process a destination on the given page, never raising.
+        
+        Args:
+            page: Page instance reserved for this destination
+            destination: Destination name to process
+            index: Current destination index (1-based)
+            total: Total number of destinations
+            reload_form: Whether to reload the search form first
+            
+        Returns:
+            True if destination processed successfully, False otherwise
+        """
+        try:
+            if reload_form and not await self._open_search_form(page):
+                logger.error(f"❌ ERROR: Search form not available for {destination}")
+                return False
+            
+            return await self._process_destination_async(page, destination, index, total)
+            
+        except Exception as e:
+            logger.error(f"❌ CRITICAL ERROR processing {destination}: {e}")
+            return False
+    
+    async def _destination_worker(self, pool: BrowserContextPool, queue: asyncio.Queue,
+                                  total: int, results: List[bool]) -> None:
+        """
+        Pull destinations off the queue until it is empty, on one pooled context.
+        
+        A worker keeps its context for its whole lifetime, so a fast destination
+        frees the worker for the next one immediately.
+        
+        Args:
+            pool: Pool of pre-authenticated browser contexts
+            queue: Queue of (index, destination) tuples
+            total: Total number of destinations
+            results: List collecting the success flag of every destination
+        """
+        entry = await pool.acquire()
+        
+        try:
+            while True:
+                try:
+                    index, destination = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                
+                try:
+                    results.append(await self._run_destination(entry[1], destination, index, total))
+                finally:
+                    queue.task_done()
+                    
+        finally:
+            pool.release(entry)
+    
+    async def _restore_session(self, page: Page) -> bool:
+        """
+        Check whether the session loaded from disk is still logged in.
+        
+        A saved session that no longer reaches the search form is deleted
+        so the next run does not try it again.
+        
+        Args:
+            page: Page instance opened with the saved session
+            
+        Returns:
+            True if the saved session is logged in, False otherwise
+        """
+        if not self.browser_manager.auth_state_loaded:
+            return False
+        
+        if await self.auth_manager.verify_login_status(page):
+            logger.info("✅ Reused saved session, skipping login")
+            return True
+        
+        self.browser_manager.discard_auth_state()
+        return False
     
-    def run(self, playwright: Playwright) -> bool:
+    async def run_async(self, playwright: Playwright) -> bool:
         """
         Execute the complete automation workflow.
         
         Args:
-            playwright: Playwright instance
+            playwright: Async Playwright instance
             
         Returns:
             True if workflow completed successfully, False otherwise
@@ -263,57 +417,116 @@ class MainRunner:
             self._print_summary()
             
             # Step 4: Initialize browser
-            page = self.browser_manager.launch_browser(playwright)
+            page = await self.browser_manager.launch_browser(playwright)
             
             # Step 5: Navigate to Hapag-Lloyd
-            self.browser_manager.navigate_to_hapag(page)
+            await self.browser_manager.navigate_to_hapag(page)
             
             # Step 6: Handle Cloudflare challenge if present
-            self.browser_manager.handle_cloudflare_challenge(page)
-            
-            # Step 7: Wait for page to load and handle cookie consent
-            if not self.browser_manager.wait_for_page_load(page):
-                return False
-            
-            self.browser_manager.handle_cookie_consent(page)
+            await self.browser_manager.handle_cloudflare_challenge(page)
             
-            # Step 7: Authenticate
-            if not self.auth_manager.verify_login_status(page):
-                if not self.auth_manager.login(page):
+            # Step 7: Authenticate, reusing the saved session when it is still valid
+            if not await self._restore_session(page):
+                if not await self.browser_manager.wait_for_page_load(page):
                     return False
+                
+                await self.browser_manager.handle_cookie_consent(page)
+                
+                if not await self.auth_manager.verify_login_status(page):
+                    if not await self.auth_manager.login(page):
+                        return False
+                    
+                    await self.browser_manager.save_auth_state()
             
-            # Step 8: Process each destination
+            # Step 8: Seed search on the login page; its session state and
+            # URL are reused by every pooled context
+            total = len(self.destinations)
             successful_count = 0
             
-            for idx, destination in enumerate(self.destinations, 1):
+            if await self._run_destination(page, self.destinations[0], 1, total, reload_form=False):
+                successful_count += 1
+                self._seed_url = page.url
+            
+            # Step 9: Process remaining destinations on a pool of logged-in contexts
+            remaining = self.destinations[1:]
+            if remaining:
+                pool = await self.browser_manager.create_context_pool(self._get_pool_size(len(remaining)))
+                
+                # Interleaved step chatter from parallel pages is noise; keep warnings and errors
+                previous_level = logger.level
+                if not self.verbose:
+                    logger.setLevel(logging.WARNING)
+                
+                queue: asyncio.Queue = asyncio.Queue()
+                for idx, destination in enumerate(remaining, 2):
+                    queue.put_nowait((idx, destination))
+                
+                results: List[bool] = []
                 try:
-                    if self._process_destination(destination, idx, len(self.destinations)):
-                        successful_count += 1
-                    
-                except Exception as e:
-                    print(f"❌ CRITICAL ERROR processing {destination}: {e}")
-                    continue
+                    await asyncio.gather(*[
+                        self._destination_worker(pool, queue, total, results)
+                        for _ in range(pool.size)
+                    ])
+                finally:
+                    logger.setLevel(previous_level)
+                
+                successful_count += sum(results)
             
-            # Step 9: Print final summary
+            # Step 10: Write all extracted rows to Excel
+            if not self._flush_pending_rows():
+                successful_count = 0
+            
+            # Step 11: Print final summary
             self._print_final_summary(successful_count)
             
-            # Step 10: Keep browser open for review
-            self.browser_manager.keep_browser_open()
+            # Step 12: Keep browser open for review
+            await self.browser_manager.keep_browser_open()
             
             return successful_count > 0
             
         except Exception as e:
-            print(f"❌ CRITICAL ERROR in main workflow: {e}")
+            logger.error(f"❌ CRITICAL ERROR in main workflow: {e}")
             return False
             
         finally:
+            # Keep whatever was extracted if the run stopped early
+            self._flush_pending_rows()
+            
             # Always clean up browser resources
             try:
-                self.browser_manager.close_browser()
-                print("✅ Automation complete!")
+                await self.browser_manager.close_browser()
+                logger.info("✅ Automation complete!")
             except:
                 pass
     
+    def run(self, playwright: Any = None) -> bool:
+        """
+        Execute the complete automation workflow and wait for it to finish.
+        
+        Kept for callers of the former synchronous API. The workflow is async
+        and manages its own Playwright, so a sync Playwright instance passed
+        in is not used. It runs on a helper thread, which keeps it working
+        while a sync Playwright session or an event loop is active here.
+        
+        Args:
+            playwright: Ignored; accepted for compatibility
+            
+        Returns:
+            True if workflow completed successfully, False otherwise
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self._run_standalone_async()).result()
+    
+    async def _run_standalone_async(self) -> bool:
+        """
+        Run the async workflow inside a managed Playwright instance.
+        
+        Returns:
+            True if workflow completed successfully, False otherwise
+        """
+        async with async_playwright() as playwright:
+            return await self.run_async(playwright)
+    
     def run_standalone(self) -> bool:
         """
         Run automation workflow with automatic Playwright management.
@@ -321,15 +534,14 @@ class MainRunner:
         Returns:
             True if workflow completed successfully, False otherwise
         """
-        print("🚀 Starting Hapag-Lloyd Quote Extraction...")
-        print("="*60)
+        logger.info("🚀 Starting Hapag-Lloyd Quote Extraction...")
+        logger.info("="*60)
         
         try:
-            with sync_playwright() as playwright:
-                return self.run(playwright)
+            return asyncio.run(self._run_standalone_async())
                 
         except Exception as e:
-            print(f"❌ FATAL ERROR: {e}")
+            logger.error(f"❌ FATAL ERROR: {e}")
             return False
     
     def get_stats(self) -> Dict[str, Any]:
@@ -5,9 +5,115 @@ This module handles the quote search process, port selection,
 and opening price breakdown dialogs.
 """
 
-import time
+import weakref
 from typing import Dict, Any, Optional
-from playwright.sync_api import Page
+from playwright.async_api import Page, Locator, expect
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from ._log import logger
+
+
+# Test ids and accessible names of the quote form elements
+_START_INPUT, _END_INPUT, _SEARCH_SUBMIT = "start-input", "end-input", "search-submit"
+_NAMES = {
+    "pb": "Price Breakdown",
+    "delivery": "Delivered to your Door (",
+}
+_PB_FALLBACK_SELECTOR = f"button:has-text('{_NAMES['pb']}')"
+
+# How long an autocomplete option may take to appear before falling back
+# to arrow-key selection (the dropdown populated within ~2.5 s in practice)
+_MATCH_PROBE_TIMEOUT_MS = 3000
+
+# (route key, label text, whether the label may prefix the value's text node)
+_ROUTE_LABELS = [
+    ["from", "From", False],
+    ["to", "To", False],
+    ["via", "via", True],
+]
+
+# Reads all route labels in a single round trip. For each label, the
+# innermost element holding the label text is located and its parent's
+# text (minus the label) is taken as the value.
+_ROUTE_INFO_JS = """
+(labels) => {
+    const found = {};
+    const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+    for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+        const text = node.nodeValue.trim();
+        for (const [key, label, isPrefix] of labels) {
+            if (key in found) continue;
+            if (text === label || (isPrefix && text.startsWith(label + ' '))) {
+                const parent = node.parentElement && node.parentElement.parentElement;
+                if (parent) found[key] = parent.innerText.replace(label, '').trim();
+            }
+        }
+    }
+    return found;
+}
+"""
+
+# Drives the whole search form in one round trip: types into the React
+# inputs through the native value setter, clicks the matching autocomplete
+# options, checks the door-delivery radio and submits. Resolves to false if
+# any element is missing so the caller can fall back to the step-by-step path.
+# Options must match exactly: the origin option reads "PORT (CODE)" and the
+# destination option ends with "(CODE)" as its only parenthesized part, so
+# text that merely contains a code (e.g. a recent search) is never clicked.
+_FORM_FILL_JS = """
+async ({originQuery, originLabel, destQuery, destLabel, timeoutMs, ids, deliveryName}) => {
+    const sleep = (ms) => new Promise((r) => setTimeout(r, ms));
+    const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+    const type = (input, text) => {
+        input.focus();
+        setter.call(input, text);
+        input.dispatchEvent(new Event('input', {bubbles: true}));
+    };
+    const findOption = async (matches) => {
+        for (let waited = 0; waited < timeoutMs; waited += 100) {
+            const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+            for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+                if (matches(node.nodeValue.trim()) && node.parentElement.offsetParent !== null) {
+                    return node.parentElement;
+                }
+            }
+            await sleep(100);
+        }
+        return null;
+    };
+    const isOrigin = (text) => text.toUpperCase() === originLabel.toUpperCase();
+    const isDest = (text) => text.endsWith(destLabel) && text.indexOf('(') === text.length - destLabel.length;
+
+    const byTestId = (id) => document.querySelector(`[data-testid="${id}"]`);
+    const start = byTestId(ids.start);
+    const end = byTestId(ids.end);
+    const submit = byTestId(ids.submit);
+    if (!start || !end || !submit) return false;
+
+    if (!start.value.toUpperCase().includes(originLabel.toUpperCase())) {
+        type(start, originQuery);
+        const origin = await findOption(isOrigin);
+        if (!origin) return false;
+        origin.click();
+    }
+
+    type(end, destQuery);
+    const dest = await findOption(isDest);
+    if (!dest) return false;
+    dest.click();
+
+    const radio = [...document.querySelectorAll('input[type="radio"]')].find((r) => {
+        const label = r.closest('label') || document.querySelector(`label[for="${r.id}"]`);
+        return label && label.innerText.includes(deliveryName);
+    });
+    if (!radio) return false;
+    radio.click();
+    if (!radio.checked) return false;
+
+    submit.click();
+    return true;
+}
+"""
 
 
 class QuoteScraper:
@@ -23,51 +129,118 @@ class QuoteScraper:
         """
         self.origin_port = origin_port
         self.origin_code = origin_code
+        # Keyed by the Page itself (weakly), so a closed page's entry goes away
+        # with it and a new page can never pick up locators bound to an old one
+        self._locators_by_page: "weakref.WeakKeyDictionary[Page, Dict[str, Locator]]" = weakref.WeakKeyDictionary()
+    
+    def _loc(self, page: Page) -> Dict[str, Locator]:
+        """
+        Get the static locators for a page, building them on first use.
+        
+        Args:
+            page: Page instance the locators belong to
+            
+        Returns:
+            Dictionary of named locators for the page
+        """
+        locators = self._locators_by_page.get(page)
+        if locators is None:
+            locators = {
+                "start": page.get_by_test_id(_START_INPUT),
+                "origin": page.get_by_text(f"{self.origin_port} ({self.origin_code})"),
+                "end": page.get_by_test_id(_END_INPUT),
+                "delivery": page.get_by_role("radio", name=_NAMES["delivery"]),
+                "search": page.get_by_test_id(_SEARCH_SUBMIT),
+                "pb": page.get_by_role("button", name=_NAMES["pb"]).first,
+                "dialog": page.get_by_role("dialog").first,
+            }
+            self._locators_by_page[page] = locators
+        return locators
+    
+    def forget_page(self, page: Page) -> None:
+        """
+        Drop cached locators for a page that is closed or in a bad state.
+        
+        Args:
+            page: Page instance to forget
+        """
+        self._locators_by_page.pop(page, None)
+    
+    async def _wait_for_dropdown_closed(self, option: Locator, timeout: int = 5000) -> None:
+        """
+        Wait until an autocomplete option disappears after a selection.
+        
+        Args:
+            option: Locator of an option in the autocomplete dropdown
+            timeout: Timeout in milliseconds
+        """
+        try:
+            await option.wait_for(state="hidden", timeout=timeout)
+        except PlaywrightTimeoutError:
+            pass  # Dropdown may stay rendered; the selection itself succeeded
     
-    def set_origin_port(self, page: Page, is_first_search: bool = True) -> bool:
+    async def _probe_visible(self, locator: Locator, timeout: int = _MATCH_PROBE_TIMEOUT_MS) -> bool:
+        """
+        Check whether a locator becomes visible within a short, bounded wait.
+        
+        Args:
+            locator: Locator to probe
+            timeout: Timeout in milliseconds
+            
+        Returns:
+            True if the locator became visible, False on timeout
+        """
+        try:
+            await locator.wait_for(state="visible", timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+    
+    async def set_origin_port(self, page: Page) -> bool:
         """
         Set the origin port for shipping quote.
         
         Args:
             page: Page instance to interact with
-            is_first_search: Whether this is the first search (needs origin entry)
             
         Returns:
             True if origin set successfully, False otherwise
         """
-        if not is_first_search:
-            print(f"   ℹ️ Keeping origin: {self.origin_port} ({self.origin_code}) from previous search")
-            return True
-        
-        print(f"📍 Entering origin: {self.origin_port} ({self.origin_code})...")
-        
         try:
-            # Click and fill origin field
-            start_input = page.get_by_test_id("start-input")
-            start_input.click()
-            start_input.fill(self.origin_port.lower())
-            time.sleep(2.5)  # Wait for autocomplete dropdown to populate
+            start_input = self._loc(page)["start"]
             
-            # Select the correct port - prefer exact code match
-            try:
-                exact_match = f"{self.origin_port} ({self.origin_code})"
-                page.get_by_text(exact_match).click()
-                time.sleep(1)
-                print(f"✅ Selected exact match: {exact_match}")
+            # Pages opened from the seed URL already carry the origin
+            if self.origin_code.upper() in (await start_input.input_value()).upper():
+                return True
+            
+            logger.info(f"📍 Entering origin: {self.origin_port} ({self.origin_code})...")
+            
+            # Click and fill origin field
+            await start_input.click()
+            await start_input.fill(self.origin_port.lower())
+            
+            # Select the correct port - prefer exact code match once the
+            # autocomplete dropdown has populated
+            exact_match = f"{self.origin_port} ({self.origin_code})"
+            option = self._loc(page)["origin"]
+            if await self._probe_visible(option):
+                await option.click()
+                logger.info(f"✅ Selected exact match: {exact_match}")
                 
-            except:
-                print(f"⚠️ Could not find exact match, using arrow key selection")
-                start_input.press("ArrowDown")
-                start_input.press("Enter")
-                time.sleep(1)
+            else:
+                logger.warning(f"⚠️ Could not find exact match, using arrow key selection")
+                await start_input.press("ArrowDown")
+                await start_input.press("Enter")
+            
+            await self._wait_for_dropdown_closed(option)
             
             return True
             
         except Exception as e:
-            print(f"❌ ERROR setting origin port: {e}")
+            logger.error(f"❌ ERROR setting origin port: {e}")
             return False
     
-    def set_destination_port(self, page: Page, location_code: str, alternate_codes: list = None, is_first_search: bool = True) -> bool:
+    async def set_destination_port(self, page: Page, location_code: str, alternate_codes: list = None) -> bool:
         """
         Set the destination port for shipping quote with fallback support.
         
@@ -75,20 +248,10 @@ class QuoteScraper:
             page: Page instance to interact with
             location_code: Primary destination port location code
             alternate_codes: List of alternate codes to try if primary fails
-            is_first_search: Whether this is the first search
             
         Returns:
             True if destination set successfully, False otherwise
         """
-        # Clear destination if this is not the first search
-        if not is_first_search:
-            try:
-                clear_button = page.get_by_test_id("end-column").get_by_role("button", name="Clear")
-                clear_button.click()
-                time.sleep(0.5)
-            except:
-                pass  # Clear button not found or not needed
-        
         # Build list of codes to try
         codes_to_try = [location_code]
         if alternate_codes:
@@ -96,49 +259,43 @@ class QuoteScraper:
         
         # Try each code
         for code in codes_to_try:
-            print(f"📍 Trying destination code: {code}...")
+            logger.info(f"📍 Trying destination code: {code}...")
             
             try:
                 # Click and fill destination field
-                end_input = page.get_by_test_id("end-input")
-                end_input.click()
+                end_input = self._loc(page)["end"]
+                await end_input.click()
                 
                 # Clear any previous input
-                end_input.fill("")
-                time.sleep(0.3)
+                await end_input.fill("")
+                await end_input.fill(code.lower())
                 
-                end_input.fill(code.lower())
-                time.sleep(1.5)  # Wait for autocomplete dropdown to populate
-                
-                # Try to click the exact match with location code
-                try:
-                    exact_match = f"({code})"
-                    page.get_by_text(exact_match).first.click()
-                    time.sleep(0.5)
-                    print(f"✅ Selected destination with code: {code}")
+                # Try to click the exact match with location code once the
+                # autocomplete dropdown has populated
+                exact_match = f"({code})"
+                option = page.get_by_text(exact_match).first
+                if await self._probe_visible(option):
+                    await option.click()
+                    await self._wait_for_dropdown_closed(option)
+                    logger.info(f"✅ Selected destination with code: {code}")
                     return True
-                    
-                except:
-                    print(f"⚠️ WARNING: Could not find exact match for {code}, trying arrow key selection")
-                    try:
-                        end_input.press("ArrowDown")
-                        end_input.press("Enter")
-                        time.sleep(0.5)
-                        print(f"✅ Selected destination using arrow key for code: {code}")
-                        return True
-                    except:
-                        print(f"❌ Failed to select with code: {code}")
-                        continue
+                
+                logger.warning(f"⚠️ WARNING: Could not find exact match for {code}, trying arrow key selection")
+                await end_input.press("ArrowDown")
+                await end_input.press("Enter")
+                await self._wait_for_dropdown_closed(option)
+                logger.info(f"✅ Selected destination using arrow key for code: {code}")
+                return True
                 
             except Exception as e:
-                print(f"❌ ERROR with code {code}: {e}")
+                logger.error(f"❌ ERROR with code {code}: {e}")
                 continue
         
         # All codes failed
-        print(f"❌ ERROR: Could not set destination with any of the codes: {codes_to_try}")
+        logger.error(f"❌ ERROR: Could not set destination with any of the codes: {codes_to_try}")
         return False
     
-    def select_delivery_option(self, page: Page) -> bool:
+    async def select_delivery_option(self, page: Page) -> bool:
         """
         Select 'Delivered to your Door' delivery option.
         
@@ -148,22 +305,77 @@ class QuoteScraper:
         Returns:
             True if delivery option selected successfully, False otherwise
         """
-        print("🚚 Selecting 'Delivered to your Door'...")
+        logger.info("🚚 Selecting 'Delivered to your Door'...")
         
         try:
-            time.sleep(0.5)
-            delivery_radio = page.get_by_role("radio", name="Delivered to your Door (")
-            delivery_radio.click()
-            time.sleep(0.5)
+            delivery_radio = self._loc(page)["delivery"]
+            await delivery_radio.click()
+            await expect(delivery_radio).to_be_checked()
             
-            print("✅ Delivery option selected")
+            logger.info("✅ Delivery option selected")
             return True
             
         except Exception as e:
-            print(f"❌ ERROR selecting delivery option: {e}")
+            logger.error(f"❌ ERROR selecting delivery option: {e}")
             return False
     
-    def search_quotes(self, page: Page) -> bool:
+    async def _fill_form_scripted(self, page: Page, location_code: str) -> bool:
+        """
+        Fill and submit the search form with a single page.evaluate call.
+        
+        Args:
+            page: Page instance to interact with
+            location_code: Destination port location code
+            
+        Returns:
+            True if the form was submitted, False if the step-by-step path is needed
+        """
+        args = {
+            "originQuery": self.origin_port.lower(),
+            "originLabel": f"{self.origin_port} ({self.origin_code})",
+            "destQuery": location_code.lower(),
+            "destLabel": f"({location_code})",
+            "timeoutMs": _MATCH_PROBE_TIMEOUT_MS,
+            "ids": {"start": _START_INPUT, "end": _END_INPUT, "submit": _SEARCH_SUBMIT},
+            "deliveryName": _NAMES["delivery"].rstrip(" ("),
+        }
+        
+        try:
+            submitted = await page.evaluate(_FORM_FILL_JS, args)
+        except Exception as e:
+            logger.warning(f"   [WARNING] Scripted form fill failed: {e}")
+            return False
+        
+        if submitted:
+            logger.info(f"✅ Search form submitted for {location_code}")
+        else:
+            logger.warning("   [WARNING] Scripted form fill incomplete, using step-by-step search")
+        return bool(submitted)
+    
+    async def _wait_for_price_breakdown(self, page: Page) -> None:
+        """
+        Wait for the Price Breakdown button of the search results.
+        
+        Args:
+            page: Page instance to wait on
+        """
+        logger.info("⏳ Waiting for search results and Price Breakdown button...")
+        
+        # Wait for Price Breakdown button to be visible (up to 60 seconds with retry logic)
+        price_breakdown_btn = self._loc(page)["pb"]
+        
+        # Try multiple approaches to find the button
+        try:
+            await price_breakdown_btn.wait_for(state="visible", timeout=60000)
+        except PlaywrightTimeoutError:
+            # Fallback: try finding by partial text
+            logger.info("   [RETRY] Trying alternative Price Breakdown button selector...")
+            price_breakdown_btn = page.locator(_PB_FALLBACK_SELECTOR).first
+            await price_breakdown_btn.wait_for(state="visible", timeout=30000)
+        
+        logger.info("   ✅ Price Breakdown button found!")
+    
+    async def search_quotes(self, page: Page) -> bool:
         """
         Submit quote search and wait for results.
         
@@ -173,39 +385,23 @@ class QuoteScraper:
         Returns:
             True if search successful and results loaded, False otherwise
         """
-        print("🔍 Searching for quotes...")
+        logger.info("🔍 Searching for quotes...")
         
         try:
             # Click search button
-            search_button = page.get_by_test_id("search-submit")
-            search_button.click()
+            search_button = self._loc(page)["search"]
+            await search_button.click()
             
             # Wait for search results to load - use smart waiting for Price Breakdown button
-            print("⏳ Waiting for search results and Price Breakdown button...")
-            
-            # Wait for Price Breakdown button to be visible (up to 60 seconds with retry logic)
-            price_breakdown_btn = page.get_by_role("button", name="Price Breakdown").first
-            
-            # Try multiple approaches to find the button
-            try:
-                price_breakdown_btn.wait_for(state="visible", timeout=60000)
-            except:
-                # Fallback: try finding by partial text
-                print("   [RETRY] Trying alternative Price Breakdown button selector...")
-                time.sleep(3)
-                price_breakdown_btn = page.locator("button:has-text('Price Breakdown')").first
-                price_breakdown_btn.wait_for(state="visible", timeout=30000)
-            
-            print("   ✅ Price Breakdown button found!")
-            time.sleep(1)  # Brief pause to ensure page is stable
+            await self._wait_for_price_breakdown(page)
             
             return True
             
         except Exception as e:
-            print(f"❌ ERROR: Search failed or Price Breakdown button did not appear: {e}")
+            logger.error(f"❌ ERROR: Search failed or Price Breakdown button did not appear: {e}")
             return False
     
-    def open_price_breakdown(self, page: Page) -> bool:
+    async def open_price_breakdown(self, page: Page) -> bool:
         """
         Open the Price Breakdown dialog.
         
@@ -215,21 +411,21 @@ class QuoteScraper:
         Returns:
             True if dialog opened successfully, False otherwise
         """
-        print("💰 Opening Price Breakdown...")
+        logger.info("💰 Opening Price Breakdown...")
         
         try:
-            price_breakdown_btn = page.get_by_role("button", name="Price Breakdown").first
-            price_breakdown_btn.click()
-            time.sleep(3)  # Wait for dialog to fully load
+            price_breakdown_btn = self._loc(page)["pb"]
+            await price_breakdown_btn.click()
+            await self._loc(page)["dialog"].wait_for(state="visible")
             
-            print("✅ Price Breakdown dialog opened")
+            logger.info("✅ Price Breakdown dialog opened")
             return True
             
         except Exception as e:
-            print(f"❌ ERROR: Could not open Price Breakdown: {e}")
+            logger.error(f"❌ ERROR: Could not open Price Breakdown: {e}")
             return False
     
-    def close_price_breakdown(self, page: Page) -> bool:
+    async def close_price_breakdown(self, page: Page) -> bool:
         """
         Close the Price Breakdown dialog.
         
@@ -240,17 +436,21 @@ class QuoteScraper:
             True if dialog closed successfully, False otherwise
         """
         try:
-            page.keyboard.press("Escape")
-            time.sleep(1)
+            await page.keyboard.press("Escape")
+            await self._loc(page)["dialog"].wait_for(state="hidden")
             return True
             
         except Exception as e:
-            print(f"⚠️ Warning: Could not close Price Breakdown dialog: {e}")
+            logger.warning(f"⚠️ Warning: Could not close Price Breakdown dialog: {e}")
+            self.forget_page(page)
             return False
     
-    def start_new_search(self, page: Page) -> bool:
+    async def start_new_search(self, page: Page) -> bool:
         """
-        Start a new search by clicking the Edit button.
+        Start a new search from a results page by clicking Edit > Edit Search.
+        
+        MainRunner reloads the search form instead; this is kept for callers
+        that drive a single page from search to search themselves.
         
         Args:
             page: Page instance to interact with
@@ -258,36 +458,57 @@ class QuoteScraper:
         Returns:
             True if new search started successfully, False otherwise
         """
-        print("✏️ Starting new search...")
+        logger.info("✏️ Starting new search...")
         
         try:
-            # Wait a bit for page to stabilize
-            time.sleep(2)
-            
-            # Click Edit button with retry logic
             edit_button = page.get_by_role("button", name="Edit").first
             
             # First try: direct click
             try:
-                edit_button.click(timeout=10000)
-            except:
+                await edit_button.click(timeout=10000)
+            except PlaywrightTimeoutError:
                 # Second try: force click
-                print("   [RETRY] Forcing click on Edit button...")
-                edit_button.click(force=True)
+                logger.info("   [RETRY] Forcing click on Edit button...")
+                await edit_button.click(force=True)
             
-            # Click "Edit Search" from dropdown
-            edit_search_item = page.get_by_role("listitem").filter(has_text="Edit Search")
-            edit_search_item.click()
-            time.sleep(1)
+            # Click "Edit Search" from dropdown and wait for the form
+            await page.get_by_role("listitem").filter(has_text="Edit Search").click()
+            await self._loc(page)["end"].wait_for(state="visible")
             
-            print("✅ New search initiated")
+            logger.info("✅ New search initiated")
             return True
             
         except Exception as e:
-            print(f"❌ ERROR starting new search: {e}")
+            logger.error(f"❌ ERROR starting new search: {e}")
             return False
     
-    def extract_route_info(self, page: Page) -> Dict[str, str]:
+    async def _read_route_labels(self, page: Page) -> Dict[str, str]:
+        """
+        Read route labels one locator at a time, skipping labels that are absent.
+        
+        count() returns immediately, so a missing label (usually "via")
+        does not wait out the default locator timeout.
+        
+        Args:
+            page: Page instance to extract from
+            
+        Returns:
+            Dictionary with the route keys that were found
+        """
+        found = {}
+        
+        for key, label, is_prefix in _ROUTE_LABELS:
+            try:
+                loc = page.get_by_text(label, exact=not is_prefix)
+                if await loc.count():
+                    text = await loc.first.locator("..").inner_text()
+                    found[key] = text.replace(label, "").strip()
+            except Exception as e:
+                logger.warning(f"   [WARNING] Error reading '{label}' location: {e}")
+        
+        return found
+    
+    async def extract_route_info(self, page: Page) -> Dict[str, str]:
         """
         Extract route information (From, To, Via) from Price Breakdown dialog.
         
@@ -299,73 +520,98 @@ class QuoteScraper:
         """
         route = {"from": "", "to": "", "via": ""}
         
-        print("📍 Extracting route information...")
+        logger.info("📍 Extracting route information...")
         
         try:
-            # Extract "From" location
-            from_text = page.get_by_text("From", exact=True).locator("..").inner_text()
-            route["from"] = from_text.replace("From", "").strip()
-        except:
-            print("   [WARNING] Could not extract 'From' location")
-        
-        try:
-            # Extract "To" location
-            to_text = page.get_by_text("To", exact=True).locator("..").inner_text()
-            route["to"] = to_text.replace("To", "").strip()
-        except:
-            print("   [WARNING] Could not extract 'To' location")
+            data = await page.evaluate(_ROUTE_INFO_JS, _ROUTE_LABELS)
+        except Exception as e:
+            logger.warning(f"   [WARNING] Could not read route information in one call, using locators: {e}")
+            data = await self._read_route_labels(page)
         
-        try:
-            # Extract "via" location
-            via_text = page.get_by_text("via").locator("..").inner_text()
-            route["via"] = via_text.replace("via", "").strip()
-        except:
-            print("   [WARNING] Could not extract 'via' location")
+        for key, label, _ in _ROUTE_LABELS:
+            if key in data:
+                route[key] = data[key]
+            else:
+                logger.warning(f"   [WARNING] Could not extract '{label}' location")
         
-        print(f"   [ROUTE] From: {route['from']}, To: {route['to']}, Via: {route['via']}")
+        logger.info(f"   [ROUTE] From: {route['from']}, To: {route['to']}, Via: {route['via']}")
         return route
     
-    def perform_full_search(self, page: Page, location_code: str, is_first_search: bool = True, alternate_codes: list = None) -> bool:
+    async def _reload_form(self, page: Page, form_url: str) -> bool:
         """
-        Perform a complete quote search workflow.
+        Reload the search form after a scripted search that found no results.
+        
+        Args:
+            page: Page instance showing the results of the failed search
+            form_url: URL the search form was loaded from
+            
+        Returns:
+            True if a clean form is showing again, False otherwise
+        """
+        try:
+            await page.goto(form_url)
+            await self._loc(page)["start"].wait_for(state="visible")
+            return True
+        except Exception as e:
+            logger.error(f"❌ ERROR reloading the search form: {e}")
+            return False
+    
+    async def perform_full_search(self, page: Page, location_code: str, is_first_search: bool = True,
+                                  alternate_codes: list = None) -> bool:
+        """
+        Perform a complete quote search workflow on a fresh search form.
         
         Args:
             page: Page instance to interact with
             location_code: Primary destination port location code
-            is_first_search: Whether this is the first search
+            is_first_search: Ignored; kept for existing callers. Every search
+                now starts on a freshly loaded form, and an origin that is
+                already filled in is skipped automatically
             alternate_codes: List of alternate codes to try if primary fails
             
         Returns:
             True if complete search workflow successful, False otherwise
         """
         try:
-            # Start new search if not first
-            if not is_first_search:
-                if not self.start_new_search(page):
+            # Fast path: fill and submit the form in one round trip, code by code
+            form_url = page.url
+            for code in [location_code, *(alternate_codes or [])]:
+                if not await self._fill_form_scripted(page, code):
+                    continue
+                
+                try:
+                    await self._wait_for_price_breakdown(page)
+                    return await self.open_price_breakdown(page)
+                except Exception as e:
+                    logger.warning(f"   [WARNING] No results after scripted search, retrying step by step: {e}")
+                
+                # The page now shows the failed search; start over on a clean form
+                if not await self._reload_form(page, form_url):
                     return False
+                break
             
-            # Set origin port (only for first search)
-            if not self.set_origin_port(page, is_first_search):
+            # Set origin port
+            if not await self.set_origin_port(page):
                 return False
             
             # Set destination port (with alternate codes support)
-            if not self.set_destination_port(page, location_code, alternate_codes, is_first_search):
+            if not await self.set_destination_port(page, location_code, alternate_codes):
                 return False
             
             # Select delivery option
-            if not self.select_delivery_option(page):
+            if not await self.select_delivery_option(page):
                 return False
             
             # Search for quotes
-            if not self.search_quotes(page):
+            if not await self.search_quotes(page):
                 return False
             
             # Open price breakdown
-            if not self.open_price_breakdown(page):
+            if not await self.open_price_breakdown(page):
                 return False
             
             return True
             
         except Exception as e:
-            print(f"❌ ERROR in full search workflow: {e}")
+            logger.error(f"❌ ERROR in full search workflow: {e}")
             return False
\ No newline at end of file
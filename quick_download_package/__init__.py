@@ -9,10 +9,12 @@ Components:
 - data_processor: Data cleaning and validation
 - excel_manager: Excel file operations
 - destination_processor: Destination processing orchestration
+- pool_runner: Parallel destination scraping with one browser per process
+- http_fast_path: Optional HTTP replay of the search request after the first destination
 """
 
 from .config_loader import ConfigLoader
-from .browser_manager import BrowserManager
+from .browser_manager import BrowserManager, DriverPool, DriverHandle
 from .table_scraper import TableScraper
 from .data_processor import DataProcessor
 from .excel_manager import ExcelManager
@@ -21,6 +23,8 @@ from .destination_processor import DestinationProcessor
 __all__ = [
     'ConfigLoader',
     'BrowserManager',
+    'DriverPool',
+    'DriverHandle',
     'TableScraper',
     'DataProcessor',
     'ExcelManager',
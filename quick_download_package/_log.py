@@ -0,0 +1,133 @@
+"""
+Logging Module
+Console output and error logging for quick download.
+
+Console records are handed to a queue and written to stdout by a single
+background listener thread, so scraping never blocks on console I/O.
+Worker processes send their records to the parent's listener through a
+multiprocessing queue (see start_worker_listener / attach_worker_queue),
+so lines from different browsers never interleave mid-line.
+
+Exception stack traces go only to a rotating log file in the error
+folder, not to the console. Only the parent process opens that file;
+worker errors reach it through the same queue, since rotating one file
+from several processes is unsafe (and fails outright on Windows).
+"""
+
+import os
+import sys
+import queue
+import atexit
+import logging
+import multiprocessing
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+ERROR_LOG_NAME = "quick_download_errors.log"
+
+logger = logging.getLogger("quick_download")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+_console_queue = queue.Queue()
+_console_handler = QueueHandler(_console_queue)
+
+# Stack traces belong in the error log file only
+_console_handler.addFilter(lambda record: record.exc_info is None)
+logger.addHandler(_console_handler)
+
+_listener = QueueListener(_console_queue, _stream_handler, respect_handler_level=True)
+_listener.start()
+
+# Flush remaining records before the interpreter exits
+atexit.register(_listener.stop)
+
+# Log files that already have a handler attached (one per error folder)
+_configured_paths = set()
+_file_handlers = []
+
+# Set in worker processes, which leave the error log file to the parent
+_in_worker = False
+
+
+class _WorkerQueueHandler(QueueHandler):
+    """Queue records for the parent, noting which ones carried a stack trace."""
+    
+    def prepare(self, record):
+        traced = record.exc_info is not None
+        # Formats the trace into the message, since exc_info cannot be pickled
+        record = super().prepare(record)
+        record.traced = traced
+        return record
+
+
+class _WorkerRecordHandler(logging.Handler):
+    """Route worker records to the parent's console and error log files."""
+    
+    def emit(self, record):
+        # Stack traces belong in the error log file only
+        if not getattr(record, 'traced', False):
+            _stream_handler.handle(record)
+        for handler in _file_handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+def configure_error_log(error_folder):
+    """
+    Attach a rotating file handler for the given error folder (once per folder).
+    
+    Does nothing in worker processes; their errors are written by the parent.
+    
+    Args:
+        error_folder: Directory for error logs
+    """
+    path = os.path.abspath(os.path.join(error_folder, ERROR_LOG_NAME))
+    if _in_worker or path in _configured_paths:
+        return
+    
+    handler = RotatingFileHandler(path, maxBytes=1024 * 1024, backupCount=3, encoding='utf-8')
+    handler.setLevel(logging.ERROR)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    logger.addHandler(handler)
+    _file_handlers.append(handler)
+    _configured_paths.add(path)
+
+
+def start_worker_listener(error_folder=None):
+    """
+    Handle records sent by worker processes (call in the parent).
+    
+    Console lines are printed and errors go to the parent's error log files.
+    
+    Args:
+        error_folder: Directory for the error log of worker errors (optional)
+    
+    Returns:
+        tuple: (multiprocessing queue for attach_worker_queue, listener to stop)
+    """
+    if error_folder:
+        configure_error_log(error_folder)
+    
+    worker_queue = multiprocessing.Queue()
+    listener = QueueListener(worker_queue, _WorkerRecordHandler())
+    listener.start()
+    return worker_queue, listener
+
+
+def attach_worker_queue(worker_queue):
+    """
+    Send this process's console records to the parent's listener (call in workers).
+    
+    Args:
+        worker_queue: Queue returned by start_worker_listener in the parent
+    """
+    global _in_worker
+    _in_worker = True
+    
+    # Replace the console queue handler; traced records go too, for the parent's error log
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    logger.addHandler(_WorkerQueueHandler(worker_queue))
@@ -4,32 +4,75 @@ Handles browser initialization, setup, and lifecycle management.
 """
 
 import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+from ._log import logger
+
+
+# ChromeDriver path resolved once per process (see BrowserManager.preinstall_driver)
+_DRIVER_PATH = None
+
+
+class DriverHandle:
+    """Mutable reference to the current WebDriver, shared by driver-bound components."""
+    
+    def __init__(self, driver=None):
+        """
+        Initialize the handle.
+        
+        Args:
+            driver: WebDriver to point at (None until a browser is started)
+        """
+        self.driver = driver
+
 
 class BrowserManager:
     """Manages Selenium WebDriver browser instance."""
     
-    def __init__(self, download_dir=None):
+    def __init__(self, download_dir=None, capture_network=False):
         """
         Initialize browser manager.
         
         Args:
             download_dir: Directory for downloads (defaults to ./downloads)
+            capture_network: Record network events in the performance log
+                             (needed by the HTTP fast path)
         """
         self.download_dir = download_dir or os.path.join(os.getcwd(), "downloads")
+        self.capture_network = capture_network
         self.driver = None
         
+        # Follows self.driver across restarts
+        self.handle = DriverHandle()
+        
         # Ensure download directory exists
-        if not os.path.exists(self.download_dir):
-            os.makedirs(self.download_dir)
+        os.makedirs(self.download_dir, exist_ok=True)
         
         # Configure SSL settings
         os.environ["WDM_SSL_VERIFY"] = "0"
         os.environ["WDM_LOCAL"] = "1"
     
+    @classmethod
+    def preinstall_driver(cls):
+        """
+        Resolve the ChromeDriver path once and cache it for the process.
+        
+        Uses the CHROMEDRIVER_PATH environment variable when set, otherwise
+        installs/locates the driver through webdriver-manager.
+        
+        Returns:
+            str: Path to the ChromeDriver executable
+        """
+        global _DRIVER_PATH
+        if _DRIVER_PATH is None:
+            _DRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH") or ChromeDriverManager().install()
+        return _DRIVER_PATH
+    
     def setup_browser(self):
         """
         Setup and return a configured Chrome WebDriver instance.
@@ -45,19 +88,26 @@ class BrowserManager:
             "download.default_directory": self.download_dir,
             "download.prompt_for_download": False,
             "directory_upgrade": True,
-            "safebrowsing.enabled": True
+            "safebrowsing.enabled": True,
+            # Images are never scraped; skip downloading them
+            "profile.managed_default_content_settings.images": 2
         }
         options.add_experimental_option("prefs", prefs)
         
         # Browser options
         options.add_argument("--start-maximized")
         options.add_argument("--ignore-certificate-errors")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        
+        if self.capture_network:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
         
         # Create driver
-        service = Service(ChromeDriverManager().install())
+        service = Service(self.preinstall_driver())
         self.driver = webdriver.Chrome(service=service, options=options)
+        self.handle.driver = self.driver
         
-        print(">>> Browser initialized successfully")
+        logger.info(">>> Browser initialized successfully")
         return self.driver
     
     def restart_browser(self):
@@ -67,7 +117,7 @@ class BrowserManager:
         Returns:
             WebDriver: New driver instance
         """
-        print(">>> [Recovery] Restarting browser...")
+        logger.info(">>> [Recovery] Restarting browser...")
         self.close_browser()
         return self.setup_browser()
     
@@ -76,11 +126,12 @@ class BrowserManager:
         if self.driver:
             try:
                 self.driver.quit()
-                print(">>> Browser closed")
+                logger.info(">>> Browser closed")
             except Exception as e:
-                print(f">>> [Warning] Error closing browser: {e}")
+                logger.warning(f">>> [Warning] Error closing browser: {e}")
             finally:
                 self.driver = None
+                self.handle.driver = None
     
     def get_driver(self):
         """Get the current driver instance."""
@@ -93,3 +144,128 @@ class BrowserManager:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit - close browser."""
         self.close_browser()
+
+
+class DriverPool:
+    """
+    Fixed set of warm browsers handed out one at a time.
+    
+    A browser released as unhealthy is restarted on a background thread,
+    so the caller can immediately acquire another warm one instead of
+    waiting for Chrome to relaunch.
+    """
+    
+    def __init__(self, size, download_dir=None, capture_network=False):
+        """
+        Initialize the driver pool.
+        
+        Args:
+            size: Number of browsers in the pool
+            download_dir: Directory for downloads (defaults to ./downloads)
+            capture_network: Record network events in each browser's performance log
+        """
+        self.size = max(1, size)
+        self.download_dir = download_dir
+        self.capture_network = capture_network
+        self._managers = []
+        self._available = queue.Queue()
+        self._replacer = None
+        self._live = 0
+        self._lock = threading.Lock()
+    
+    def open(self):
+        """
+        Start all browsers in the pool concurrently.
+        
+        Browsers that fail to start are closed and left out, so the pool
+        runs with fewer browsers as long as at least one started.
+        
+        Raises:
+            Exception: The first startup error if no browser started
+        """
+        logger.info(f">>> Starting {self.size} browser(s)...")
+        
+        # Resolve the driver path once before the browsers start in parallel
+        BrowserManager.preinstall_driver()
+        
+        managers = [
+            BrowserManager(download_dir=self.download_dir, capture_network=self.capture_network)
+            for _ in range(self.size)
+        ]
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(manager.setup_browser) for manager in managers]
+        
+        errors = []
+        for manager, future in zip(managers, futures):
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f">>> [ERROR] Browser failed to start: {e}")
+                manager.close_browser()
+                errors.append(e)
+                continue
+            
+            self._managers.append(manager)
+            self._available.put(manager)
+        
+        if not self._managers:
+            raise errors[0]
+        if errors:
+            logger.warning(f">>> [WARNING] Continuing with {len(self._managers)} of {self.size} browser(s)")
+        
+        self._live = len(self._managers)
+        self._replacer = ThreadPoolExecutor(max_workers=self.size)
+    
+    def acquire(self):
+        """
+        Wait for a free browser.
+        
+        Returns:
+            BrowserManager: Manager owning a live driver
+        
+        Raises:
+            RuntimeError: If every browser failed to restart
+        """
+        manager = self._available.get()
+        if manager is None:
+            # Pass the marker on so other waiting threads stop too
+            self._available.put(None)
+            raise RuntimeError("No browser available: all restarts failed")
+        return manager
+    
+    def release(self, manager, healthy=True):
+        """
+        Return a browser to the pool.
+        
+        Args:
+            manager: BrowserManager obtained from acquire()
+            healthy: False if the driver failed; it is restarted in the
+                     background before being handed out again
+        """
+        if healthy:
+            self._available.put(manager)
+        else:
+            self._replacer.submit(self._replace, manager)
+    
+    def _replace(self, manager):
+        """Restart a failed browser and put it back in the pool."""
+        try:
+            manager.restart_browser()
+            self._available.put(manager)
+        except Exception as e:
+            logger.error(f">>> [FATAL] Could not restart browser: {e}")
+            with self._lock:
+                self._live -= 1
+                if self._live == 0:
+                    self._available.put(None)
+    
+    def close(self):
+        """Close every browser in the pool."""
+        # Let pending restarts finish so their browsers are closed below
+        if self._replacer:
+            self._replacer.shutdown(wait=True)
+            self._replacer = None
+        
+        for manager in self._managers:
+            manager.close_browser()
+        self._managers.clear()
@@ -5,12 +5,101 @@ Handles loading destination configs, setting up parameters, and building search
 
 import os
 import json
+import mmap
 from datetime import datetime
+from urllib.parse import urlencode, quote
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used otherwise
+    orjson = None
+
+from ._log import logger
+
+
+# URL parameters that change per destination; all others are fixed for a run
+DYNAMIC_PARAM_KEYS = frozenset({
+    "destinationLocationName", "destinationLocationCode",
+    "originLocationName", "originLocationCode",
+    "pols", "pods"
+})
+
+SEARCH_BASE_URL = "https://ecomm.one-line.com/one-ecom/prices/rate-tariff/inland-search"
+
+# Config files larger than this are memory-mapped instead of read in chunks
+MMAP_MIN_SIZE = 64 * 1024
+
+
+def _read_json_file(path, size):
+    """
+    Parse a JSON file, memory-mapping it when it is large.
+    
+    Args:
+        path: Path to the JSON file
+        size: File size in bytes (from os.stat)
+        
+    Returns:
+        Parsed JSON data
+    """
+    if size > MMAP_MIN_SIZE:
+        try:
+            with open(path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if orjson is not None:
+                        with memoryview(mm) as view:
+                            return orjson.loads(view)
+                    return json.loads(mm[:])
+        except (ValueError, OSError):
+            pass  # Fall back to a regular read (e.g. mmap unsupported on this file)
+    
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
 
 class ConfigLoader:
     """Manages configuration loading and URL building for quick download."""
     
+    # Parsed config files keyed by (path, mtime, size), shared by all instances
+    _cache = {}
+    
+    # Default URL parameters for EXPORT (applicationDate is added per run)
+    _EXPORT_TEMPLATE = (
+        ("boundCode", "E"),  # E = Export, I = Import
+        ("cargoType", "DR"),  # DR = Dry/General
+        ("originLocationName", ""),
+        ("originLocationCode", ""),
+        ("pols", ""),  # Ports of Loading (comma-separated)
+        ("pods", ""),  # Ports of Discharge (leave empty or specify)
+        ("transportMode", ""),
+        ("weightUnit", "KGS"),
+        ("weightValue", "21000"),
+        ("containerTypeSizeValue", "D2,D4,D5,R2,R5"),  # Container types (comma-separated)
+        ("tariffCode", "ONEY-313"),
+        ("routeTypeCode", ""),
+    )
+    
+    # Default URL parameters for IMPORT (applicationDate is added per run)
+    _IMPORT_TEMPLATE = (
+        ("boundCode", "I"),  # I = Import
+        ("cargoType", "DR"),
+        ("destinationLocationName", ""),  # Will be filled from destinations
+        ("destinationLocationCode", ""),  # Will be filled from configs
+        ("originLocationName", ""),  # Will be filled from destinations
+        ("originLocationCode", ""),  # Will be filled from configs
+        ("pols", ""),  # Will be filled from configs
+        ("pods", ""),  # Will be filled from configs
+        ("transportMode", "B,U,R,A,T"),
+        ("weightUnit", "KGS"),
+        ("weightValue", "21000"),
+        ("containerTypeSizeValue", "D2,D4,D5,R2,R5"),
+        ("tariffCode", "ONEY-414"),
+        ("routeTypeCode", ""),
+    )
+    
     def __init__(self, base_dir=None):
         """
         Initialize the configuration loader.
@@ -22,67 +111,104 @@ class ConfigLoader:
         self.destination_configs_file = os.path.join(self.base_dir, "destination_configs.json")
         self.destination_configs = {}
         
+        # Params per (destination, use_import), valid for _compiled_for configs
+        self._compiled_params = {}
+        self._compiled_for = None
+        
         # Get today's date in YYYY-MM-DD format
-        today = datetime.now().strftime("%Y-%m-%d")
-        
-        # Default URL parameters for EXPORT
-        self.export_params = {
-            "applicationDate": today,  # Automatically uses today's date
-            "boundCode": "E",  # E = Export, I = Import
-            "cargoType": "DR",  # DR = Dry/General
-            "originLocationName": "",
-            "originLocationCode": "",
-            "pols": "",  # Ports of Loading (comma-separated)
-            "pods": "",  # Ports of Discharge (leave empty or specify)
-            "transportMode": "",
-            "weightUnit": "KGS",
-            "weightValue": "21000",
-            "containerTypeSizeValue": "D2,D4,D5,R2,R5",  # Container types (comma-separated)
-            "tariffCode": "ONEY-313",
-            "routeTypeCode": ""
-        }
+        self._today = datetime.now().strftime("%Y-%m-%d")
+        
+        # Default URL parameters for this run (templates stamped with today's date)
+        self.export_params = self._params_from_template(self._EXPORT_TEMPLATE)
+        self.import_params = self._params_from_template(self._IMPORT_TEMPLATE)
         
-        # Default URL parameters for IMPORT
-        self.import_params = {
-            "applicationDate": today,  # Automatically uses today's date
-            "boundCode": "I",  # I = Import
-            "cargoType": "DR",
-            "destinationLocationName": "",  # Will be filled from destinations
-            "destinationLocationCode": "",  # Will be filled from configs
-            "originLocationName": "",  # Will be filled from destinations
-            "originLocationCode": "",  # Will be filled from configs
-            "pols": "",  # Will be filled from configs
-            "pods": "",  # Will be filled from configs
-            "transportMode": "B,U,R,A,T",
-            "weightUnit": "KGS",
-            "weightValue": "21000",
-            "containerTypeSizeValue": "D2,D4,D5,R2,R5",
-            "tariffCode": "ONEY-414",
-            "routeTypeCode": ""
+        # Encode the fixed part of each query string once per run
+        self._static_import_qs = self._encode_params(self.import_params, static=True)
+        self._static_export_qs = self._encode_params(self.export_params, static=True)
+        
+        # Per-destination keys each template emits, in template order
+        self._import_emit_keys = tuple(k for k in self.import_params if k in DYNAMIC_PARAM_KEYS)
+        self._export_emit_keys = tuple(k for k in self.export_params if k in DYNAMIC_PARAM_KEYS)
+    
+    def _params_from_template(self, template):
+        """
+        Build a fresh parameter dict from a class-level template.
+        
+        Args:
+            template: Tuple of (key, value) pairs
+            
+        Returns:
+            dict: Parameters with today's applicationDate first
+        """
+        params = {"applicationDate": self._today}  # Automatically uses today's date
+        params.update(template)
+        return params
+    
+    @staticmethod
+    def _encode_params(params, static=None):
+        """
+        URL-encode the non-empty string parameters.
+        
+        Args:
+            params: Dictionary of URL parameters
+            static: True for only the fixed keys, False for only the
+                    per-destination keys, None for all keys
+            
+        Returns:
+            str: Encoded query string (without leading '?')
+        """
+        # Skip internal tracking flags (starting with _) and empty/non-string values
+        clean = {
+            k: v for k, v in params.items()
+            if v and isinstance(v, str) and not k.startswith('_')
+            and (static is None or (k not in DYNAMIC_PARAM_KEYS) == static)
         }
+        return urlencode(clean, quote_via=quote)
     
     def load_destination_configs(self):
         """
         Load destination-specific configurations from JSON file.
         Returns dict of configs or creates sample file if not found.
         """
+        path = self.destination_configs_file
+        
         try:
-            if os.path.exists(self.destination_configs_file):
-                with open(self.destination_configs_file, 'r', encoding='utf-8') as f:
-                    self.destination_configs = json.load(f)
-                print(f">>> Loaded {len(self.destination_configs)} destination configurations")
+            if os.path.exists(path):
+                st = os.stat(path)
+                key = (path, st.st_mtime, st.st_size)
+                
+                # Unchanged file: reuse the parsed configs
+                if key in ConfigLoader._cache:
+                    self.destination_configs = ConfigLoader._cache[key]
+                    return self.destination_configs
+                
+                self.destination_configs = _read_json_file(path, st.st_size)
+                
+                # Keep only the latest version of each file
+                for old_key in [k for k in ConfigLoader._cache if k[0] == path]:
+                    del ConfigLoader._cache[old_key]
+                ConfigLoader._cache[key] = self.destination_configs
+                
+                logger.info(f">>> Loaded {len(self.destination_configs)} destination configurations")
                 return self.destination_configs
             else:
-                print(f">>> [WARNING] Config file not found: {self.destination_configs_file}")
+                logger.warning(f">>> [WARNING] Config file not found: {path}")
                 self._create_sample_config()
                 return self.destination_configs
         except Exception as e:
-            print(f">>> [ERROR] Could not load destination configs: {e}")
+            # Serve the last good configs for this file if there are any
+            stale = next((v for k, v in ConfigLoader._cache.items() if k[0] == path), None)
+            if stale is not None:
+                logger.warning(f">>> [WARNING] Could not reload destination configs, using cached copy: {e}")
+                self.destination_configs = stale
+                return stale
+            
+            logger.error(f">>> [ERROR] Could not load destination configs: {e}")
             return {}
     
     def _create_sample_config(self):
         """Create a sample destination_configs.json file."""
-        print(">>> Creating sample destination_configs.json file...")
+        logger.info(">>> Creating sample destination_configs.json file...")
         sample_config = {
             "OEGSTGEEST, NETHERLANDS": {
                 "locationCode": "NLGSG",
@@ -98,10 +224,10 @@ class ConfigLoader:
         try:
             with open(self.destination_configs_file, 'w', encoding='utf-8') as f:
                 json.dump(sample_config, f, indent=2)
-            print(">>> Please add your destinations to destination_configs.json")
+            logger.info(">>> Please add your destinations to destination_configs.json")
             self.destination_configs = sample_config
         except Exception as e:
-            print(f">>> [ERROR] Could not create sample config: {e}")
+            logger.error(f">>> [ERROR] Could not create sample config: {e}")
     
     def get_destinations(self):
         """Get list of destination names from loaded configs."""
@@ -116,15 +242,24 @@ class ConfigLoader:
             use_import: If True, use import params; otherwise export params
             
         Returns:
-            dict: Parameters ready for URL building
+            dict: Parameters ready for URL building (shared; do not modify)
         """
+        # Params are built once per destination; reset if configs were reloaded
+        if self._compiled_for is not self.destination_configs:
+            self._compiled_params = {}
+            self._compiled_for = self.destination_configs
+        
+        key = (destination, use_import)
+        if key in self._compiled_params:
+            return self._compiled_params[key]
+        
         if destination not in self.destination_configs:
             raise ValueError(f"Destination '{destination}' not found in configs")
         
         config = self.destination_configs[destination]
         
         # Start with base params
-        params = self.import_params.copy() if use_import else self.export_params.copy()
+        params = self._params_from_template(self._IMPORT_TEMPLATE if use_import else self._EXPORT_TEMPLATE)
         
         # Update with destination-specific values
         if use_import:
@@ -139,6 +274,7 @@ class ConfigLoader:
             params["originLocationCode"] = config["locationCode"]
             params["pols"] = config["pols"]
         
+        self._compiled_params[key] = params
         return params
     
     def build_search_url(self, params):
@@ -151,20 +287,18 @@ class ConfigLoader:
         Returns:
             str: Complete search URL
         """
-        base = "https://ecomm.one-line.com/one-ecom/prices/rate-tariff/inland-search"
-        
-        # Convert params dict to URL query string
-        query_parts = []
-        for key, value in params.items():
-            # Skip internal tracking flags (starting with _)
-            if key.startswith('_'):
-                continue
-            if value and isinstance(value, str):  # Only include non-empty string values
-                # URL encode special characters
-                encoded_value = value.replace(" ", "%20").replace(",", "%2C").replace("+", "%2B")
-                query_parts.append(f"{key}={encoded_value}")
-        
-        return base + "?" + "&".join(query_parts)
+        # Reuse the pre-encoded fixed part when params come from the defaults
+        template, static_qs, emit_keys = (
+            (self.import_params, self._static_import_qs, self._import_emit_keys)
+            if params.get("boundCode") == "I"
+            else (self.export_params, self._static_export_qs, self._export_emit_keys)
+        )
+        if params.keys() == template.keys() and all(
+                params[k] == v for k, v in template.items() if k not in DYNAMIC_PARAM_KEYS):
+            dynamic_qs = urlencode([(k, params[k]) for k in emit_keys if params[k]], quote_via=quote)
+            return SEARCH_BASE_URL + "?" + "&".join(qs for qs in (dynamic_qs, static_qs) if qs)
+        
+        return SEARCH_BASE_URL + "?" + self._encode_params(params)
     
     def generate_filename(self):
         """
@@ -3,8 +3,11 @@ Data Processing Module
 Handles data cleaning, validation, and transformation.
 """
 
+import numpy as np
 import pandas as pd
 
+from ._log import logger
+
 
 class DataProcessor:
     """Processes and validates scraped data."""
@@ -18,18 +21,18 @@ class DataProcessor:
         Clean and validate scraped data.
         
         Args:
-            data: Dictionary with 'headers', 'data', and 'totalCount'
+            data: Dictionary with 'headers', 'columns', 'rowCount', and 'totalCount'
             destination: Name of the destination being processed
             
         Returns:
             pandas.DataFrame: Cleaned and validated DataFrame
         """
-        if not data['data']:
-            print("   [WARNING] No data to process!")
+        if not data['rowCount']:
+            logger.warning("   [WARNING] No data to process!")
             return None
         
-        # Create DataFrame
-        df = pd.DataFrame(data['data'])
+        # Create DataFrame straight from the scraped columns
+        df = pd.DataFrame(data['columns'])
         
         # Clean Rate column
         df = self._clean_rate_column(df)
@@ -59,15 +62,10 @@ class DataProcessor:
             pandas.DataFrame: DataFrame with cleaned Rate column
         """
         if 'Rate' in df.columns:
-            # Remove common currency symbols and convert to numeric
-            df['Rate'] = (df['Rate'].astype(str)
-                          .str.replace(',', '')
-                          .str.replace('$', '')
-                          .str.replace('€', '')
-                          .str.replace('£', '')
-                          .str.strip())
+            # Remove thousands separators and common currency symbols in one pass
+            df['Rate'] = df['Rate'].astype(str).str.replace(r'[,$€£]', '', regex=True).str.strip()
             df['Rate'] = pd.to_numeric(df['Rate'], errors='coerce')
-            print(f"   [Cleaning] Converted Rate column to numeric")
+            logger.info(f"   [Cleaning] Converted Rate column to numeric")
         
         return df
     
@@ -104,20 +102,20 @@ class DataProcessor:
         rows_match = (actual_rows == total_count)
         validation_result = 'TRUE' if rows_match else f'FALSE (Expected: {total_count}, Got: {actual_rows})'
         
-        # Add 2 empty spacer columns and the metadata columns
-        df[''] = ''
-        df[' '] = ''  # Second spacer (space char to make unique)
-        df['City Name'] = ''
-        df['Total Count'] = ''
-        df['Validation'] = ''
+        # Build the metadata columns up front; values only on the first row of this destination
+        blanks = np.full(actual_rows, '', dtype=object)
+        city, total, validation = blanks.copy(), blanks.copy(), blanks.copy()
+        if actual_rows:
+            city[0], total[0], validation[0] = destination, total_count, validation_result
         
-        # Set values only for the first row of this destination
-        if len(df) > 0:
-            df.at[0, 'City Name'] = destination
-            df.at[0, 'Total Count'] = total_count
-            df.at[0, 'Validation'] = validation_result
+        # Add 2 empty spacer columns and the metadata columns
+        df[''] = blanks
+        df[' '] = blanks  # Second spacer (space char to make unique)
+        df['City Name'] = city
+        df['Total Count'] = total
+        df['Validation'] = validation
         
-        print(f"   [Info] Added metadata: {destination} - Total: {total_count} results")
+        logger.info(f"   [Info] Added metadata: {destination} - Total: {total_count} results")
         
         return df
     
@@ -134,11 +132,11 @@ class DataProcessor:
         rows_match = (actual_rows == expected_count)
         validation_status = 'PASS' if rows_match else 'FAIL'
         
-        print(f"   [VALIDATION] {destination}: Rows scraped: {actual_rows}, "
+        logger.info(f"   [VALIDATION] {destination}: Rows scraped: {actual_rows}, "
               f"Expected: {expected_count} -> {validation_status}")
         
         if not rows_match:
-            print(f"   [WARNING] Row count mismatch for {destination}!")
+            logger.warning(f"   [WARNING] Row count mismatch for {destination}!")
     
     def combine_dataframes(self, existing_df, new_df):
         """
@@ -155,11 +153,11 @@ class DataProcessor:
             return new_df
         
         # Ensure Rate column in existing data is also numeric
-        if 'Rate' in existing_df.columns:
+        if 'Rate' in existing_df.columns and not pd.api.types.is_numeric_dtype(existing_df['Rate']):
             existing_df['Rate'] = pd.to_numeric(existing_df['Rate'], errors='coerce')
         
         combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-        print(f"   [Info] Existing rows: {len(existing_df)}, "
+        logger.info(f"   [Info] Existing rows: {len(existing_df)}, "
               f"New rows: {len(new_df)}, Total: {len(combined_df)}")
         
         return combined_df
@@ -8,23 +8,42 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from .browser_manager import DriverHandle
+from ._log import logger
+
 
 class DestinationProcessor:
     """Handles the complete workflow for processing a single destination."""
     
+    # Page locators shared by every destination
+    _SEARCH_BTN_XPATH = "//button[.//span[contains(.,'Search')] or contains(.,'Search')]"
+    _RESULT_TABLE_CSS = "table, div[role='table']"
+    _ROW_COUNT_JS = "return document.querySelectorAll('table tr, div[role=\"row\"]').length"
+    
+    # Row-count polling: stop once the count is unchanged for ROW_STABLE_READS
+    # consecutive polls, and never wait longer than the old fixed 3 s
+    ROW_POLL_INTERVAL = 0.2
+    ROW_POLL_MAX = 15
+    ROW_STABLE_READS = 2
+    
     def __init__(self, driver, config_loader, table_scraper):
         """
         Initialize destination processor.
         
         Args:
-            driver: Selenium WebDriver instance
+            driver: Selenium WebDriver instance, or a DriverHandle to follow browser swaps
             config_loader: ConfigLoader instance
             table_scraper: TableScraper instance
         """
-        self.driver = driver
+        self._handle = driver if isinstance(driver, DriverHandle) else DriverHandle(driver)
         self.config_loader = config_loader
         self.table_scraper = table_scraper
     
+    @property
+    def driver(self):
+        """Current WebDriver instance."""
+        return self._handle.driver
+    
     def process_destination(self, destination, use_import=True):
         """
         Process a single destination: build URL, navigate, scrape data.
@@ -36,17 +55,17 @@ class DestinationProcessor:
         Returns:
             dict: Result dictionary with success status, data, and error info
         """
-        print("\n" + "=" * 60)
-        print(f"PROCESSING: {destination}")
-        print("=" * 60)
+        logger.info("\n" + "=" * 60)
+        logger.info(f"PROCESSING: {destination}")
+        logger.info("=" * 60)
         
         # Get destination configuration
         config = self.config_loader.get_config_for_destination(destination)
         
         if not config:
-            print(f"   [ERROR] Destination '{destination}' not found in destination_configs.json!")
-            print(f"   [ERROR] Please run url_checker_refactored.py first to generate configs")
-            print(f"   [ERROR] Skipping this destination...")
+            logger.error(f"   [ERROR] Destination '{destination}' not found in destination_configs.json!")
+            logger.error(f"   [ERROR] Please run url_checker_refactored.py first to generate configs")
+            logger.error(f"   [ERROR] Skipping this destination...")
             return {
                 'success': False,
                 'destination': destination,
@@ -62,8 +81,8 @@ class DestinationProcessor:
             
             # Build and navigate to URL
             search_url = self.config_loader.build_search_url(params)
-            print(f">>> Navigating to search page...")
-            print(f">>> FULL URL: {search_url}")
+            logger.info(f">>> Navigating to search page...")
+            logger.info(f">>> FULL URL: {search_url}")
             self.driver.get(search_url)
             
             # Handle initial page setup
@@ -86,9 +105,8 @@ class DestinationProcessor:
             }
             
         except Exception as e:
-            print(f">>> [ERROR] Failed to process {destination}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f">>> [ERROR] Failed to process {destination}: {e}")
+            logger.exception(f"Failed to process {destination}")
             return {
                 'success': False,
                 'destination': destination,
@@ -104,17 +122,17 @@ class DestinationProcessor:
             config: Configuration dictionary
             use_import: Whether using import or export
         """
-        print(f"   [JSON Config] Reading from destination_configs.json for: {destination}")
-        print(f"   [JSON Config] Location Code: {config['locationCode']}")
-        
         if use_import:
             pols_msg = config['pols'] if config['pols'] else '(empty - normal for import)'
-            print(f"   [JSON Config] POLs: {pols_msg}")
         else:
-            print(f"   [JSON Config] POLs: {config['pols']}")
+            pols_msg = config['pols']
         
-        print(f"   [JSON Config] PODs: {config['pods']}")
-        print(f"   [URL Build] Using locationCode={config['locationCode']} from JSON")
+        # One write for the whole block
+        logger.info(f"   [JSON Config] Reading from destination_configs.json for: {destination}\n"
+              f"   [JSON Config] Location Code: {config['locationCode']}\n"
+              f"   [JSON Config] POLs: {pols_msg}\n"
+              f"   [JSON Config] PODs: {config['pods']}\n"
+              f"   [URL Build] Using locationCode={config['locationCode']} from JSON")
     
     def _handle_initial_page_setup(self):
         """Handle initial page setup (cookies, page load)."""
@@ -123,7 +141,7 @@ class DestinationProcessor:
             WebDriverWait(self.driver, 2).until(
                 EC.element_to_be_clickable((By.ID, "onetrust-accept-btn-handler"))
             ).click()
-            print("   [Info] Cookie popup accepted")
+            logger.info("   [Info] Cookie popup accepted")
         except:
             pass  # Cookie popup may not appear
         
@@ -131,30 +149,36 @@ class DestinationProcessor:
         WebDriverWait(self.driver, 20).until(
             lambda d: d.execute_script("return document.readyState") == "complete"
         )
-        print("   [Info] Page loaded successfully")
+        logger.info("   [Info] Page loaded successfully")
     
     def _execute_search(self):
         """Click the search button to execute the search."""
-        print(f">>> Executing search...")
+        logger.info(f">>> Executing search...")
         search_btn = WebDriverWait(self.driver, 15).until(
-            EC.element_to_be_clickable((
-                By.XPATH, 
-                "//button[.//span[contains(.,'Search')] or contains(.,'Search')]"
-            ))
+            EC.element_to_be_clickable((By.XPATH, self._SEARCH_BTN_XPATH))
         )
         self.driver.execute_script("arguments[0].click();", search_btn)
-        print("   [Info] Search button clicked")
+        logger.info("   [Info] Search button clicked")
     
     def _wait_for_results(self):
         """Wait for search results to appear."""
-        print(f">>> Waiting for results...")
+        logger.info(f">>> Waiting for results...")
         WebDriverWait(self.driver, 20).until(
-            EC.presence_of_element_located((
-                By.XPATH, 
-                "//table | //div[@role='table']"
-            ))
+            EC.presence_of_element_located((By.CSS_SELECTOR, self._RESULT_TABLE_CSS))
         )
         
-        # Wait longer for ALL rows to load
-        time.sleep(3)
-        print("   [Info] Results loaded")
+        # Wait for ALL rows to load: poll until the row count settles
+        prev_rows = -1
+        stable_reads = 0
+        for _ in range(self.ROW_POLL_MAX):
+            rows = self.driver.execute_script(self._ROW_COUNT_JS)
+            if rows == prev_rows and rows > 0:
+                stable_reads += 1
+                if stable_reads >= self.ROW_STABLE_READS:
+                    break
+            else:
+                stable_reads = 0
+            prev_rows = rows
+            time.sleep(self.ROW_POLL_INTERVAL)
+        
+        logger.info(f"   [Info] Results loaded ({prev_rows} rows)")
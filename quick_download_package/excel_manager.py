@@ -3,10 +3,45 @@ Excel File Management Module
 Handles saving data to Excel files with versioning and appending logic.
 """
 
+import importlib.util
 import os
+import re
+import shutil
+import threading
 from datetime import datetime
+from functools import lru_cache
+
 import pandas as pd
 
+from ._log import logger, configure_error_log, ERROR_LOG_NAME
+
+# Runs of spaces/commas in destination names become one '_' in file names
+_SANITIZE_RE = re.compile(r'[ ,]+')
+
+# The optional writer/Parquet libraries are probed on first use.
+
+
+@lru_cache(maxsize=None)
+def _excel_engine():
+    """
+    Pick the pandas Excel writer engine.
+    
+    Returns:
+        tuple: (engine name, engine_kwargs) - xlsxwriter when installed,
+               otherwise openpyxl
+    """
+    # Faster than openpyxl. Not constant_memory mode: pandas writes cells
+    # column by column, and that mode silently drops out-of-row writes
+    if importlib.util.find_spec("xlsxwriter") is not None:
+        return "xlsxwriter", {}
+    return "openpyxl", {}
+
+
+@lru_cache(maxsize=None)
+def _has_parquet():
+    """Check whether pyarrow (needed by DataFrame.to_parquet) is installed."""
+    return importlib.util.find_spec("pyarrow") is not None
+
 
 class ExcelManager:
     """Manages Excel file operations for scraped data."""
@@ -22,22 +57,37 @@ class ExcelManager:
         self.output_dir = output_dir or os.path.join(os.getcwd(), "downloads")
         self.error_folder = error_folder or os.path.join(os.getcwd(), "scraping_errors")
         self.current_run_filepath = None
+        self._run_filename = None
         self.first_save_done = False
         
+        # DataFrames saved during this run; combined and written once by finalize()
+        self._frames = []
+        self._row_count = 0
+        self._has_unwritten_rows = False
+        
+        # Parquet part files written to this run's checkpoint folder so far
+        self._checkpoint_parts = 0
+        
+        # Guards the accumulated rows when destinations finish on several threads
+        self._lock = threading.Lock()
+        
         # Ensure directories exist
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
-        if not os.path.exists(self.error_folder):
-            os.makedirs(self.error_folder)
+        os.makedirs(self.output_dir, exist_ok=True)
+        os.makedirs(self.error_folder, exist_ok=True)
+        
+        # Stack traces go to a rotating log in the error folder, not the console
+        configure_error_log(self.error_folder)
     
     def save_to_excel(self, df, filename, destination):
         """
-        Save DataFrame to Excel file.
+        Add a destination's DataFrame to this run's Excel output.
         
         Handles:
         - Creating new versioned file if one from previous run exists
         - Appending to same file during current run
         
+        Rows are kept in memory; call finalize() to write the file.
+        
         Args:
             df: pandas.DataFrame to save
             filename: Name of the Excel file
@@ -46,29 +96,33 @@ class ExcelManager:
         Returns:
             bool: True if save successful, False otherwise
         """
-        print(f"\n>>> [SAVING] Saving to Excel file: {filename}")
+        logger.info(f"\n>>> [SAVING] Saving to Excel file: {filename}")
         
         if df is None or len(df) == 0:
-            print("   [WARNING] No data to save!")
+            logger.warning("   [WARNING] No data to save!")
             self._log_no_data_error(destination)
             return False
         
         try:
             filepath = os.path.join(self.output_dir, filename)
             
-            # Check if this is first save or append
-            if not self.first_save_done:
-                filepath = self._handle_first_save(filepath, filename)
-            else:
-                filepath = self._handle_append_save(df)
-            
-            # Save to Excel
-            return self._write_excel(df, filepath)
+            with self._lock:
+                # Check if this is first save or append
+                if not self.first_save_done:
+                    self._handle_first_save(filepath, filename)
+                else:
+                    self._handle_append_save(df)
+                
+                self._frames.append(df)
+                self._row_count += len(df)
+                
+                self._has_unwritten_rows = True
+                self._write_checkpoint(df)
+            return True
             
         except Exception as e:
-            print(f"   [ERROR] Failed to save Excel: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"   [ERROR] Failed to save Excel: {e}")
+            logger.exception(f"Failed to save Excel for {destination}")
             return False
     
     def _handle_first_save(self, filepath, filename):
@@ -83,19 +137,25 @@ class ExcelManager:
             str: Path to use for saving
         """
         if os.path.exists(filepath):
-            print(f"   [Info] File from previous run exists - creating new version...")
+            logger.info(f"   [Info] File from previous run exists - creating new version...")
             filepath = self._create_versioned_filename(filepath, filename)
         else:
-            print(f"   [Info] Creating new file for this run...")
+            logger.info(f"   [Info] Creating new file for this run...")
         
         self.current_run_filepath = filepath
+        self._run_filename = filename
         self.first_save_done = True
         
+        self._recover_checkpoint()
+        
         return filepath
     
     def _handle_append_save(self, new_df):
         """
-        Handle appending to existing file from current run.
+        Handle appending to the current run's in-memory data.
+        
+        The caller keeps new_df with the run's other frames; they are
+        concatenated once in finalize(), not on every append.
         
         Args:
             new_df: New DataFrame to append
@@ -103,23 +163,10 @@ class ExcelManager:
         Returns:
             str: Path to the current run's file
         """
-        print(f"   [Info] Appending to current run's file: {os.path.basename(self.current_run_filepath)}")
-        
-        # Read existing data
-        existing_df = pd.read_excel(self.current_run_filepath, sheet_name="Inland Rates")
+        logger.info(f"   [Info] Appending to current run's file: {os.path.basename(self.current_run_filepath)}")
+        logger.info(f"   [Info] Existing rows: {self._row_count}, "
+              f"New rows: {len(new_df)}, Total: {self._row_count + len(new_df)}")
         
-        # Ensure Rate column in existing data is also numeric
-        if 'Rate' in existing_df.columns:
-            existing_df['Rate'] = pd.to_numeric(existing_df['Rate'], errors='coerce')
-        
-        # Combine DataFrames
-        combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-        print(f"   [Info] Existing rows: {len(existing_df)}, "
-              f"New rows: {len(new_df)}, Total: {len(combined_df)}")
-        
-        # Update the DataFrame to save
-        # We need to return the filepath and use combined_df
-        # Modify the calling code to handle this
         return self.current_run_filepath
     
     def _create_versioned_filename(self, filepath, filename):
@@ -134,13 +181,19 @@ class ExcelManager:
             str: Versioned file path
         """
         name, ext = os.path.splitext(filename)
-        version = 2
-        while os.path.exists(os.path.join(self.output_dir, f"{name}_{version}{ext}")):
-            version += 1
+        prefix = f"{name}_"
+        
+        # One directory listing instead of probing _2, _3, ... one by one
+        versions = [
+            int(f[len(prefix):len(f) - len(ext)])
+            for f in os.listdir(self.output_dir)
+            if f.startswith(prefix) and f.endswith(ext) and f[len(prefix):len(f) - len(ext)].isdigit()
+        ]
+        version = max(versions, default=1) + 1
         
         versioned_filepath = os.path.join(self.output_dir, f"{name}_{version}{ext}")
         filename_used = f"{name}_{version}{ext}"
-        print(f"   [Info] Using: {filename_used}")
+        logger.info(f"   [Info] Using: {filename_used}")
         
         return versioned_filepath
     
@@ -155,25 +208,136 @@ class ExcelManager:
         Returns:
             bool: True if successful, False otherwise
         """
+        engine, engine_kwargs = _excel_engine()
+        
         try:
-            # If appending, read and combine first
-            if self.first_save_done and filepath == self.current_run_filepath and os.path.exists(filepath):
-                existing_df = pd.read_excel(filepath, sheet_name="Inland Rates")
-                if 'Rate' in existing_df.columns:
-                    existing_df['Rate'] = pd.to_numeric(existing_df['Rate'], errors='coerce')
-                df = pd.concat([existing_df, df], ignore_index=True)
-            
-            df.to_excel(filepath, index=False, sheet_name="Inland Rates")
-            print(f"   [SUCCESS] Saved {len(df)} total rows to: {filepath}")
-            print(f"   [Info] Columns: {list(df.columns)}")
+            with pd.ExcelWriter(filepath, engine=engine, engine_kwargs=engine_kwargs) as writer:
+                df.to_excel(writer, index=False, sheet_name="Inland Rates")
+            logger.info(f"   [SUCCESS] Saved {len(df)} total rows to: {filepath}")
+            logger.info(f"   [Info] Columns: {list(df.columns)}")
             return True
         except PermissionError:
-            print(f"   [ERROR] File is open in another program. Please close it and try again.")
+            logger.error(f"   [ERROR] File is open in another program. Please close it and try again.")
             return False
         except Exception as e:
-            print(f"   [ERROR] Error writing Excel file: {e}")
+            logger.error(f"   [ERROR] Error writing Excel file: {e}")
             return False
     
+    def _checkpoint_dir(self):
+        """Folder of Parquet checkpoint parts next to this run's Excel file."""
+        return os.path.splitext(self.current_run_filepath)[0] + ".parts"
+    
+    def _write_checkpoint(self, df):
+        """
+        Save one destination's rows as a Parquet part in the checkpoint folder.
+        
+        Excel is only written by finalize(), so the parts keep the data of a
+        run that crashes before then; the next run writing the same file
+        picks them up in _recover_checkpoint(). Each save writes only its own
+        rows, never the earlier ones. Requires pyarrow; skipped otherwise.
+        
+        Args:
+            df: DataFrame just added to this run
+        """
+        if not _has_parquet():
+            return
+        
+        try:
+            checkpoint_dir = self._checkpoint_dir()
+            os.makedirs(checkpoint_dir, exist_ok=True)
+            part_path = os.path.join(checkpoint_dir, f"part_{self._checkpoint_parts:05d}.parquet")
+            
+            # Metadata columns mix '' and numbers, which Parquet cannot store in one column
+            mixed = {col: str for col in df.columns if df[col].dtype == object}
+            df.astype(mixed).to_parquet(part_path, index=False, compression='zstd')
+            self._checkpoint_parts += 1
+        except Exception as e:
+            logger.warning(f"   [WARNING] Could not write checkpoint: {e}")
+    
+    def _recover_checkpoint(self):
+        """
+        Fold in the checkpoint parts an unfinished run left for this file.
+        
+        The recovered rows come first and are written by finalize() together
+        with this run's rows; the folder is then removed as usual.
+        """
+        checkpoint_dir = self._checkpoint_dir()
+        if not os.path.isdir(checkpoint_dir):
+            return
+        
+        if not _has_parquet():
+            logger.warning(f"   [WARNING] Found checkpoint of an unfinished run but pyarrow is not installed: {checkpoint_dir}")
+            return
+        
+        parts = sorted(f for f in os.listdir(checkpoint_dir) if f.endswith(".parquet"))
+        try:
+            frames = [pd.read_parquet(os.path.join(checkpoint_dir, f)) for f in parts]
+        except Exception as e:
+            logger.warning(f"   [WARNING] Could not read checkpoint {checkpoint_dir}: {e}")
+            return
+        
+        # New parts are numbered after the recovered ones, so none is overwritten
+        self._checkpoint_parts = len(parts)
+        for df in frames:
+            self._frames.append(df)
+            self._row_count += len(df)
+        
+        if self._row_count:
+            self._has_unwritten_rows = True
+        logger.info(f"   [Info] Recovered {self._row_count} rows of an unfinished run from: {checkpoint_dir}")
+    
+    def _remove_checkpoint(self):
+        """Delete the checkpoint folder once the Excel file holds all rows."""
+        try:
+            shutil.rmtree(self._checkpoint_dir())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"   [WARNING] Could not remove checkpoint: {e}")
+    
+    def finalize(self):
+        """
+        Write all rows saved during this run to the Excel file.
+        
+        If the file cannot be written (e.g. it is open in Excel), the next
+        free version (_2, _3, ...) is tried; current_run_filepath then points
+        at the file actually written.
+        
+        Returns:
+            bool: True if written (or nothing to write), False otherwise
+        """
+        with self._lock:
+            if not self._frames or not self._has_unwritten_rows:
+                return True
+            
+            # One concat for the whole run instead of one per destination
+            if len(self._frames) > 1:
+                self._frames = [pd.concat(self._frames, ignore_index=True)]
+            
+            logger.info(f"\n>>> [SAVING] Writing {self._row_count} rows to Excel...")
+            filepath = self.current_run_filepath
+            if not self._write_excel(self._frames[0], filepath):
+                # The target is often just open in Excel; try the next free version
+                filepath = self._create_versioned_filename(filepath, self._run_filename)
+                if not self._write_excel(self._frames[0], filepath):
+                    self._log_unwritten_rows()
+                    return False
+            
+            self._has_unwritten_rows = False
+            self._remove_checkpoint()
+            self.current_run_filepath = filepath
+            return True
+    
+    def _log_unwritten_rows(self):
+        """Tell the user where the rows of a run that could not be written are kept."""
+        logger.error(f"   [ERROR] {self._row_count} rows were NOT written to Excel!")
+        if self._checkpoint_parts:
+            logger.error(f"   [ERROR] They are saved as Parquet parts in: {self._checkpoint_dir()}")
+            logger.error("   [ERROR] The next run that writes this file will include them")
+        else:
+            logger.error("   [ERROR] No Parquet checkpoint exists (pyarrow not installed); "
+                         "the rows are lost when this run exits")
+    
     def _log_no_data_error(self, destination):
         """
         Log an error when no data is available to save.
@@ -183,16 +347,16 @@ class ExcelManager:
         """
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            dest_clean = destination.replace(", ", "_").replace(" ", "_")
+            dest_clean = _SANITIZE_RE.sub('_', destination)
             error_msg = (f"No data to save for {destination}\n"
                         f"Timestamp: {timestamp}\n"
                         f"Reason: Empty data returned from scraper")
             log_path = os.path.join(self.error_folder, f"NO_DATA_{dest_clean}_{timestamp}.txt")
             with open(log_path, 'w', encoding='utf-8') as f:
                 f.write(error_msg)
-            print(f"   [ERROR] Error log saved: {log_path}")
+            logger.error(f"   [ERROR] Error log saved: {log_path}")
         except Exception as log_err:
-            print(f"   [WARNING] Could not save error log: {log_err}")
+            logger.warning(f"   [WARNING] Could not save error log: {log_err}")
     
     def save_exception_log(self, destination, error, driver=None):
         """
@@ -205,30 +369,35 @@ class ExcelManager:
         """
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            dest_clean = destination.replace(", ", "_").replace(" ", "_")
+            dest_clean = _SANITIZE_RE.sub('_', destination)
             
             # Save screenshot if driver available
             if driver:
                 screenshot_path = os.path.join(self.error_folder, 
                                              f"EXCEPTION_{dest_clean}_{timestamp}.png")
                 driver.save_screenshot(screenshot_path)
-                print(f"   [ERROR] Screenshot saved: {screenshot_path}")
+                logger.error(f"   [ERROR] Screenshot saved: {screenshot_path}")
             
             # Save error log
             error_log = (f"Exception processing: {destination}\n"
                         f"Timestamp: {timestamp}\n"
                         f"Error: {error}\n\n"
-                        f"Stack trace available in console output")
+                        f"Stack trace available in {ERROR_LOG_NAME}")
             log_path = os.path.join(self.error_folder, 
                                    f"EXCEPTION_{dest_clean}_{timestamp}.txt")
             with open(log_path, 'w', encoding='utf-8') as f:
                 f.write(error_log)
-            print(f"   [ERROR] Error log saved: {log_path}")
+            logger.error(f"   [ERROR] Error log saved: {log_path}")
             
         except Exception as save_err:
-            print(f"   [WARNING] Could not save error files: {save_err}")
+            logger.warning(f"   [WARNING] Could not save error files: {save_err}")
     
     def reset_for_new_run(self):
         """Reset state for a new run."""
         self.current_run_filepath = None
+        self._run_filename = None
         self.first_save_done = False
+        self._frames = []
+        self._row_count = 0
+        self._has_unwritten_rows = False
+        self._checkpoint_parts = 0
@@ -0,0 +1,324 @@
+"""
+HTTP Fast Path Module
+Replays the tariff search request over plain HTTP once the browser session is warm.
+
+After one destination has been scraped through Selenium, the XHR that
+loaded its results is read from Chrome's performance log: a request to
+the tariff site carrying every location value, answered with HTML.
+Later destinations resend that request with their own location
+parameters through a requests.Session carrying the browser's cookies,
+and the Inland Tariff (DOOR) table in the response is parsed with
+selectolax. Whenever the fast path cannot use a response (401/403,
+non-HTML body, no Inland Tariff table), it returns None and the caller
+scrapes the destination in the browser as usual.
+
+Enable with QUICK_DOWNLOAD_HTTP=1 (requires requests and selectolax).
+"""
+
+import os
+import re
+import json
+from urllib.parse import quote, urlparse
+
+from .config_loader import DYNAMIC_PARAM_KEYS, SEARCH_BASE_URL
+from ._log import logger
+
+
+HTTP_FAST_PATH_ENV = "QUICK_DOWNLOAD_HTTP"
+
+# Seconds to wait for a replayed search request
+REQUEST_TIMEOUT = 30
+
+# Chrome resource types that can carry the search results
+_XHR_TYPES = frozenset({"XHR", "Fetch"})
+
+# The search request goes to the tariff site itself, never to a third-party host
+_SEARCH_HOST = urlparse(SEARCH_BASE_URL).hostname
+
+# Ancestor tags that can hold the Inland Tariff (DOOR) block
+_SECTION_TAGS = frozenset({"div", "section"})
+
+# Headers requests computes itself (or that would leak the browser's cookies twice)
+_SKIPPED_HEADERS = frozenset({"content-length", "host", "cookie", "accept-encoding"})
+
+_TOTAL_RE = re.compile(r'Total:\s*(\d+)\s*results?', re.IGNORECASE)
+
+
+def http_fast_path_enabled():
+    """Return True if the HTTP fast path was switched on via the environment."""
+    return os.environ.get(HTTP_FAST_PATH_ENV) == "1"
+
+
+class HttpFastPath:
+    """Replays a captured search XHR for further destinations."""
+    
+    def __init__(self, config_loader, use_import=True):
+        """
+        Initialize the fast path (nothing is captured yet).
+        
+        Args:
+            config_loader: ConfigLoader with destination configs loaded
+            use_import: If True, use import params; otherwise export params
+        """
+        self.config_loader = config_loader
+        self.use_import = use_import
+        self.disabled = False
+        self._session = None
+        self._request = None
+        self._template_params = None
+    
+    @property
+    def ready(self):
+        """True once a search request has been captured and still works."""
+        return self._request is not None and not self.disabled
+    
+    def capture(self, driver, params):
+        """
+        Find the search XHR sent for params and copy the browser session.
+        
+        Args:
+            driver: WebDriver started with performance logging
+            params: Search parameters of the destination just scraped
+        
+        Returns:
+            bool: True if a request was captured
+        """
+        try:
+            import requests
+            entries = driver.get_log('performance')
+        except Exception as e:
+            logger.info(f"   [Info] HTTP fast path unavailable: {e}")
+            self.disabled = True
+            return False
+        
+        markers = [str(params[k]) for k in DYNAMIC_PARAM_KEYS if params.get(k)]
+        if not markers:
+            logger.info("   [Info] HTTP fast path: no location parameters to match, staying in the browser")
+            self.disabled = True
+            return False
+        
+        # Candidate requests by id, then only those answered with an HTML 200
+        candidates = {}
+        html_responses = set()
+        for entry in entries:
+            message = json.loads(entry['message'])['message']
+            method = message.get('method')
+            event = message.get('params', {})
+            
+            if method == 'Network.responseReceived':
+                response = event.get('response', {})
+                if response.get('status') == 200 and 'html' in response.get('mimeType', ''):
+                    html_responses.add(event.get('requestId'))
+                continue
+            
+            if method != 'Network.requestWillBeSent' or event.get('type') not in _XHR_TYPES:
+                continue
+            
+            request = event['request']
+            if urlparse(request['url']).hostname != _SEARCH_HOST:
+                continue
+            
+            # Every location value must appear, not just one (analytics calls echo some of them)
+            body = request.get('postData') or ''
+            haystack = request['url'] + body
+            if all(m in haystack or quote(m, safe='') in haystack for m in markers):
+                candidates[event['requestId']] = {
+                    'method': request['method'],
+                    'url': request['url'],
+                    'headers': {
+                        k: v for k, v in request.get('headers', {}).items()
+                        if not k.startswith(':') and k.lower() not in _SKIPPED_HEADERS
+                    },
+                    'body': body,
+                }
+        
+        # The last matching request is the one that returned the results
+        for request_id, request in candidates.items():
+            if request_id in html_responses:
+                self._request = request
+        
+        if self._request is None:
+            logger.info("   [Info] HTTP fast path: no search request found, staying in the browser")
+            self.disabled = True
+            return False
+        
+        self._template_params = dict(params)
+        self._session = requests.Session()
+        for cookie in driver.get_cookies():
+            self._session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain'), path=cookie.get('path', '/')
+            )
+        
+        logger.info(f"   [Info] HTTP fast path: captured {self._request['method']} {self._request['url'][:80]}")
+        return True
+    
+    def process_destination(self, destination):
+        """
+        Fetch and parse one destination without the browser.
+        
+        Args:
+            destination: Destination name to process
+        
+        Returns:
+            dict: Result dictionary like DestinationProcessor.process_destination,
+                  or None if the browser should handle this destination
+        """
+        if not self.ready or not self.config_loader.get_config_for_destination(destination):
+            return None
+        
+        import requests
+        
+        params = self.config_loader.get_params_for_destination(destination, self.use_import)
+        request = self._build_request(params)
+        if request is None:
+            return None
+        
+        try:
+            response = self._session.request(
+                request['method'], request['url'],
+                headers=request['headers'], data=request['body'] or None,
+                timeout=REQUEST_TIMEOUT
+            )
+        except requests.RequestException as e:
+            logger.info(f"   [Info] HTTP fast path failed for {destination}: {e}")
+            return None
+        
+        if response.status_code in (401, 403):
+            logger.info(f"   [Info] HTTP fast path rejected ({response.status_code}); using the browser from now on")
+            self.disabled = True
+            return None
+        
+        if not response.ok or 'html' not in response.headers.get('Content-Type', ''):
+            return None
+        
+        table_data = self._parse_table(response.text)
+        if table_data is None:
+            return None
+        
+        logger.info(f"   [Success] HTTP fast path: {table_data['rowCount']} rows for {destination}")
+        return {
+            'success': True,
+            'destination': destination,
+            'data': table_data,
+            'params': params
+        }
+    
+    def _build_request(self, params):
+        """Swap the captured destination's location values for those in params."""
+        url = self._request['url']
+        body = self._request['body']
+        
+        # Several keys share a value (e.g. origin and destination name); swap each once
+        replacements = {}
+        for key in DYNAMIC_PARAM_KEYS:
+            old = str(self._template_params.get(key) or '')
+            new = str(params.get(key) or '')
+            if not old or old == new:
+                continue
+            if not new:
+                return None  # A value cannot be removed from the captured request reliably
+            replacements[old] = new
+        
+        for old, new in replacements.items():
+            quoted_old = quote(old, safe='')
+            if quoted_old in url:
+                url = url.replace(quoted_old, quote(new, safe=''))
+            else:
+                url = url.replace(old, new)
+            body = body.replace(old, new)
+        
+        return dict(self._request, url=url, body=body)
+    
+    def _parse_table(self, html):
+        """
+        Parse the Inland Tariff (DOOR) table into TableScraper's columnar format.
+        
+        Args:
+            html: Response body
+        
+        Returns:
+            dict: headers, columns, rowCount and totalCount, or None if the
+                  section or its rows are missing
+        """
+        try:
+            # The lexbor backend replaced the deprecated modest one in selectolax 1.0
+            from selectolax.lexbor import LexborHTMLParser as HTMLParser
+        except ImportError:
+            try:
+                from selectolax.parser import HTMLParser
+            except ImportError:
+                HTMLParser = None
+        if HTMLParser is None:
+            logger.info("   [Info] selectolax is not installed; HTTP fast path disabled")
+            self.disabled = True
+            return None
+        
+        section = _find_inland_section(HTMLParser(html))
+        if section is None:
+            return None
+        table = section.css_first('table')
+        
+        rows = table.css('tr')
+        if len(rows) < 2:
+            return None
+        
+        headers = [cell.text(strip=True) for cell in rows[0].css('th, td')]
+        keys = [h or f'Column_{i}' for i, h in enumerate(headers)]
+        columns = [[] for _ in keys]
+        row_count = 0
+        
+        for row in rows[1:]:
+            values = [cell.text(strip=True) for cell in row.css('td')]
+            if not any(values) or (headers and 'Container Type' in values[0]):
+                continue
+            
+            # Open a column (padded for earlier rows) for cells beyond the known ones
+            while len(columns) < len(values):
+                keys.append(f'Column_{len(columns)}')
+                columns.append([None] * row_count)
+            
+            for i, column in enumerate(columns):
+                column.append(values[i] if i < len(values) else None)
+            row_count += 1
+        
+        if row_count == 0:
+            return None
+        
+        match = _TOTAL_RE.search(section.text())
+        
+        return {
+            'headers': headers,
+            'columns': dict(zip(keys, columns)),
+            'rowCount': row_count,
+            'totalCount': int(match.group(1)) if match else 0
+        }
+
+
+def _find_inland_section(tree):
+    """
+    Find the Inland Tariff (DOOR) block, as TableScraper does in the browser.
+    
+    Climbs from each table to the outermost div/section mentioning
+    'Inland Tariff' and 'DOOR', stopping before any ancestor that also
+    holds the Arbitrary Tariff (CY) block.
+    
+    Args:
+        tree: Parsed HTMLParser document
+    
+    Returns:
+        Node: The section element, or None if the page has none
+    """
+    for table in tree.css('table'):
+        section = None
+        parent = table.parent
+        while parent is not None:
+            text = parent.text()
+            if 'Arbitrary Tariff' in text:
+                break
+            if parent.tag in _SECTION_TAGS and 'Inland Tariff' in text and 'DOOR' in text:
+                section = parent
+            parent = parent.parent
+        if section is not None:
+            return section
+    return None
@@ -0,0 +1,289 @@
+"""
+Parallel Processing Module
+Scrapes destinations concurrently, one browser per worker.
+
+Two modes are available:
+- processes (default): a multiprocessing pool where every worker process
+  keeps a private BrowserManager for its lifetime
+- threads: a thread pool sharing a DriverPool; each thread borrows one
+  driver at a time, so no driver is ever used by two threads at once
+
+Workers only scrape and clean data; Excel writes stay in the caller.
+"""
+
+import os
+import time
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.util import Finalize
+
+from .config_loader import ConfigLoader
+from .browser_manager import BrowserManager, DriverPool
+from .table_scraper import TableScraper
+from .data_processor import DataProcessor
+from .excel_manager import ExcelManager
+from .destination_processor import DestinationProcessor
+from ._log import logger, start_worker_listener, attach_worker_queue
+
+
+# Default number of browser processes (override with QUICK_DOWNLOAD_WORKERS)
+DEFAULT_WORKERS = 4
+
+# Destinations handled by a worker before its Chrome process is recycled
+MAX_TASKS_PER_WORKER = 10
+
+# Delay between worker browser launches so they don't hit the site at once (seconds)
+WORKER_STAGGER = 0.1
+
+# Per-process state created by _init_worker
+_worker = {}
+
+
+def get_worker_count(pending=None):
+    """
+    Determine how many worker processes to start.
+    
+    Args:
+        pending: Number of destinations to process (caps the worker count)
+    
+    Returns:
+        int: Number of worker processes
+    """
+    env_value = os.environ.get("QUICK_DOWNLOAD_WORKERS")
+    workers = int(env_value) if env_value else min(DEFAULT_WORKERS, os.cpu_count() or 1)
+    
+    if pending is not None:
+        workers = min(workers, pending)
+    
+    return max(1, workers)
+
+
+def _build_components(handle):
+    """Create the driver-bound components for the current worker."""
+    table_scraper = TableScraper(handle, error_folder=_worker['error_folder'])
+    _worker['processor'] = DestinationProcessor(handle, _worker['config_loader'], table_scraper)
+
+
+def _close_worker():
+    """Close the worker's browser when the process exits."""
+    browser_manager = _worker.get('browser_manager')
+    if browser_manager:
+        browser_manager.close_browser()
+
+
+def _init_worker(download_dir, error_folder, use_import, processes=1, log_queue=None):
+    """
+    Pool initializer: start a browser and load configs for this process.
+    
+    Args:
+        download_dir: Directory for downloads
+        error_folder: Directory for error screenshots and logs
+        use_import: If True, use import params; otherwise export params
+        processes: Pool size, used to stagger worker start-up
+        log_queue: Queue from start_worker_listener; console output goes to the parent
+    """
+    if log_queue is not None:
+        attach_worker_queue(log_queue)
+    
+    # Stagger workers by their pool index in WORKER_STAGGER steps (recycled
+    # workers get new indexes, so wrap around at the pool size)
+    identity = multiprocessing.current_process()._identity
+    if identity:
+        time.sleep(((identity[-1] - 1) % processes) * WORKER_STAGGER)
+    
+    config_loader = ConfigLoader()
+    config_loader.load_destination_configs()
+    
+    browser_manager = BrowserManager(download_dir=download_dir)
+    
+    _worker.update({
+        'config_loader': config_loader,
+        'browser_manager': browser_manager,
+        'data_processor': DataProcessor(),
+        'excel_manager': ExcelManager(output_dir=download_dir, error_folder=error_folder),
+        'error_folder': error_folder,
+        'use_import': use_import,
+    })
+    
+    browser_manager.setup_browser()
+    
+    # Components follow browser_manager.handle, so restarts need no rebuild
+    _build_components(browser_manager.handle)
+    
+    # Runs on normal worker exit, including maxtasksperchild recycling
+    Finalize(None, _close_worker, exitpriority=10)
+
+
+def _scrape_indexed(task):
+    """
+    Pool entry point: scrape one (index, destination) task.
+    
+    Args:
+        task: Tuple of (position in the destination list, destination name)
+    
+    Returns:
+        tuple: (index, result dict) so the parent can restore input order
+    """
+    index, destination = task
+    return index, _scrape_destination(destination)
+
+
+def _scrape_destination(destination):
+    """
+    Scrape and clean one destination in a worker process.
+    
+    Args:
+        destination: Destination name to process
+    
+    Returns:
+        dict: Result with success status, destination, cleaned data or error
+    """
+    logger.info(f"\n[Worker {os.getpid()}] Processing {destination}...")
+    
+    try:
+        result = _worker['processor'].process_destination(destination, use_import=_worker['use_import'])
+        
+        if result['success']:
+            result['data'] = _worker['data_processor'].clean_and_validate(
+                result['data'],
+                result['destination']
+            )
+        
+        return result
+    
+    except Exception as e:
+        logger.error(f">>> [ERROR] Exception processing {destination}: {e}")
+        logger.exception(f"Exception processing {destination}")
+        
+        browser_manager = _worker['browser_manager']
+        _worker['excel_manager'].save_exception_log(destination, e, browser_manager.get_driver())
+        
+        # Restart this worker's browser so later destinations can continue
+        try:
+            browser_manager.restart_browser()
+        except Exception as restart_err:
+            logger.error(f">>> [FATAL] Could not restart browser: {restart_err}")
+        
+        return {
+            'success': False,
+            'destination': destination,
+            'error': f'Exception: {e}'
+        }
+
+
+def scrape_destinations_parallel(destinations, download_dir, error_folder,
+                                 use_import=True, processes=None):
+    """
+    Scrape destinations concurrently, one browser per worker process.
+    
+    Args:
+        destinations: List of destination names
+        download_dir: Directory for downloads
+        error_folder: Directory for error screenshots and logs
+        use_import: If True, use import params; otherwise export params
+        processes: Number of worker processes (defaults to get_worker_count())
+    
+    Returns:
+        list: Result dictionaries in the same order as destinations
+    """
+    if not destinations:
+        return []
+    
+    processes = processes or get_worker_count(len(destinations))
+    
+    # Resolve ChromeDriver once here so workers don't all run webdriver-manager
+    os.environ["CHROMEDRIVER_PATH"] = BrowserManager.preinstall_driver()
+    
+    logger.info(f">>> Starting {processes} browser worker(s)...")
+    
+    # Workers log through the parent so their lines never interleave and
+    # only the parent writes the error log file
+    log_queue, log_listener = start_worker_listener(error_folder)
+    
+    pool = multiprocessing.Pool(
+        processes=processes,
+        initializer=_init_worker,
+        initargs=(download_dir, error_folder, use_import, processes, log_queue),
+        maxtasksperchild=MAX_TASKS_PER_WORKER
+    )
+    
+    results = [None] * len(destinations)
+    
+    try:
+        # Consume results as workers finish so progress shows up immediately
+        tasks = list(enumerate(destinations))
+        for done, (index, result) in enumerate(pool.imap_unordered(_scrape_indexed, tasks), 1):
+            results[index] = result
+            status = "OK" if result['success'] else "FAILED"
+            logger.info(f">>> [{done}/{len(destinations)}] {result['destination']}: {status}")
+    finally:
+        # close/join (not terminate) so workers run their browser cleanup
+        pool.close()
+        pool.join()
+        log_listener.stop()
+    
+    return results
+
+
+def scrape_destinations_threaded(destinations, download_dir, error_folder,
+                                 use_import=True, workers=None):
+    """
+    Scrape destinations concurrently on threads sharing a pool of browsers.
+    
+    Args:
+        destinations: List of destination names
+        download_dir: Directory for downloads
+        error_folder: Directory for error screenshots and logs
+        use_import: If True, use import params; otherwise export params
+        workers: Number of threads and browsers (defaults to get_worker_count())
+    
+    Returns:
+        list: Result dictionaries in the same order as destinations
+    """
+    if not destinations:
+        return []
+    
+    workers = workers or get_worker_count(len(destinations))
+    
+    config_loader = ConfigLoader()
+    config_loader.load_destination_configs()
+    data_processor = DataProcessor()
+    excel_manager = ExcelManager(output_dir=download_dir, error_folder=error_folder)
+    
+    driver_pool = DriverPool(workers, download_dir=download_dir)
+    
+    def process_one(destination):
+        manager = driver_pool.acquire()
+        healthy = True
+        try:
+            driver = manager.get_driver()
+            table_scraper = TableScraper(driver, error_folder=error_folder)
+            processor = DestinationProcessor(driver, config_loader, table_scraper)
+            
+            result = processor.process_destination(destination, use_import=use_import)
+            if result['success']:
+                result['data'] = data_processor.clean_and_validate(result['data'], result['destination'])
+            return result
+        
+        except Exception as e:
+            logger.error(f">>> [ERROR] Exception processing {destination}: {e}")
+            logger.exception(f"Exception processing {destination}")
+            excel_manager.save_exception_log(destination, e, manager.get_driver())
+            
+            # The pool restarts this browser in the background
+            healthy = False
+            
+            return {
+                'success': False,
+                'destination': destination,
+                'error': f'Exception: {e}'
+            }
+        finally:
+            driver_pool.release(manager, healthy=healthy)
+    
+    try:
+        driver_pool.open()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(process_one, destinations))
+    finally:
+        driver_pool.close()
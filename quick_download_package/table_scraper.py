@@ -3,119 +3,197 @@ Table Scraping Module
 Handles extraction of data from the Inland Tariff table on the web page.
 """
 
-import time
 import os
-from datetime import datetime
+import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from .browser_manager import DriverHandle
+from ._log import logger
+
+
+# Any table-like container; its presence means results have rendered
+_TABLE_LOCATOR = (By.XPATH, "//table | //div[contains(@class, 'table')] | //div[@role='table']")
+
+# Timestamp format for error screenshot names
+SCREENSHOT_TIME_FORMAT = "%Y%m%d_%H%M%S"
+
+# Characters of page text kept by the fallback extraction
+FALLBACK_TEXT_LIMIT = 5000
+
+# Rows returned per WebDriver call; larger tables are fetched in slices
+ROW_CHUNK_SIZE = 100
+
+# Next slice of the rows stashed by the extraction script; the last slice drops the stash
+_ROW_CHUNK_JS = """
+    var table = window.__inlandTariffTable;
+    var start = arguments[0], end = arguments[0] + arguments[1];
+    var slice = table.columns.map(function(column) { return column.slice(start, end); });
+    if (end >= table.rowCount) delete window.__inlandTariffTable;
+    return slice;
+"""
+
+# Rows count as loaded once the DOM has been quiet this long (ms)
+TABLE_QUIET_MS = 250
+
+# Upper bound for the table-stable wait (seconds)
+TABLE_STABLE_TIMEOUT = 15
+
+# Resolves with the row count once no DOM mutation has happened for arguments[0] ms
+_WAIT_FOR_STABLE_JS = """
+    var quietMs = arguments[0];
+    var done = arguments[arguments.length - 1];
+    var last = Date.now();
+    var observer = new MutationObserver(function() { last = Date.now(); });
+    observer.observe(document.body, {childList: true, subtree: true});
+    
+    (function poll() {
+        if (Date.now() - last > quietMs) {
+            observer.disconnect();
+            done(document.querySelectorAll('tbody tr').length);
+        } else {
+            setTimeout(poll, 100);
+        }
+    })();
+"""
+
 
 class TableScraper:
     """Scrapes table data from the ONE Line Inland Tariff page."""
     
+    # Error folders already created in this process (scrapers are rebuilt after each crash)
+    _folders_ready = set()
+    
     def __init__(self, driver, error_folder=None):
         """
         Initialize the table scraper.
         
         Args:
-            driver: Selenium WebDriver instance
+            driver: Selenium WebDriver instance, or a DriverHandle to follow browser swaps
             error_folder: Directory for error screenshots (defaults to ./scraping_errors)
         """
-        self.driver = driver
+        self._handle = driver if isinstance(driver, DriverHandle) else DriverHandle(driver)
+        self._wait_driver = None
+        self._wait_cache = None
         self.error_folder = error_folder or os.path.join(os.getcwd(), "scraping_errors")
         
-        # Ensure error folder exists
-        if not os.path.exists(self.error_folder):
-            os.makedirs(self.error_folder)
+        # Ensure error folder exists (once per folder per process)
+        if self.error_folder not in TableScraper._folders_ready:
+            os.makedirs(self.error_folder, exist_ok=True)
+            TableScraper._folders_ready.add(self.error_folder)
+    
+    @property
+    def driver(self):
+        """Current WebDriver instance."""
+        return self._handle.driver
+    
+    @property
+    def _wait(self):
+        """WebDriverWait for the current driver (rebuilt only after a browser swap)."""
+        if self._wait_driver is not self.driver:
+            self._wait_cache = WebDriverWait(self.driver, 15)
+            self._wait_driver = self.driver
+        return self._wait_cache
     
     def scrape_inland_tariff_table(self):
         """
         Scrape all data from the Inland Tariff (DOOR) table on the page.
         
         Returns:
-            dict: Contains 'headers', 'data', and 'totalCount' keys
-                  'data' is a list of dictionaries with the table data
+            dict: Contains 'headers', 'columns', 'rowCount' and 'totalCount' keys
+                  'columns' maps each column name to its list of cell values
         """
-        print("\n>>> [SCRAPING] Extracting table data from page...")
+        logger.info("\n>>> [SCRAPING] Extracting table data from page...")
         
         try:
             # Wait for table to be visible
-            table_container = WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((
-                    By.XPATH, 
-                    "//table | //div[contains(@class, 'table')] | //div[@role='table']"
-                ))
-            )
-            print("   [Info] Table container found!")
+            table_container = self._wait.until(EC.presence_of_element_located(_TABLE_LOCATOR))
+            logger.info("   [Info] Table container found!")
             
-            # Scroll to ensure all rows are loaded (for lazy loading)
+            # Scroll to trigger lazy loading and wait until rows stop arriving
             self._scroll_page()
             
-            # Give table time to fully populate
-            time.sleep(3)
-            
             # Extract table data using JavaScript - TARGET ONLY INLAND TARIFF (DOOR)
             table_data = self._extract_table_data_js()
             
-            print(f"   [Success] Found {len(table_data['data'])} rows")
-            print(f"   [Info] Headers: {table_data['headers']}")
+            logger.info(f"   [Success] Found {table_data['rowCount']} rows")
+            logger.info(f"   [Info] Headers: {table_data['headers']}")
             
-            if len(table_data['data']) > 0:
-                print(f"   [Sample] First row: {list(table_data['data'][0].values())[:3]}...")
-                print(f"   [Sample] Last row: {list(table_data['data'][-1].values())[:3]}...")
+            if table_data['rowCount'] > 0:
+                sample_columns = list(table_data['columns'].values())[:3]
+                logger.info(f"   [Sample] First row: {[column[0] for column in sample_columns]}...")
+                logger.info(f"   [Sample] Last row: {[column[-1] for column in sample_columns]}...")
             
             return table_data
             
         except Exception as e:
-            print(f"   [ERROR] Failed to scrape table: {e}")
+            logger.error(f"   [ERROR] Failed to scrape table: {e}")
             self._save_error_screenshot("SCRAPE_FAILED")
             
             # Fallback: try to get visible text data
             return self._fallback_text_extraction()
     
     def _scroll_page(self):
-        """Scroll the page to ensure all content is loaded."""
+        """Scroll the page and wait until the table stops changing."""
         try:
             # Scroll down to make sure all rows are loaded
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)
+            self._wait_for_table_stable()
             self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(1)
         except Exception as e:
-            print(f"   [Warning] Scroll error: {e}")
+            logger.warning(f"   [Warning] Scroll error: {e}")
+    
+    def _wait_for_table_stable(self):
+        """
+        Block until no DOM mutation has happened for TABLE_QUIET_MS.
+        
+        Returns:
+            int: Number of table body rows once the page is quiet
+        """
+        self.driver.set_script_timeout(TABLE_STABLE_TIMEOUT)
+        return self.driver.execute_async_script(_WAIT_FOR_STABLE_JS, TABLE_QUIET_MS)
     
     def _extract_table_data_js(self):
         """
         Extract table data using JavaScript.
         Targets specifically the Inland Tariff (DOOR) section.
         
+        Rows are collected column by column in the browser (one array per
+        column) so the payload does not repeat every header name per row.
+        Only the first ROW_CHUNK_SIZE rows come back with the first call;
+        longer tables stay in the page and are fetched slice by slice.
+        
         Returns:
-            dict: Contains headers, data, and totalCount
+            dict: Contains headers, columns, rowCount, and totalCount
         """
         table_data = self.driver.execute_script("""
-            var data = [];
             var headers = [];
+            var keys = [];
+            var columns = [];
+            var rowCount = 0;
             
-            // Find all sections on the page
-            var allSections = document.querySelectorAll('div, section');
+            // Start from the few tables on the page and climb their ancestors,
+            // instead of reading the text of every div/section
             var inlandSection = null;
+            var inlandTable = null;
+            var tables = document.querySelectorAll('table');
             
-            // Look for the section containing "Inland Tariff (DOOR)"
-            for (var i = 0; i < allSections.length; i++) {
-                var sectionText = allSections[i].textContent;
-                // Look for Inland Tariff (DOOR) but NOT Arbitrary Tariff (CY)
-                if (sectionText.includes('Inland Tariff') && sectionText.includes('DOOR')) {
-                    // Make sure this section doesn't contain "Arbitrary Tariff"
-                    if (!sectionText.includes('Arbitrary Tariff')) {
-                        inlandSection = allSections[i];
-                        console.log('Found Inland Tariff (DOOR) section');
-                        break;
+            for (var t = 0; t < tables.length && !inlandSection; t++) {
+                for (var p = tables[t].parentElement; p; p = p.parentElement) {
+                    var sectionText = p.textContent;
+                    // Everything above an Arbitrary Tariff (CY) block contains it too
+                    if (sectionText.includes('Arbitrary Tariff')) break;
+                    
+                    // Keep climbing to the outermost div/section of the Inland Tariff (DOOR) block
+                    if ((p.tagName === 'DIV' || p.tagName === 'SECTION') &&
+                        sectionText.includes('Inland Tariff') && sectionText.includes('DOOR')) {
+                        inlandSection = p;
                     }
                 }
             }
             
-            // Fallback: Look for section headers
+            // Fallback: a heading naming the section, then its nearest ancestor holding a table
             if (!inlandSection) {
                 var allHeaders = document.querySelectorAll('h1, h2, h3, h4, h5, h6, strong, b, .title, .header, [class*="title"], [class*="header"]');
                 for (var i = 0; i < allHeaders.length; i++) {
@@ -123,9 +201,8 @@ class TableScraper:
                     if ((headerText.includes('Inland Tariff') || headerText.includes('DOOR')) && 
                         !headerText.includes('Arbitrary') && !headerText.includes('CY)')) {
                         console.log('Found Inland Tariff header:', headerText);
-                        // Get parent section/div
                         var parent = allHeaders[i].parentElement;
-                        while (parent && parent.querySelectorAll('table').length === 0) {
+                        while (parent && !parent.querySelector('table')) {
                             parent = parent.parentElement;
                         }
                         if (parent) {
@@ -138,16 +215,11 @@ class TableScraper:
             
             if (!inlandSection) {
                 console.error('Could not find Inland Tariff (DOOR) section');
-                return {headers: [], data: [], error: 'Inland Tariff section not found'};
+                return {headers: [], keys: [], columns: [], rowCount: 0, error: 'Inland Tariff section not found'};
             }
             
-            // Find the table within the Inland section only
-            var inlandTable = inlandSection.querySelector('table');
-            
-            if (!inlandTable) {
-                console.error('No table found in Inland Tariff section');
-                return {headers: [], data: [], error: 'No table in Inland Tariff section'};
-            }
+            // First table within the Inland section only
+            inlandTable = inlandSection.querySelector('table');
             
             console.log('Found Inland Tariff table');
             
@@ -161,8 +233,10 @@ class TableScraper:
                 }
             }
             
-            headerCells.forEach(function(cell) {
+            headerCells.forEach(function(cell, cellIndex) {
                 headers.push(cell.textContent.trim());
+                keys.push(headers[cellIndex] || 'Column_' + cellIndex);
+                columns.push([]);
             });
             
             console.log('Headers:', headers);
@@ -178,66 +252,101 @@ class TableScraper:
             console.log('Data rows found:', rows.length);
             
             // Look for "Total: X results" text in the Inland Tariff section
-            var totalText = '';
-            var totalCount = 0;
-            var totalElements = inlandSection.querySelectorAll('*');
-            for (var i = 0; i < totalElements.length; i++) {
-                var elemText = totalElements[i].textContent.trim();
-                // Look for "Total: X results" pattern (case insensitive)
-                if (elemText.match(/Total:\\s*\\d+\\s*results?/i)) {
-                    totalText = elemText;
-                    // Extract just the number
-                    var match = elemText.match(/Total:\\s*(\\d+)\\s*results?/i);
-                    if (match) {
-                        totalCount = parseInt(match[1]);
-                        console.log('Found total count:', totalCount);
-                    }
-                    break;
-                }
-            }
+            // One regex over the section text instead of a per-element scan
+            var totalMatch = inlandSection.textContent.match(/Total:\\s*(\\d+)\\s*results?/i);
+            var totalCount = totalMatch ? parseInt(totalMatch[1], 10) : 0;
+            console.log('Total count:', totalCount);
             
-            rows.forEach(function(row) {
-                var cells = row.querySelectorAll('td');
-                if (cells.length === 0) return; // Skip if no td cells (probably a header row)
+            function pushRow(values) {
+                // Only add row if it has actual data and is not a header
+                var hasData = values.some(function(value) { return value; });
+                if (!hasData || (headers.length > 0 && values[0].includes('Container Type'))) return;
                 
-                var rowData = {};
-                var hasData = false;
+                // Open a column (padded for earlier rows) for cells beyond the known ones
+                while (columns.length < values.length) {
+                    keys.push(headers[columns.length] || 'Column_' + columns.length);
+                    columns.push(new Array(rowCount).fill(null));
+                }
                 
-                cells.forEach(function(cell, cellIndex) {
-                    var header = headers[cellIndex] || 'Column_' + cellIndex;
-                    var value = cell.textContent.trim();
-                    rowData[header] = value;
-                    if (value) hasData = true;
+                columns.forEach(function(column, cellIndex) {
+                    column.push(cellIndex < values.length ? values[cellIndex] : null);
                 });
-                
-                // Only add row if it has actual data and is not a header
-                if (hasData && !rowData[headers[0]]?.includes('Container Type')) {
-                    data.push(rowData);
-                }
+                rowCount++;
+            }
+            
+            // Fast path: one innerText read, rows split on newlines and cells on tabs
+            var lines = inlandTable.innerText.split(/\\r?\\n/).filter(function(line) {
+                return line.trim();
             });
+            var parsedRows = lines.slice(1).map(function(line) {
+                return line.split('\\t').map(function(value) { return value.trim(); });
+            });
+            var fastPathOk = headers.length > 0 && parsedRows.length === rows.length &&
+                parsedRows.every(function(cells) { return cells.length === headers.length; });
             
-            console.log('Final data rows:', data.length);
-            return {headers: headers, data: data, totalCount: totalCount};
-        """)
+            if (fastPathOk) {
+                parsedRows.forEach(pushRow);
+            } else {
+                // Multi-line or hidden cells break the split; read cell by cell instead
+                rows.forEach(function(row) {
+                    var cells = row.querySelectorAll('td');
+                    if (cells.length === 0) return; // Skip if no td cells (probably a header row)
+                    
+                    pushRow(Array.from(cells).map(function(cell) {
+                        return cell.textContent.trim();
+                    }));
+                });
+            }
+            
+            console.log('Final data rows:', rowCount);
+            
+            // Keep the rest in the page for _ROW_CHUNK_JS and return the first slice
+            var limit = arguments[0];
+            if (rowCount > limit) {
+                window.__inlandTariffTable = {columns: columns, rowCount: rowCount};
+            }
+            return {
+                headers: headers,
+                keys: keys,
+                columns: columns.map(function(column) { return column.slice(0, limit); }),
+                rowCount: rowCount,
+                totalCount: totalCount
+            };
+        """, ROW_CHUNK_SIZE)
         
-        return table_data
+        columns = table_data['columns']
+        for offset in range(ROW_CHUNK_SIZE, table_data['rowCount'], ROW_CHUNK_SIZE):
+            chunk = self.driver.execute_script(_ROW_CHUNK_JS, offset, ROW_CHUNK_SIZE)
+            for column, part in zip(columns, chunk):
+                column.extend(part)
+        
+        return {
+            'headers': table_data['headers'],
+            'columns': dict(zip(table_data['keys'], columns)),
+            'rowCount': table_data['rowCount'],
+            'totalCount': table_data.get('totalCount', 0)
+        }
     
     def _save_error_screenshot(self, prefix="ERROR"):
         """Save a screenshot when an error occurs."""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = time.strftime(SCREENSHOT_TIME_FORMAT)
             screenshot_path = os.path.join(self.error_folder, f"{prefix}_{timestamp}.png")
             self.driver.save_screenshot(screenshot_path)
-            print(f"   [ERROR] Screenshot saved: {screenshot_path}")
+            logger.error(f"   [ERROR] Screenshot saved: {screenshot_path}")
         except Exception as screenshot_err:
-            print(f"   [WARNING] Could not save screenshot: {screenshot_err}")
+            logger.warning(f"   [WARNING] Could not save screenshot: {screenshot_err}")
     
     def _fallback_text_extraction(self):
         """Fallback method to extract visible text if table scraping fails."""
         try:
-            print("   [Fallback] Attempting to extract visible text...")
-            all_text = self.driver.find_element(By.TAG_NAME, "body").text
-            print(f"   [Debug] Page text length: {len(all_text)} characters")
-            return {"headers": ["Raw_Data"], "data": [{"Raw_Data": all_text[:5000]}], "totalCount": 0}
+            logger.info("   [Fallback] Attempting to extract visible text...")
+            # Truncate in the browser so only the kept text crosses the WebDriver wire
+            text_length, all_text = self.driver.execute_script(
+                "var text = document.body.innerText; return [text.length, text.slice(0, arguments[0])];",
+                FALLBACK_TEXT_LIMIT
+            )
+            logger.info(f"   [Debug] Page text length: {text_length} characters")
+            return {"headers": ["Raw_Data"], "columns": {"Raw_Data": [all_text]}, "rowCount": 1, "totalCount": 0}
         except:
-            return {"headers": [], "data": [], "totalCount": 0}
+            return {"headers": [], "columns": {}, "rowCount": 0, "totalCount": 0}
@@ -9,6 +9,7 @@ organization and easier debugging.
 import os
 import sys
 import time
+import argparse
 
 # --- CONFIG: IGNORE SSL ERRORS ---
 os.environ["WDM_SSL_VERIFY"] = "0"
@@ -16,27 +17,111 @@ os.environ["WDM_LOCAL"] = "1"
 
 from quick_download_package import (
     ConfigLoader,
-    BrowserManager,
+    DriverPool,
+    DriverHandle,
     TableScraper,
     DataProcessor,
     ExcelManager,
     DestinationProcessor
 )
+from quick_download_package.pool_runner import (
+    get_worker_count,
+    scrape_destinations_parallel,
+    scrape_destinations_threaded
+)
+from quick_download_package.http_fast_path import HttpFastPath, http_fast_path_enabled
+from quick_download_package._log import logger
 
 
 # --- CONFIGURATION ---
 USE_IMPORT = True  # Set to False for Export, True for Import
 DOWNLOAD_DIR = os.path.join(os.getcwd(), "downloads")
 ERROR_FOLDER = os.path.join(os.getcwd(), "scraping_errors")
+SERIAL_POOL_SIZE = 1  # One browser; QUICK_DOWNLOAD_WARM_SPARE=1 adds a spare for crash recovery
+MIN_DISPATCH_INTERVAL = 1.0  # Minimum seconds between the starts of two searches
+
 
+def _print_run_summary(results, destinations, filename, saved=True):
+    """Print the end-of-run summary and the list of failed destinations."""
+    logger.info("\n" + "=" * 60)
+    logger.info("PROCESSING COMPLETE")
+    logger.info("=" * 60)
+    successful = sum(1 for r in results if r['success'])
+    logger.info(f"Successful: {successful}/{len(destinations)}")
+    if saved:
+        logger.info(f"Output file: {filename}")
+        logger.info(f"Location: {DOWNLOAD_DIR}")
+    else:
+        logger.error("Output file: NOT WRITTEN - see the errors above for where the data was kept")
+    logger.info("=" * 60)
+    
+    # Show failed destinations
+    failed = [r for r in results if not r['success']]
+    if failed:
+        logger.info("\nFailed destinations:")
+        for r in failed:
+            logger.info(f"  - {r['destination']}: {r.get('error', 'Unknown error')}")
 
-def quick_download():
+
+def quick_download_parallel(config_loader, excel_manager, destinations, workers):
+    """
+    Scrape destinations in parallel browser processes and save to Excel.
+    
+    Args:
+        config_loader: ConfigLoader with destination configs loaded
+        excel_manager: ExcelManager used for all saves (parent process only)
+        destinations: List of destination names
+        workers: Number of browser worker processes
+    """
+    filename = config_loader.generate_filename()
+    
+    logger.info("\n" + "=" * 60)
+    logger.info(f"OUTPUT FILE: {filename}")
+    logger.info(f"DESTINATIONS: {len(destinations)}")
+    logger.info(f"MODE: {'IMPORT' if USE_IMPORT else 'EXPORT'}")
+    logger.info(f"WORKERS: {workers}")
+    logger.info("=" * 60)
+    
+    # QUICK_DOWNLOAD_POOL=threads shares browsers between threads instead of processes
+    if os.environ.get("QUICK_DOWNLOAD_POOL") == "threads":
+        results = scrape_destinations_threaded(
+            destinations, DOWNLOAD_DIR, ERROR_FOLDER,
+            use_import=USE_IMPORT, workers=workers
+        )
+    else:
+        results = scrape_destinations_parallel(
+            destinations, DOWNLOAD_DIR, ERROR_FOLDER,
+            use_import=USE_IMPORT, processes=workers
+        )
+    
+    # Save in destination order; data was already cleaned by the workers
+    for result in results:
+        if not result['success']:
+            continue
+        
+        if result['data'] is not None:
+            if not excel_manager.save_to_excel(result['data'], filename, result['destination']):
+                logger.warning(f">>> [WARNING] Failed to save data for {result['destination']}")
+        else:
+            logger.warning(f">>> [WARNING] No data to save for {result['destination']}")
+    
+    # Write the whole run to Excel once (may fall back to a versioned name)
+    saved = excel_manager.finalize()
+    filename = os.path.basename(excel_manager.current_run_filepath or filename)
+    
+    _print_run_summary(results, destinations, filename, saved)
+
+
+def quick_download(workers=None):
     """
     Main function: Loop through destinations, scrape each, and save to Excel.
+    
+    Args:
+        workers: Number of parallel browsers (default: min(4, CPUs, destinations));
+                 1 runs the serial loop
     """
     # Initialize components
     config_loader = ConfigLoader()
-    browser_manager = BrowserManager(download_dir=DOWNLOAD_DIR)
     excel_manager = ExcelManager(output_dir=DOWNLOAD_DIR, error_folder=ERROR_FOLDER)
     data_processor = DataProcessor()
     
@@ -45,40 +130,71 @@ def quick_download():
     destinations = config_loader.get_destinations()
     
     if not destinations:
-        print("\n>>> No destinations found in destination_configs.json. Exiting.")
-        print(">>> Please run url_checker_refactored.py first to generate destination configs.")
+        logger.info("\n>>> No destinations found in destination_configs.json. Exiting.")
+        logger.info(">>> Please run url_checker_refactored.py first to generate destination configs.")
         return
     
-    print(f">>> Loaded {len(destinations)} destinations from destination_configs.json:")
+    logger.info(f">>> Loaded {len(destinations)} destinations from destination_configs.json:")
     for i, dest in enumerate(destinations, 1):
-        print(f"    {i}. {dest}")
+        logger.info(f"    {i}. {dest}")
+    
+    # Use one browser per worker process when more than one worker is available
+    workers = min(workers, len(destinations)) if workers else get_worker_count(len(destinations))
+    if workers > 1:
+        quick_download_parallel(config_loader, excel_manager, destinations, workers)
+        return
+    
+    # QUICK_DOWNLOAD_HTTP=1 replays the search over HTTP after the first destination
+    fast_path = HttpFastPath(config_loader, use_import=USE_IMPORT) if http_fast_path_enabled() else None
     
-    # Setup browser
-    driver = browser_manager.setup_browser()
+    # QUICK_DOWNLOAD_WARM_SPARE=1 keeps a second browser ready, so a crash swaps
+    # to it instead of waiting for the relaunch
+    pool_size = SERIAL_POOL_SIZE + 1 if os.environ.get("QUICK_DOWNLOAD_WARM_SPARE") == "1" else SERIAL_POOL_SIZE
+    driver_pool = DriverPool(pool_size, download_dir=DOWNLOAD_DIR,
+                             capture_network=fast_path is not None)
+    manager = None
+    
+    # Components read the driver through this handle, so a browser swap needs no rebuild
+    driver_handle = DriverHandle()
     
     try:
+        driver_pool.open()
+        manager = driver_pool.acquire()
+        driver_handle.driver = manager.get_driver()
+        
         # Initialize components that need driver
-        table_scraper = TableScraper(driver, error_folder=ERROR_FOLDER)
-        destination_processor = DestinationProcessor(driver, config_loader, table_scraper)
+        table_scraper = TableScraper(driver_handle, error_folder=ERROR_FOLDER)
+        destination_processor = DestinationProcessor(driver_handle, config_loader, table_scraper)
         
         # Generate filename (same for all destinations)
         filename = config_loader.generate_filename()
         
-        print("\n" + "=" * 60)
-        print(f"OUTPUT FILE: {filename}")
-        print(f"DESTINATIONS: {len(destinations)}")
-        print(f"MODE: {'IMPORT' if USE_IMPORT else 'EXPORT'}")
-        print("=" * 60)
+        logger.info("\n" + "=" * 60)
+        logger.info(f"OUTPUT FILE: {filename}")
+        logger.info(f"DESTINATIONS: {len(destinations)}")
+        logger.info(f"MODE: {'IMPORT' if USE_IMPORT else 'EXPORT'}")
+        logger.info("=" * 60)
         
         # Process each destination
         results = []
+        last_dispatch = 0.0
         
         for i, destination in enumerate(destinations, 1):
-            print(f"\n[{i}/{len(destinations)}] Processing {destination}...")
+            # Only wait if the previous search started less than MIN_DISPATCH_INTERVAL ago
+            elapsed = time.monotonic() - last_dispatch
+            if elapsed < MIN_DISPATCH_INTERVAL:
+                time.sleep(MIN_DISPATCH_INTERVAL - elapsed)
+            last_dispatch = time.monotonic()
+            
+            logger.info(f"\n[{i}/{len(destinations)}] Processing {destination}...")
             
             try:
-                # Process destination
-                result = destination_processor.process_destination(destination, use_import=USE_IMPORT)
+                # Process destination (over HTTP when possible, otherwise in the browser)
+                result = fast_path.process_destination(destination) if fast_path else None
+                if result is None:
+                    result = destination_processor.process_destination(destination, use_import=USE_IMPORT)
+                    if fast_path and result['success'] and not fast_path.ready and not fast_path.disabled:
+                        fast_path.capture(driver_handle.driver, result['params'])
                 results.append(result)
                 
                 if result['success']:
@@ -97,85 +213,78 @@ def quick_download():
                         )
                         
                         if not success:
-                            print(f">>> [WARNING] Failed to save data for {destination}")
+                            logger.warning(f">>> [WARNING] Failed to save data for {destination}")
                     else:
-                        print(f">>> [WARNING] No data to save for {destination}")
+                        logger.warning(f">>> [WARNING] No data to save for {destination}")
                 
             except Exception as e:
-                print(f">>> [ERROR] Exception processing {destination}: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.error(f">>> [ERROR] Exception processing {destination}: {e}")
+                logger.exception(f"Exception processing {destination}")
                 
                 # Save error screenshot and log
-                excel_manager.save_exception_log(destination, e, driver)
-                
-                # Try to restart browser on crash
-                try:
-                    driver = browser_manager.restart_browser()
-                    # Reinitialize components with new driver
-                    table_scraper = TableScraper(driver, error_folder=ERROR_FOLDER)
-                    destination_processor = DestinationProcessor(
-                        driver, config_loader, table_scraper
-                    )
-                except Exception as restart_err:
-                    print(f">>> [FATAL] Could not restart browser: {restart_err}")
-                    break
+                excel_manager.save_exception_log(destination, e, driver_handle.driver)
                 
                 results.append({
                     'success': False,
                     'destination': destination,
                     'error': f'Exception: {e}'
                 })
-            
-            # Small delay between destinations
-            time.sleep(1)
+                
+                # Swap to a warm browser if there is one; the failed one restarts in the background
+                driver_pool.release(manager, healthy=False)
+                manager = None
+                try:
+                    manager = driver_pool.acquire()
+                    driver_handle.driver = manager.get_driver()
+                except Exception as restart_err:
+                    logger.error(f">>> [FATAL] Could not restart browser: {restart_err}")
+                    break
         
-        # Summary
-        print("\n" + "=" * 60)
-        print("PROCESSING COMPLETE")
-        print("=" * 60)
-        successful = sum(1 for r in results if r['success'])
-        print(f"Successful: {successful}/{len(destinations)}")
-        print(f"Output file: {filename}")
-        print(f"Location: {DOWNLOAD_DIR}")
-        print("=" * 60)
+        # Write the whole run to Excel once (may fall back to a versioned name)
+        saved = excel_manager.finalize()
+        filename = os.path.basename(excel_manager.current_run_filepath or filename)
         
-        # Show failed destinations
-        failed = [r for r in results if not r['success']]
-        if failed:
-            print("\nFailed destinations:")
-            for r in failed:
-                print(f"  - {r['destination']}: {r.get('error', 'Unknown error')}")
+        # Summary
+        _print_run_summary(results, destinations, filename, saved)
     
     except Exception as e:
-        print(f"\n!!! CRITICAL ERROR: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"\n!!! CRITICAL ERROR: {e}")
+        logger.exception("Critical error")
         
         try:
-            driver.save_screenshot(os.path.join(ERROR_FOLDER, "scraping_error.png"))
-            print("Screenshot saved: scraping_error.png")
+            driver_handle.driver.save_screenshot(os.path.join(ERROR_FOLDER, "scraping_error.png"))
+            logger.info("Screenshot saved: scraping_error.png")
         except:
             pass
     
     finally:
-        browser_manager.close_browser()
+        # Write everything collected so far, even if the run stopped early
+        if not excel_manager.finalize():
+            logger.error(">>> [ERROR] Scraped data is still not written to Excel")
+        if manager:
+            driver_pool.release(manager)
+        driver_pool.close()
 
 
 if __name__ == "__main__":
-    print("=" * 60)
-    print("WEB SCRAPER - ONE Line Inland Tariff")
-    print("REFACTORED VERSION - Using quick_download_package")
-    print("=" * 60)
-    print(f"Mode: {'IMPORT' if USE_IMPORT else 'EXPORT'}")
-    print(f"Output Directory: {DOWNLOAD_DIR}")
-    print(f"Error Folder: {ERROR_FOLDER}")
-    print("\nMULTI-DESTINATION: Scraping from .json config and appending to single file")
-    print("SELF-CHECKING: Validating row counts for each city")
-    print("=" * 60)
-    
-    quick_download()
-    
-    print("\n" + "=" * 60)
-    print("DONE!")
-    print("=" * 60)
+    parser = argparse.ArgumentParser(description="Download ONE Line Inland Tariff data")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="parallel browsers (default: min(4, CPUs, destinations); 1 = serial)")
+    args = parser.parse_args()
+    
+    logger.info("=" * 60)
+    logger.info("WEB SCRAPER - ONE Line Inland Tariff")
+    logger.info("REFACTORED VERSION - Using quick_download_package")
+    logger.info("=" * 60)
+    logger.info(f"Mode: {'IMPORT' if USE_IMPORT else 'EXPORT'}")
+    logger.info(f"Output Directory: {DOWNLOAD_DIR}")
+    logger.info(f"Error Folder: {ERROR_FOLDER}")
+    logger.info("\nMULTI-DESTINATION: Scraping from .json config and appending to single file")
+    logger.info("SELF-CHECKING: Validating row counts for each city")
+    logger.info("=" * 60)
+    
+    quick_download(workers=args.workers)
+    
+    logger.info("\n" + "=" * 60)
+    logger.info("DONE!")
+    logger.info("=" * 60)
@@ -2,10 +2,37 @@
 
 import os
 from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
-from .config import BROWSER_MAXIMIZE, IGNORE_CERT_ERRORS
+from .config import HEADLESS, BROWSER_MAXIMIZE, IGNORE_CERT_ERRORS, DRIVER_PATH_CACHE
+
+
+def _cached_driver_path(refresh=False):
+    """
+    Return the ChromeDriver path, installing it only if the cached one is gone
+    
+    Args:
+        refresh: Ignore the cache and ask webdriver-manager again
+        
+    Returns:
+        str: Path to the ChromeDriver executable
+    """
+    if not refresh and os.path.exists(DRIVER_PATH_CACHE):
+        with open(DRIVER_PATH_CACHE, 'r', encoding='utf-8') as f:
+            path = f.read().strip()
+        if path and os.path.exists(path):
+            return path
+    
+    path = ChromeDriverManager().install()
+    try:
+        os.makedirs(os.path.dirname(DRIVER_PATH_CACHE), exist_ok=True)
+        with open(DRIVER_PATH_CACHE, 'w', encoding='utf-8') as f:
+            f.write(path)
+    except OSError as e:
+        print(f"[WARNING] Could not cache driver path: {e}")
+    return path
 
 
 def setup_browser():
@@ -19,13 +46,31 @@ def setup_browser():
     
     options = webdriver.ChromeOptions()
     
-    if BROWSER_MAXIMIZE:
+    if HEADLESS:
+        options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        # Headless windows ignore --start-maximized; give the page a desktop layout
+        options.add_argument("--window-size=1920,1080")
+    elif BROWSER_MAXIMIZE:
         options.add_argument("--start-maximized")
     
+    # Nothing visual is read from the page; skip images, extensions and prompts
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    
     if IGNORE_CERT_ERRORS:
         options.add_argument("--ignore-certificate-errors")
     
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+    try:
+        driver = webdriver.Chrome(service=Service(_cached_driver_path()), options=options)
+    except SessionNotCreatedException:
+        # Cached driver no longer matches the installed Chrome; fetch a new one
+        print("[SETUP] Cached ChromeDriver is outdated, reinstalling...")
+        driver = webdriver.Chrome(service=Service(_cached_driver_path(refresh=True)), options=options)
     
     return driver
@@ -1,5 +1,7 @@
 """Configuration constants for URL checker"""
 
+import os
+
 # Website URL
 BASE_URL = "https://ecomm.one-line.com/one-ecom/prices/rate-tariff/inland-search"
 
@@ -11,6 +13,8 @@ DESTINATIONS_FILE_NAME = "destinations.txt"
 PAGE_LOAD_TIMEOUT = 30
 ELEMENT_WAIT_TIMEOUT = 20
 DROPDOWN_TIMEOUT = 4
+KEY_STEP_TIMEOUT = 0.5  # Wait for the highlight to move after an arrow key
+POLL_INTERVAL = 0.1
 SEARCH_RESULT_TIMEOUT = 30
 
 # Matching thresholds
@@ -23,6 +27,19 @@ WEAK_MATCH_SCORE = 200
 COUNTRY_BONUS_SCORE = 50
 MINIMUM_CONFIDENCE_SCORE = 800
 
+# Browsers run side by side (one destination each at a time); override with URL_CHECKER_WORKERS
+WORKERS = int(os.environ.get("URL_CHECKER_WORKERS", "1"))
+
+# Minimum gap between search page loads across all browsers (seconds)
+PAGE_LOAD_INTERVAL = 2
+
 # Browser options
+HEADLESS = True  # Set to False to watch the browser while debugging
 BROWSER_MAXIMIZE = True
 IGNORE_CERT_ERRORS = True
+
+# ChromeDriver path remembered between runs (skips webdriver-manager's update check)
+DRIVER_PATH_CACHE = os.path.join(os.path.expanduser("~"), ".wdm_cache", "chromedriver_path.txt")
+
+# Dropdown option verified for each destination, reused on later runs
+SELECTION_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "ocean_freight", "dest_cache.json")
@@ -1,7 +1,56 @@
 """Configuration file management"""
 
 import os
+import re
 import json
+import mmap
+import tempfile
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used otherwise
+    orjson = None
+
+
+# Parsed config files: path -> (mtime_ns, size, configs)
+_cache = {}
+
+# Destinations changed in memory but not yet written: path -> set of names
+_dirty = {}
+
+# Blank lines and comments in destinations.txt
+_SKIP_LINE_RE = re.compile(rb'^\s*(#|$)')
+
+
+def _file_key(config_file):
+    """Return (mtime_ns, size) identifying the current version of a file"""
+    stat = os.stat(config_file)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _dumps(configs):
+    """Serialize configs as indented UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(
+            configs,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        )
+    return (json.dumps(configs, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def _write_atomic(config_file, payload):
+    """Write bytes to a temp file next to config_file, then swap it in"""
+    directory = os.path.dirname(os.path.abspath(config_file))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        # os.write may write only part of a large payload; the file object loops
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, config_file)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 def get_config_file_path(filename):
@@ -9,11 +58,32 @@ def get_config_file_path(filename):
     return os.path.join(os.getcwd(), filename)
 
 
+def _cache_unsaved(config_file):
+    """
+    Cache an empty config dict that is not on disk yet
+    
+    The (None, None) key never matches a real file, so the next load reads
+    the file if it exists by then; until then flush_configs can save edits.
+    
+    Args:
+        config_file: Path to JSON config file
+        
+    Returns:
+        dict: The cached empty configs
+    """
+    configs = {}
+    _cache[config_file] = (None, None, configs)
+    return configs
+
+
 def load_configs(config_file, destinations_file=None):
     """
     Load existing destination configs from JSON file.
     If config doesn't exist, initialize from destinations.txt
     
+    The parsed dict is cached and reused while the file is unchanged on
+    disk; callers share it, so edits should be followed by mark_dirty().
+    
     Args:
         config_file: Path to JSON config file
         destinations_file: Path to destinations.txt file (optional)
@@ -23,8 +93,20 @@ def load_configs(config_file, destinations_file=None):
     """
     try:
         if os.path.exists(config_file):
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            key = _file_key(config_file)
+            cached = _cache.get(config_file)
+            if cached and (cached[0], cached[1]) == key:
+                return cached[2]
+            
+            if orjson is not None:
+                with open(config_file, 'rb') as f:
+                    configs = orjson.loads(f.read())
+            else:
+                with open(config_file, 'r', encoding='utf-8') as f:
+                    configs = json.load(f)
+            
+            _cache[config_file] = (*key, configs)
+            return configs
         else:
             # Config doesn't exist - initialize from destinations.txt
             print(f"\n[INFO] {config_file} not found. Initializing from destinations.txt...")
@@ -39,14 +121,14 @@ def load_configs(config_file, destinations_file=None):
                         "pods": ""
                     }
                 # Save the initialized config
-                with open(config_file, 'w', encoding='utf-8') as f:
-                    json.dump(initial_config, f, indent=2, ensure_ascii=False)
+                _write_atomic(config_file, _dumps(initial_config))
+                _cache[config_file] = (*_file_key(config_file), initial_config)
                 print(f"[SUCCESS] Created {config_file} with {len(destinations)} destinations")
                 return initial_config
-            return {}
+            return _cache_unsaved(config_file)
     except Exception as e:
         print(f"[ERROR] Could not load config file: {e}")
-        return {}
+        return _cache_unsaved(config_file)
 
 
 def save_configs(configs, config_file):
@@ -61,8 +143,9 @@ def save_configs(configs, config_file):
         bool: True if successful, False otherwise
     """
     try:
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(configs, f, indent=2, ensure_ascii=False)
+        _write_atomic(config_file, _dumps(configs))
+        _cache[config_file] = (*_file_key(config_file), configs)
+        _dirty.pop(config_file, None)
         print(f"\n[SUCCESS] Saved configurations to {config_file}")
         return True
     except Exception as e:
@@ -70,6 +153,32 @@ def save_configs(configs, config_file):
         return False
 
 
+def mark_dirty(config_file, destination):
+    """
+    Record that a destination changed in the cached configs.
+    
+    Args:
+        config_file: Path to JSON config file
+        destination: Destination whose config was updated
+    """
+    _dirty.setdefault(config_file, set()).add(destination)
+
+
+def flush_configs(config_file):
+    """
+    Write the cached configs to disk if any destination was marked dirty.
+    
+    Args:
+        config_file: Path to JSON config file
+        
+    Returns:
+        bool: True if nothing was pending or the save succeeded
+    """
+    if not _dirty.get(config_file) or config_file not in _cache:
+        return True
+    return save_configs(_cache[config_file][2], config_file)
+
+
 def load_destinations_from_file(destinations_file):
     """
     Load destination list from text file
@@ -84,11 +193,16 @@ def load_destinations_from_file(destinations_file):
     
     if os.path.exists(destinations_file):
         print(f"\n[INFO] Reading destinations from: {destinations_file}")
-        with open(destinations_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):  # Skip empty lines and comments
-                    destinations.append(line)
+        # mmap cannot map an empty file
+        if os.path.getsize(destinations_file) > 0:
+            with open(destinations_file, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Skip empty lines and comments
+                destinations = [
+                    line.strip().decode('utf-8')
+                    for line in mm[:].splitlines()
+                    if not _SKIP_LINE_RE.match(line)
+                ]
         print(f"[INFO] Loaded {len(destinations)} destination(s) from file")
     else:
         print(f"\n[ERROR] destinations.txt not found at: {destinations_file}")
@@ -1,6 +1,12 @@
 """Destination selection logic with smart matching"""
 
+import os
+import re
+import json
 import time
+import logging
+import functools
+import threading
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
@@ -8,9 +14,17 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
+try:
+    from rapidfuzz import process as fuzz_process, fuzz
+except ImportError:  # Optional; ties between equal scores go to the first option otherwise
+    fuzz_process = None
+
+from .error_summary import append_no_rates, append_error, save_error_artifacts, submit_error_write
 from .config import (
     ELEMENT_WAIT_TIMEOUT,
     DROPDOWN_TIMEOUT,
+    KEY_STEP_TIMEOUT,
+    POLL_INTERVAL,
     EXACT_MATCH_SCORE,
     NORMALIZED_MATCH_SCORE,
     ALL_PARTS_MATCH_SCORE,
@@ -18,14 +32,97 @@ from .config import (
     FIRST_WORD_MATCH_SCORE,
     WEAK_MATCH_SCORE,
     COUNTRY_BONUS_SCORE,
-    MINIMUM_CONFIDENCE_SCORE
+    MINIMUM_CONFIDENCE_SCORE,
+    SELECTION_CACHE_FILE
 )
 
+logger = logging.getLogger(__name__)
+
+# Destination search input, and the POD field that appears once a destination is chosen
+_DEST_INPUT_XPATH = "//label[contains(text(), 'Destination')]/following::input[1]"
+_POD_XPATH = "//label[contains(text(), 'POD')]/following::div[1]"
+
+# Dropdown option patterns, most specific first (first one that matches wins)
+_OPTION_SELECTORS = [
+    "div[role='option']",
+    "li[role='option']",
+    "div[class*='option']",
+    "li[class*='option']",
+    "div[class*='dropdown'] div",
+    "ul[class*='dropdown'] li",
+    "div[class='ant-select-item']",  # Ant Design
+    "div[class*='ant-select-item']",
+]
+
+# Tries _OPTION_SELECTORS in order inside the page; returns [selector, elements]
+_FIND_OPTIONS_JS = """
+    var selectors = arguments[0];
+    for (var i = 0; i < selectors.length; i++) {
+        var found = document.querySelectorAll(selectors[i]);
+        if (found.length) return [selectors[i], Array.from(found)];
+    }
+    return [null, []];
+"""
+
+# Snapshot of the input and every option after a keyboard step, in one round-trip
+_KEYBOARD_SNAPSHOT_JS = """
+    var input = arguments[0];
+    var options = document.querySelectorAll(arguments[1]);
+    return {
+        value: input.value || '',
+        active: input.getAttribute('aria-activedescendant') || '',
+        options: Array.from(options, function(el) {
+            return {
+                txt: (el.innerText || el.textContent || '').trim(),
+                cls: (el.getAttribute('class') || '').toLowerCase(),
+                sel: el.getAttribute('aria-selected') === 'true'
+                    || el.getAttribute('data-focused') === 'true'
+                    || el.getAttribute('data-selected') === 'true',
+                id: el.id
+            };
+        })
+    };
+"""
+
+# Class fragments that mark the option highlighted by keyboard navigation
+_FOCUSED_CLASS_STATES = ("focused", "selected", "active", "highlighted")
+
+# Scrolls the chosen option into view and clicks it in one round-trip
+_CLICK_OPTION_JS = "arguments[0].scrollIntoView(true); arguments[0].click();"
+
+# Reads every option's text in one round-trip and flags "(No rates available)"
+_OPTION_TEXTS_JS = """
+    return arguments[0].map(function(el) {
+        var text = (el.innerText || el.textContent || '').trim();
+        return [text, text.toLowerCase().indexOf('(no rates available)') !== -1];
+    });
+"""
+
+# Highest scores _calculate_match_score can return: exact city, country and region
+# match, or the "CITY, CITY, COUNTRY" special case when no region is given
+MAX_SCORE_WITH_REGION = EXACT_MATCH_SCORE + COUNTRY_BONUS_SCORE + 300
+MAX_SCORE_WITHOUT_REGION = EXACT_MATCH_SCORE + 100
+
+# Empties an input through the native value setter (so React sees the change)
+_CLEAR_INPUT_JS = """
+    var input = arguments[0];
+    var setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+    setter.call(input, '');
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+"""
+
+# Splits an option into its city part: "CITY, COUNTRY", "CITY - COUNTRY", "CITY (CC)", "CITY / COUNTRY"
+_HEAD_SPLIT_RE = re.compile(r"[,/()\-]| - ")
+
+# Verified dropdown option per destination (see _get_selection_cache)
+_selection_cache = None
+_selection_cache_lock = threading.Lock()
+
 # Stopwords that should not be used alone as search terms
-STOP_TOKENS = {
+STOP_TOKENS = frozenset({
     "LE", "LA", "DE", "DI", "DA", "DEL", "DES", "DU", "DO", "DOS", "DAS",
     "ST", "STE", "SAINT", "SAN", "SANTA", "EL", "AL", "THE", "OF"
-}
+})
 
 
 def select_destination(driver, destination_name):
@@ -59,15 +156,18 @@ def select_destination(driver, destination_name):
         country = destination_name
         region = None
     
+    # Normalized forms reused by every option below
+    city_upper = city.upper()
+    country_upper = country.upper()
+    city_normalized = city_upper.replace('-', ' ').strip()
+    city_parts = tuple(city_normalized.split())
+    
     try:
         wait = WebDriverWait(driver, ELEMENT_WAIT_TIMEOUT)
         
         # Find destination input field
         dest_input = wait.until(
-            EC.element_to_be_clickable((
-                By.XPATH, 
-                "//label[contains(text(), 'Destination')]/following::input[1]"
-            ))
+            EC.element_to_be_clickable((By.XPATH, _DEST_INPUT_XPATH))
         )
         
         # Determine search strategy based on city name
@@ -77,7 +177,7 @@ def select_destination(driver, destination_name):
         # 3. Multi-word cities (PORT KLANG, FOS SUR MER): type enough tokens for signal
         # 4. Single-word cities (VALENCE, TAMPERE): type full name for exact match
         
-        tokens = city.upper().replace('-', ' ').split()
+        tokens = city_parts
         
         if '-' in city:
             # Hyphenated city: type first part only (handle variations)
@@ -85,7 +185,7 @@ def select_destination(driver, destination_name):
             print(f"[STRATEGY] Hyphenated city: typing first part '{partial_search}' to handle variations")
         elif len(tokens) == 1:
             # Single-word city: type full name for exact match (avoid VALENCAY vs VALENCE)
-            partial_search = city.upper()
+            partial_search = city_upper
             print(f"[STRATEGY] Single-word city: typing full name '{partial_search}' for exact match")
         else:
             # Multi-word city: build a meaningful prefix with enough signal
@@ -105,46 +205,23 @@ def select_destination(driver, destination_name):
         
         # Clear and type search term
         dest_input.click()
-        dest_input.send_keys(Keys.CONTROL + "a")
-        dest_input.send_keys(Keys.DELETE)
-        dest_input.send_keys(partial_search)
-        time.sleep(0.3)
-        
-        # Normalize city name for comparison
-        city_normalized = city.upper().replace('-', ' ').strip()
-        city_parts = city_normalized.split()
+        _set_input_text(driver, dest_input, partial_search)
         
         # Use keyboard navigation to iterate through dropdown options
         print(f"[STRATEGY] Using keyboard navigation to scan dropdown options...")
         
-        # Wait a moment for dropdown to appear
-        time.sleep(1.0)  # Increased wait
-        
-        # Try multiple XPath patterns for dropdown options
-        option_xpaths = [
-            "//div[@role='option']",
-            "//li[@role='option']",
-            "//div[contains(@class, 'option')]",
-            "//li[contains(@class, 'option')]",
-            "//div[contains(@class, 'dropdown')]//div",
-            "//ul[contains(@class, 'dropdown')]//li",
-            "//div[@class='ant-select-item']",  # Ant Design
-            "//div[contains(@class, 'ant-select-item')]",
-        ]
-        
+        # Wait for the dropdown instead of sleeping a fixed time
         option_elements = []
-        for xpath_pattern in option_xpaths:
-            try:
-                elements = driver.find_elements(By.XPATH, xpath_pattern)
-                if elements:
-                    print(f"[DEBUG] Found {len(elements)} elements with: {xpath_pattern[:60]}")
-                    option_elements = elements
-                    break
-            except:
-                continue
+        matched_selector = None
+        try:
+            matched_selector, option_elements = _wait_for_options(driver)
+            if option_elements:
+                print(f"[DEBUG] Found {len(option_elements)} elements with: {matched_selector[:60]}")
+        except:
+            option_elements = []
         
         if not option_elements:
-            print(f"[WARN] No dropdown options found with any XPath pattern")
+            print(f"[WARN] No dropdown options found with any selector pattern")
         
         best_match_index = -1
         best_score = 0
@@ -159,11 +236,12 @@ def select_destination(driver, destination_name):
         unavailable_options = []
         if option_elements:
             print(f"[DEBUG] Reading {len(option_elements)} option elements from DOM")
-            for idx, opt in enumerate(option_elements[:20]):
-                text = (opt.text or opt.get_attribute("innerText") or opt.get_attribute("textContent") or "").strip()
+            candidates = option_elements[:20]
+            option_texts = driver.execute_script(_OPTION_TEXTS_JS, candidates)
+            for idx, (opt, (text, unavailable)) in enumerate(zip(candidates, option_texts)):
                 if text and len(text) > 1:  # Ignore single characters
                     # Filter out options marked as "(No rates available)"
-                    if "(No rates available)" in text or "(no rates available)" in text.lower():
+                    if unavailable:
                         unavailable_options.append(text)
                         print(f"   [DOM OPTION {idx+1}] {text[:70]}")
                     else:
@@ -173,40 +251,19 @@ def select_destination(driver, destination_name):
         # Check if ALL options are unavailable
         if unavailable_options and not all_dropdown_options:
             print(f"[ERROR] All {len(unavailable_options)} options show '(No rates available)'")
-            import os
-            from datetime import datetime
-            from .error_summary import append_no_rates
-            
-            # Save error screenshot and log
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_name = destination_name.replace(',', '').replace(' ', '_')
-            error_dir = os.path.join(os.getcwd(), 'error_checks')
-            os.makedirs(error_dir, exist_ok=True)
-            
-            screenshot_path = os.path.join(error_dir, f"NO_RATES_{safe_name}_{timestamp}.png")
-            try:
-                driver.save_screenshot(screenshot_path)
-                print(f"[ERROR] Screenshot saved: {screenshot_path}")
-            except Exception as e:
-                print(f"[WARNING] Could not save screenshot: {e}")
-            
-            log_path = os.path.join(error_dir, f"NO_RATES_{safe_name}_{timestamp}.txt")
-            try:
-                with open(log_path, 'w', encoding='utf-8') as f:
-                    f.write(f"ERROR: No Rates Available\n")
-                    f.write(f"{'='*60}\n\n")
-                    f.write(f"Destination: {destination_name}\n")
-                    f.write(f"Error: All dropdown options marked as '(No rates available)'\n\n")
-                    f.write(f"Unavailable options found:\n")
-                    for opt in unavailable_options:
-                        f.write(f"  - {opt}\n")
-                    f.write(f"\nTimestamp: {datetime.now()}\n")
-                print(f"[ERROR] Error log saved: {log_path}")
-            except Exception as e:
-                print(f"[WARNING] Could not save error log: {e}")
+            save_error_artifacts(driver, "NO_RATES", destination_name, [
+                "ERROR: No Rates Available",
+                "=" * 60,
+                "",
+                f"Destination: {destination_name}",
+                "Error: All dropdown options marked as '(No rates available)'",
+                "",
+                "Unavailable options found:",
+                *(f"  - {opt}" for opt in unavailable_options),
+            ])
             
             # Add to error summary (simple format for no rates)
-            append_no_rates(destination_name, city, country)
+            submit_error_write(append_no_rates, destination_name, city, country)
             
             return {'success': False, 'selected': None, 'error': 'All options show no rates available'}
         
@@ -219,73 +276,84 @@ def select_destination(driver, destination_name):
             best_option_text = None
             best_element = None
             
-            for idx, option_text, opt_element in all_dropdown_options:
-                option_text_upper = option_text.upper()
-                option_normalized = option_text_upper.replace('-', ' ')
-                
-                score = _calculate_match_score(
-                    city, city_normalized, city_parts, country, region,
-                    option_text_upper, option_normalized
+            # Only options in the expected country can be selected; if there are none,
+            # score them all so the wrong-country check below reports the closest one
+            candidate_options = all_dropdown_options
+            if country:
+                candidate_options = [
+                    o for o in all_dropdown_options if country_upper in o[1].upper()
+                ] or all_dropdown_options
+            
+            # An option verified for this destination before is taken without scoring the rest
+            cached_text = _get_selection_cache().get(destination_name)
+            cached_positions = [
+                i for i, (_, option_text, _) in enumerate(candidate_options) if option_text == cached_text
+            ]
+            
+            if cached_positions:
+                print(f"[CACHE] Option selected for this destination before: {cached_text[:70]}")
+                best_position = cached_positions[0]
+                cached_upper = cached_text.upper()
+                top_score = _calculate_match_score(
+                    city_upper, city_normalized, city_parts, country_upper, region,
+                    cached_upper, cached_upper.replace('-', ' ')
                 )
+            else:
+                # Normalize every option once, score them all, then pick the best
+                options_upper = [option_text.upper() for _, option_text, _ in candidate_options]
+                # Stop at the first option that reaches the highest possible score
+                max_score = MAX_SCORE_WITH_REGION if region else MAX_SCORE_WITHOUT_REGION
+                scores = []
+                for option_upper in options_upper:
+                    score = _calculate_match_score(
+                        city_upper, city_normalized, city_parts, country_upper, region,
+                        option_upper, option_upper.replace('-', ' ')
+                    )
+                    scores.append(score)
+                    if score >= max_score:
+                        break
                 
-                if score > best_score:
-                    best_score = score
-                    best_match_index = idx
-                    best_option_text = option_text
-                    best_element = opt_element
-                    print(f"   [NEW BEST] Score: {best_score} at index {idx}")
+                # Highest positive score wins; RapidFuzz breaks ties between equal scores
+                best_position = _pick_best_position(scores, options_upper, city_upper)
+                top_score = scores[best_position]
+            
+            if top_score > best_score:
+                best_score = top_score
+                best_match_index, best_option_text, best_element = candidate_options[best_position]
+                print(f"   [NEW BEST] Score: {best_score} at index {best_match_index}")
             
             print(f"[RESULT] Best match: index {best_match_index}, score {best_score}")
             
             # CRITICAL CHECK: If country was specified, verify best match includes correct country
             # This prevents selecting "ATHENS, AL, USA" when we want "ATHENS, GREECE"
             if best_option_text and country:
-                if country.upper() not in best_option_text.upper():
+                if country_upper not in best_option_text.upper():
                     print(f"[ERROR] Best match doesn't contain expected country '{country}'")
                     print(f"        Best option: {best_option_text[:70]}")
                     print(f"        This would be incorrect - rejecting selection")
                     
-                    import os
-                    from datetime import datetime
-                    from .error_summary import append_error
-                    
-                    # Save error screenshot and log
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    safe_name = destination_name.replace(',', '').replace(' ', '_')
-                    error_dir = os.path.join(os.getcwd(), 'error_checks')
-                    os.makedirs(error_dir, exist_ok=True)
-                    
-                    screenshot_path = os.path.join(error_dir, f"WRONG_COUNTRY_{safe_name}_{timestamp}.png")
-                    try:
-                        driver.save_screenshot(screenshot_path)
-                        print(f"[ERROR] Screenshot saved: {screenshot_path}")
-                    except Exception as e:
-                        print(f"[WARNING] Could not save screenshot: {e}")
-                    
-                    log_path = os.path.join(error_dir, f"WRONG_COUNTRY_{safe_name}_{timestamp}.txt")
-                    try:
-                        with open(log_path, 'w', encoding='utf-8') as f:
-                            f.write(f"ERROR: Wrong Country Selected\n")
-                            f.write(f"{'='*60}\n\n")
-                            f.write(f"Destination: {destination_name}\n")
-                            f.write(f"Expected Country: {country}\n")
-                            f.write(f"Best Match Found: {best_option_text}\n")
-                            f.write(f"Error: Best available option doesn't match expected country\n\n")
-                            if unavailable_options:
-                                f.write(f"Note: {len(unavailable_options)} options marked as '(No rates available)':\n")
-                                for opt in unavailable_options:
-                                    if country.upper() in opt.upper():
-                                        f.write(f"  - {opt} ← CORRECT COUNTRY BUT NO RATES\n")
-                                    else:
-                                        f.write(f"  - {opt}\n")
-                            f.write(f"\nTimestamp: {datetime.now()}\n")
-                        print(f"[ERROR] Error log saved: {log_path}")
-                    except Exception as e:
-                        print(f"[WARNING] Could not save error log: {e}")
+                    lines = [
+                        "ERROR: Wrong Country Selected",
+                        "=" * 60,
+                        "",
+                        f"Destination: {destination_name}",
+                        f"Expected Country: {country}",
+                        f"Best Match Found: {best_option_text}",
+                        "Error: Best available option doesn't match expected country",
+                    ]
+                    if unavailable_options:
+                        lines.append("")
+                        lines.append(f"Note: {len(unavailable_options)} options marked as '(No rates available)':")
+                        for opt in unavailable_options:
+                            if country_upper in opt.upper():
+                                lines.append(f"  - {opt} ← CORRECT COUNTRY BUT NO RATES")
+                            else:
+                                lines.append(f"  - {opt}")
+                    logged_at = save_error_artifacts(driver, "WRONG_COUNTRY", destination_name, lines)
                     
                     # Add to error summary
                     error_msg = f"Best available option doesn't match expected country {country}. Found: {best_option_text}"
-                    append_error("WRONG_COUNTRY", destination_name, error_msg, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                    submit_error_write(append_error, "WRONG_COUNTRY", destination_name, error_msg, logged_at.strftime('%Y-%m-%d %H:%M:%S'))
                     
                     return {'success': False, 'selected': None, 'error': f'No available options for {country}'}
             
@@ -293,15 +361,13 @@ def select_destination(driver, destination_name):
             if best_match_index >= 0 and best_score >= MINIMUM_CONFIDENCE_SCORE:
                 try:
                     print(f"[SELECTING] Clicking option: {best_option_text[:70]}")
-                    driver.execute_script("arguments[0].scrollIntoView(true);", best_element)
-                    time.sleep(0.2)
-                    driver.execute_script("arguments[0].click();", best_element)
+                    driver.execute_script(_CLICK_OPTION_JS, best_element)
                     time.sleep(0.5)
                     
                     # Verify selection worked
                     try:
                         WebDriverWait(driver, 10).until(
-                            EC.element_to_be_clickable((By.XPATH, "//label[contains(text(), 'POD')]/following::div[1]"))
+                            EC.element_to_be_clickable((By.XPATH, _POD_XPATH))
                         )
                         print(f"[SUCCESS] Selected best match via DOM click")
                         return _verify_destination_selection(driver, destination_name, city, region, country, best_option_text)
@@ -315,14 +381,12 @@ def select_destination(driver, destination_name):
                 # Score below threshold but we have a match - select anyway
                 print(f"[WARN] Best score ({best_score}) below threshold, selecting anyway...")
                 try:
-                    driver.execute_script("arguments[0].scrollIntoView(true);", best_element)
-                    time.sleep(0.2)
-                    driver.execute_script("arguments[0].click();", best_element)
+                    driver.execute_script(_CLICK_OPTION_JS, best_element)
                     time.sleep(0.5)
                     
                     try:
                         WebDriverWait(driver, 10).until(
-                            EC.element_to_be_clickable((By.XPATH, "//label[contains(text(), 'POD')]/following::div[1]"))
+                            EC.element_to_be_clickable((By.XPATH, _POD_XPATH))
                         )
                         return _verify_destination_selection(driver, destination_name, city, region, country, best_option_text)
                     except:
@@ -335,96 +399,20 @@ def select_destination(driver, destination_name):
         
         # Fallback: Try keyboard navigation if DOM reading failed
         print(f"[FALLBACK] DOM reading failed, trying keyboard navigation...")
+        focused_text = None
         for i in range(max_options):
             try:
-                # Press down arrow to move to next option
-                if i > 0:  # Don't press down on first iteration
-                    dest_input.send_keys(Keys.ARROW_DOWN)
-                    time.sleep(0.15)
-                else:
-                    # First press down to enter dropdown
-                    dest_input.send_keys(Keys.ARROW_DOWN)
-                    time.sleep(0.2)
-                
-                # Try multiple methods to read the focused option text
-                focused_text = None
+                # Press down arrow to move to the next option (the first press enters the dropdown)
+                dest_input.send_keys(Keys.ARROW_DOWN)
                 
-                # Method 1: Check the input field value (some dropdowns update it)
-                input_value = dest_input.get_attribute('value') or ""
-                if input_value and input_value != partial_search:
-                    focused_text = input_value
-                    print(f"   [READ METHOD 1] Input value: {input_value[:60]}")
-                
-                # Method 2: Look for aria-activedescendant
-                if not focused_text:
-                    try:
-                        active_id = dest_input.get_attribute('aria-activedescendant')
-                        if active_id:
-                            active_elem = driver.find_element(By.ID, active_id)
-                            text = (active_elem.text or active_elem.get_attribute("innerText") or active_elem.get_attribute("textContent") or "").strip()
-                            if text:
-                                focused_text = text
-                                print(f"   [READ METHOD 2] aria-activedescendant: {text[:60]}")
-                    except:
-                        pass
-                
-                # Method 3: Find element with focused/selected/active class
-                if not focused_text:
-                    try:
-                        active_option = driver.find_element(By.XPATH, 
-                            "//div[@role='option'][contains(@class, 'focused')] | "
-                            "//li[@role='option'][contains(@class, 'focused')] | "
-                            "//div[@role='option'][contains(@class, 'selected')] | "
-                            "//li[@role='option'][contains(@class, 'selected')] | "
-                            "//div[@role='option'][contains(@class, 'active')] | "
-                            "//li[@role='option'][contains(@class, 'active')] | "
-                            "//div[@role='option'][contains(@class, 'highlighted')] | "
-                            "//li[@role='option'][contains(@class, 'highlighted')]")
-                        text = (active_option.text or active_option.get_attribute("innerText") or active_option.get_attribute("textContent") or "").strip()
-                        if text:
-                            focused_text = text
-                            print(f"   [READ METHOD 3] Class-based: {text[:60]}")
-                    except:
-                        pass
-                
-                # Method 4: Check all options for various state attributes
-                if not focused_text:
-                    try:
-                        all_options = driver.find_elements(By.XPATH, option_xpath)
-                        for opt in all_options:
-                            # Check multiple attributes that might indicate focus
-                            aria_selected = opt.get_attribute("aria-selected")
-                            data_focused = opt.get_attribute("data-focused")
-                            data_selected = opt.get_attribute("data-selected")
-                            class_attr = opt.get_attribute("class") or ""
-                            
-                            if (aria_selected == "true" or 
-                                data_focused == "true" or 
-                                data_selected == "true" or
-                                "focused" in class_attr.lower() or 
-                                "selected" in class_attr.lower() or 
-                                "active" in class_attr.lower() or 
-                                "highlighted" in class_attr.lower()):
-                                text = (opt.text or opt.get_attribute("innerText") or opt.get_attribute("textContent") or "").strip()
-                                if text and text != partial_search:
-                                    focused_text = text
-                                    print(f"   [READ METHOD 4] Attribute-based: {text[:60]}")
-                                    break
-                    except:
-                        pass
-                
-                # Method 5: Try to find any visible option with hover state
-                if not focused_text:
-                    try:
-                        hover_option = driver.find_element(By.XPATH, 
-                            "//div[@role='option'][contains(@class, 'hover')] | "
-                            "//li[@role='option'][contains(@class, 'hover')]")
-                        text = (hover_option.text or hover_option.get_attribute("innerText") or hover_option.get_attribute("textContent") or "").strip()
-                        if text:
-                            focused_text = text
-                            print(f"   [READ METHOD 5] Hover state: {text[:60]}")
-                    except:
-                        pass
+                # Read the input and all options once the highlight has moved
+                snapshot, method, focused_text = _wait_for_key_step(
+                    driver, dest_input, matched_selector or "[role='option']",
+                    partial_search, focused_text
+                )
+                input_value = snapshot['value']
+                if focused_text:
+                    print(f"   [READ {method}] {focused_text[:60]}")
                 
                 # Debug: Print what we found
                 if not focused_text:
@@ -432,11 +420,7 @@ def select_destination(driver, destination_name):
                     # Print input attributes for debugging
                     print(f"      Input value: '{input_value}'")
                     print(f"      Partial search: '{partial_search}'")
-                    try:
-                        aria_id = dest_input.get_attribute('aria-activedescendant')
-                        print(f"      aria-activedescendant: {aria_id}")
-                    except:
-                        pass
+                    print(f"      aria-activedescendant: {snapshot['active']}")
                     
                     if i > 5:  # If we've tried several times and still nothing, break
                         print(f"[INFO] Could not read options after {i} attempts")
@@ -456,7 +440,7 @@ def select_destination(driver, destination_name):
                 
                 # Score this option
                 score = _calculate_match_score(
-                    city, city_normalized, city_parts, country, region,
+                    city_upper, city_normalized, city_parts, country_upper, region,
                     option_text_upper, option_normalized
                 )
                 
@@ -498,7 +482,7 @@ def select_destination(driver, destination_name):
             # Verify selection worked
             try:
                 WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, "//label[contains(text(), 'POD')]/following::div[1]"))
+                    EC.element_to_be_clickable((By.XPATH, _POD_XPATH))
                 )
                 print(f"[SUCCESS] Selected best match via keyboard navigation")
                 return _verify_destination_selection(driver, destination_name, city, region, country, best_option_text)
@@ -525,7 +509,7 @@ def select_destination(driver, destination_name):
             
             try:
                 WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, "//label[contains(text(), 'POD')]/following::div[1]"))
+                    EC.element_to_be_clickable((By.XPATH, _POD_XPATH))
                 )
                 print(f"[SUCCESS] Selected best available option")
                 return _verify_destination_selection(driver, destination_name, city, region, country, best_option_text)
@@ -539,7 +523,9 @@ def select_destination(driver, destination_name):
                 
     except Exception as e:
         print(f"[ERROR] Failed to select destination: {e}")
+        import sys
         import traceback
+        sys.stdout.flush()  # Keep the traceback after the lines above when redirected
         traceback.print_exc()
         return {'success': False, 'selected': None, 'error': str(e)}
 
@@ -551,19 +537,17 @@ def _verify_destination_selection(driver, destination_name, city, region, countr
     Returns:
         dict: {'success': bool, 'selected': str, 'error': str or None}
     """
-    import os
-    from datetime import datetime
-    
     # Normalize for comparison
-    city_normalized = city.upper().replace('-', ' ')
+    city_upper = city.upper()
+    city_normalized = city_upper.replace('-', ' ')
     selected_normalized = selected_text.upper().replace('-', ' ')
     
     # Get first word of city for loose matching (handles spelling variations)
-    city_first_word = city.split()[0].upper() if ' ' in city or '-' in city else city.upper()
+    city_first_word = city.split()[0].upper() if ' ' in city or '-' in city else city_upper
     
     # Check if city name matches (loose matching for multi-word cities)
     city_matches = (
-        city.upper() in selected_text or 
+        city_upper in selected_text or 
         city_normalized in selected_normalized or
         city_first_word in selected_text  # First word match (handles ALLGAEU vs ALLGAU)
     )
@@ -580,6 +564,7 @@ def _verify_destination_selection(driver, destination_name, city, region, countr
     
     if city_matches and region_matches and country_matches:
         print(f"[VERIFIED] Selection matches expected destination ✓")
+        _remember_selection(destination_name, selected_text)
         return {'success': True, 'selected': selected_text, 'error': None}
     else:
         # Mismatch detected - but still return success=True to continue processing
@@ -587,124 +572,295 @@ def _verify_destination_selection(driver, destination_name, city, region, countr
         error_msg = f"Destination mismatch! Expected: {destination_name}, Selected: {selected_text}"
         print(f"[WARNING] {error_msg}")
         
-        # Save screenshot and error log
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_name = destination_name.replace(',', '').replace(' ', '_')
-        
-        error_dir = os.path.join(os.getcwd(), 'error_checks')
-        os.makedirs(error_dir, exist_ok=True)
-        
-        # Screenshot
-        screenshot_path = os.path.join(error_dir, f"MISMATCH_{safe_name}_{timestamp}.png")
-        try:
-            driver.save_screenshot(screenshot_path)
-            print(f"[WARNING] Screenshot saved: {screenshot_path}")
-        except Exception as e:
-            print(f"[WARNING] Could not save screenshot: {e}")
-        
-        # Error log
-        log_path = os.path.join(error_dir, f"MISMATCH_{safe_name}_{timestamp}.txt")
-        try:
-            with open(log_path, 'w', encoding='utf-8') as f:
-                f.write(f"WARNING: Destination Selection Mismatch\n")
-                f.write(f"{'='*60}\n\n")
-                f.write(f"Expected: {destination_name}\n")
-                f.write(f"Selected: {selected_text}\n\n")
-                f.write(f"City match: {city_matches}\n")
-                f.write(f"Region match: {region_matches} (expected: {region})\n")
-                f.write(f"Country match: {country_matches}\n\n")
-                f.write(f"Status: Continuing with search to extract location code\n\n")
-                f.write(f"Timestamp: {datetime.now()}\n")
-            print(f"[WARNING] Warning log saved: {log_path}")
-        except Exception as e:
-            print(f"[WARNING] Could not save warning log: {e}")
+        # Save screenshot and warning log
+        save_error_artifacts(driver, "MISMATCH", destination_name, [
+            "WARNING: Destination Selection Mismatch",
+            "=" * 60,
+            "",
+            f"Expected: {destination_name}",
+            f"Selected: {selected_text}",
+            "",
+            f"City match: {city_matches}",
+            f"Region match: {region_matches} (expected: {region})",
+            f"Country match: {country_matches}",
+            "",
+            "Status: Continuing with search to extract location code",
+        ], level="WARNING")
         
         # Return success=True to continue, but with error message
         return {'success': True, 'selected': selected_text, 'error': error_msg}
 
 
-def _calculate_match_score(city, city_normalized, city_parts, country, region, option_text, option_normalized):
+def _get_selection_cache():
+    """
+    Load the destination -> verified option cache on first use
+    
+    Returns:
+        dict: Option text keyed by destination name
+    """
+    global _selection_cache
+    with _selection_cache_lock:
+        if _selection_cache is None:
+            try:
+                with open(SELECTION_CACHE_FILE, 'r', encoding='utf-8') as f:
+                    _selection_cache = json.load(f)
+            except (OSError, ValueError):
+                _selection_cache = {}
+    return _selection_cache
+
+
+def _remember_selection(destination_name, option_text):
+    """
+    Record a verified selection in memory and in SELECTION_CACHE_FILE
+    
+    Args:
+        destination_name: Full destination string
+        option_text: Dropdown option that matched it
+    """
+    cache = _get_selection_cache()
+    with _selection_cache_lock:
+        if cache.get(destination_name) == option_text:
+            return
+        
+        cache[destination_name] = option_text
+        try:
+            os.makedirs(os.path.dirname(SELECTION_CACHE_FILE), exist_ok=True)
+            with open(SELECTION_CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            print(f"[WARNING] Could not save selection cache: {e}")
+
+
+def _set_input_text(driver, element, text):
+    """
+    Replace an input's text: clear it in one script call, then type text
+    
+    Args:
+        driver: Selenium WebDriver instance
+        element: Input element
+        text: Text to type
+    """
+    driver.execute_script(_CLEAR_INPUT_JS, element)
+    element.send_keys(text)
+
+
+def _wait_for_options(driver):
+    """
+    Wait until the dropdown shows options and their count stops changing
+    
+    Args:
+        driver: Selenium WebDriver instance
+    
+    Returns:
+        tuple: (matched selector, option elements), or (None, []) on timeout
+    """
+    last_count = [None]
+    
+    def options_settled(d):
+        selector, elements = d.execute_script(_FIND_OPTIONS_JS, _OPTION_SELECTORS)
+        settled = bool(elements) and len(elements) == last_count[0]
+        last_count[0] = len(elements)
+        return (selector, elements) if settled else False
+    
+    try:
+        return WebDriverWait(driver, DROPDOWN_TIMEOUT, poll_frequency=POLL_INTERVAL).until(options_settled)
+    except TimeoutException:
+        return None, []
+
+
+def _wait_for_key_step(driver, dest_input, option_selector, partial_search, previous_text):
     """
-    Calculate match score for a dropdown option
+    Wait for the focused option to change after an arrow key press
     
     Args:
+        driver: Selenium WebDriver instance
+        dest_input: Destination input element
+        option_selector: CSS selector for the dropdown options
+        partial_search: Text typed into the input
+        previous_text: Focused option text before the key press (None at the start)
+    
+    Returns:
+        tuple: (snapshot, read method, focused text); the text is None if nothing
+               is focused, and unchanged if the highlight did not move in time
+    """
+    latest = [None]
+    
+    def highlight_moved(d):
+        snapshot = d.execute_script(_KEYBOARD_SNAPSHOT_JS, dest_input, option_selector)
+        method, text = _find_focused_option(snapshot, partial_search)
+        latest[0] = (snapshot, method, text)
+        return text is not None and text != previous_text
+    
+    try:
+        WebDriverWait(driver, KEY_STEP_TIMEOUT, poll_frequency=POLL_INTERVAL / 2).until(highlight_moved)
+    except TimeoutException:
+        pass  # End of the list, or a dropdown that shows no focus; use the last read
+    
+    return latest[0]
+
+
+def _pick_best_position(scores, options_upper, city_upper):
+    """
+    Pick the position of the best-scoring option
+    
+    Options sharing the top score bucket are ranked by RapidFuzz's WRatio
+    against the city when RapidFuzz is installed; otherwise the first wins.
+    
+    Args:
+        scores: Match score per option
+        options_upper: Option texts, upper-cased
+        city_upper: Expected city, upper-cased
+    
+    Returns:
+        int: Index into scores of the best option
+    """
+    top_score = max(scores)
+    tied = [i for i, score in enumerate(scores) if score == top_score]
+    if len(tied) == 1 or fuzz_process is None:
+        return tied[0]
+    
+    _, _, tied_index = fuzz_process.extractOne(
+        city_upper, [options_upper[i] for i in tied], scorer=fuzz.WRatio
+    )
+    return tied[tied_index]
+
+
+def _find_focused_option(snapshot, partial_search):
+    """
+    Pick the option highlighted by keyboard navigation from a snapshot
+    
+    Args:
+        snapshot: Result of _KEYBOARD_SNAPSHOT_JS (input value, active id, options)
+        partial_search: Text typed into the input
+    
+    Returns:
+        tuple: (method label, option text) or (None, None) if nothing is focused
+    """
+    # Some dropdowns copy the focused option into the input
+    input_value = snapshot['value']
+    if input_value and input_value != partial_search:
+        return "INPUT VALUE", input_value
+    
+    options = snapshot['options']
+    
+    active_id = snapshot['active']
+    if active_id:
+        for opt in options:
+            if opt['id'] == active_id and opt['txt']:
+                return "ARIA-ACTIVEDESCENDANT", opt['txt']
+    
+    for opt in options:
+        if opt['txt'] and opt['txt'] != partial_search and (
+            opt['sel'] or any(state in opt['cls'] for state in _FOCUSED_CLASS_STATES)
+        ):
+            return "STATE", opt['txt']
+    
+    for opt in options:
+        if opt['txt'] and 'hover' in opt['cls']:
+            return "HOVER", opt['txt']
+    
+    return None, None
+
+
+def _calculate_match_score(city_upper, city_normalized, city_parts, country_upper, region, option_text, option_normalized):
+    """Score a dropdown option with _score_option and log how the score was reached at DEBUG"""
+    score, notes = _score_option(
+        city_upper, city_normalized, city_parts, country_upper, region, option_text, option_normalized
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        for note in notes:
+            logger.debug("      → %s", note)
+    return score
+
+
+@functools.lru_cache(maxsize=4096)
+def _score_option(city_upper, city_normalized, city_parts, country_upper, region, option_text, option_normalized):
+    """
+    Calculate match score for a dropdown option (memoized; all arguments are hashable)
+    
+    Args:
+        city_upper: Expected city, upper-cased
+        city_normalized: Expected city, upper-cased with hyphens as spaces
+        city_parts: Words of city_normalized
+        country_upper: Expected country, upper-cased
         region: Expected region/state code (e.g., "NW", "BB") or None
+        option_text: Option text, upper-cased
+        option_normalized: option_text with hyphens as spaces
     
     Returns:
-        int: Match score (higher is better)
+        tuple: (match score, notes explaining it); higher scores are better
     """
-    import re
     score = 0
+    notes = []
     
     # Extract first part (city name) using delimiter-agnostic split
-    # Handles formats like: "CITY, COUNTRY", "CITY - COUNTRY", "CITY (CC)", "CITY / COUNTRY"
-    head = re.split(r"[,/()\-]| - ", option_text)[0].strip()
+    head = _HEAD_SPLIT_RE.split(option_text, 1)[0].strip()
+    
+    # Comma-separated parts, shared by the special case and the region checks
+    option_parts = [p.strip() for p in option_text.split(',')]
     
     # Special case: "CITY, CITY, COUNTRY" format (e.g., "PARIS, PARIS, FRANCE")
     # Where city name appears twice (city and region have same name)
-    option_parts = [p.strip() for p in option_text.split(',')]
-    if len(option_parts) >= 3 and option_parts[0].upper() == option_parts[1].upper():
+    if len(option_parts) >= 3 and option_parts[0] == option_parts[1]:
         # This is a "CITY, CITY, COUNTRY" pattern
-        if city.upper() == option_parts[0].upper() and country.upper() in option_text:
+        if city_upper == option_parts[0] and country_upper in option_text:
             score = EXACT_MATCH_SCORE + 100  # Extra bonus for this special format
-            print(f"      → Special case: City appears twice ('{option_parts[0]}, {option_parts[1]}, ...')! Score: {score}")
-            return score  # Early return with high confidence
+            notes.append(f"Special case: City appears twice ('{option_parts[0]}, {option_parts[1]}, ...')! Score: {score}")
+            return score, tuple(notes)  # Early return with high confidence
     
     # Best: Exact city name match (with or without hyphens)
-    if city.upper() == head:
+    if city_upper == head:
         score = EXACT_MATCH_SCORE
-        print(f"      → Exact match! Score: {score}")
+        notes.append(f"Exact match! Score: {score}")
     # Very good: Normalized city matches start of option
-    elif option_normalized.startswith(city_normalized + ',') or option_normalized.startswith(city_normalized + ' -') or option_normalized.startswith(city_normalized + ' /'):
+    elif option_normalized.startswith((city_normalized + ',', city_normalized + ' -', city_normalized + ' /')):
         score = NORMALIZED_MATCH_SCORE
-        print(f"      → Normalized exact match! Score: {score}")
+        notes.append(f"Normalized exact match! Score: {score}")
     # Good: All city parts present in option
     elif all(part in option_normalized for part in city_parts):
         if city_normalized in option_normalized:
             score = ALL_PARTS_MATCH_SCORE
-            print(f"      → All parts in order! Score: {score}")
+            notes.append(f"All parts in order! Score: {score}")
         else:
             score = PARTIAL_MATCH_SCORE
-            print(f"      → All parts present! Score: {score}")
+            notes.append(f"All parts present! Score: {score}")
     # OK: First significant word matches
     elif len(city_parts) > 0 and city_parts[0] in option_normalized.split():
         score = FIRST_WORD_MATCH_SCORE
-        print(f"      → First word match! Score: {score}")
+        notes.append(f"First word match! Score: {score}")
     # Weak: Partial first word match
     elif len(city_parts) > 0 and city_parts[0][:4] in option_normalized:
         score = WEAK_MATCH_SCORE
-        print(f"      → Partial first word! Score: {score}")
+        notes.append(f"Partial first word! Score: {score}")
     
     # Bonus: Country match
-    if score > 0 and country.upper() in option_text:
+    if score > 0 and country_upper in option_text:
         score += COUNTRY_BONUS_SCORE
-        print(f"      → Country matched! New score: {score}")
+        notes.append(f"Country matched! New score: {score}")
     
     # CRITICAL: Region match (e.g., "NW", "BB", "HE")
     # If region is specified and present in option, boost score significantly
     # If region is specified but DIFFERENT region in option, heavily penalize
     if region:
-        option_parts = [p.strip() for p in option_text.split(',')]
         if len(option_parts) >= 3:
-            option_region = option_parts[1].strip()  # Middle part
+            option_region = option_parts[1]  # Middle part
             if option_region == region.upper():
                 score += 300  # Big bonus for exact region match
-                print(f"      → Region matched ({region})! New score: {score}")
-            elif option_region != region.upper() and len(option_region) <= 3:
+                notes.append(f"Region matched ({region})! New score: {score}")
+            elif len(option_region) <= 3:
                 # Different region code found - heavy penalty
                 score -= 500
-                print(f"      → Region MISMATCH! Expected {region}, found {option_region}. Score: {score}")
+                notes.append(f"Region MISMATCH! Expected {region}, found {option_region}. Score: {score}")
     else:
         # No region specified - prefer options WITHOUT middle region codes
         # This helps select main city (e.g., "Frankfurt, Germany") over variants
         # (e.g., "Frankfurt (Oder), BB, Germany")
-        option_parts = [p.strip() for p in option_text.split(',')]
         if len(option_parts) == 2:
             # Simple format like "FRANKFURT, GERMANY" - slight bonus
             score += 10
-            print(f"      → Simple format (no region code) - slight bonus! Score: {score}")
+            notes.append(f"Simple format (no region code) - slight bonus! Score: {score}")
     
-    return score
+    return score, tuple(notes)
 
 
 def _fallback_selection(driver, dest_input):
@@ -718,11 +874,10 @@ def _fallback_selection(driver, dest_input):
     dest_input.send_keys(Keys.ARROW_DOWN)
     dest_input.send_keys(Keys.ENTER)
     ActionChains(driver).send_keys(Keys.ESCAPE).perform()
-    time.sleep(1)
     
     try:
         WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.XPATH, "//label[contains(text(), 'POD')]/following::div[1]"))
+            EC.element_to_be_clickable((By.XPATH, _POD_XPATH))
         )
         return True
     except:
@@ -1,10 +1,155 @@
 """Error summary management - tracks all errors in a central summary file"""
 
 import os
+import queue
+import atexit
+import threading
 from datetime import datetime
 from typing import Literal
 
 
+# Error files are written by one background thread so the browser never waits on disk;
+# a single thread also keeps appends to the summary file in order
+_write_queue = queue.Queue()
+_writer_lock = threading.Lock()
+_writer = None
+
+
+def _write_loop():
+    """Run queued error writes one at a time (background thread)"""
+    while True:
+        func, args = _write_queue.get()
+        try:
+            func(*args)
+        except Exception as e:
+            print(f"[WARNING] Could not write error files: {e}")
+        finally:
+            _write_queue.task_done()
+
+
+def submit_error_write(func, *args):
+    """
+    Run func(*args) on the background error writer thread
+    
+    Args:
+        func: Callable that writes error files (e.g., append_error)
+        *args: Arguments for func
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_write_loop, name="error-writer", daemon=True)
+            _writer.start()
+    _write_queue.put((func, args))
+
+
+def wait_for_error_writes():
+    """Block until every queued error write has finished and the summary is written"""
+    _write_queue.join()
+    flush_error_summary()
+
+
+# Don't lose queued error files when the run exits
+atexit.register(wait_for_error_writes)
+
+# Error log files written in this run, as (kind, file name) in the order saved
+_error_log = []
+_error_log_lock = threading.Lock()
+
+# (kind, destination) pairs that already have a screenshot in this run
+_screenshots_taken = set()
+_screenshots_lock = threading.Lock()
+
+# Summary entries are buffered and appended in batches of this many
+SUMMARY_FLUSH_EVERY = 20
+
+# Entry types written out immediately
+_FLUSH_NOW_TYPES = frozenset({"SELECTION_FAILED", "MISMATCH"})
+
+_summary_buffer = []
+_summary_lock = threading.RLock()
+
+# Whether the summary file has the "No rates available" header (None until checked)
+_has_no_rates_header = None
+
+
+def _write_error_files(screenshot_path, png, log_path, log_text, level, log_name):
+    """Write a screenshot and its text log (background thread)"""
+    if png is not None:
+        try:
+            with open(screenshot_path, 'wb') as f:
+                f.write(png)
+            print(f"[{level}] Screenshot saved: {screenshot_path}")
+        except Exception as e:
+            print(f"[WARNING] Could not save screenshot: {e}")
+    
+    try:
+        with open(log_path, 'w', encoding='utf-8') as f:
+            f.write(log_text)
+        print(f"[{level}] {log_name} saved: {log_path}")
+    except Exception as e:
+        print(f"[WARNING] Could not save {log_name.lower()}: {e}")
+
+
+def save_error_artifacts(driver, kind, destination_name, lines, level="ERROR"):
+    """
+    Save a screenshot and a text log for a failed destination in error_checks/
+    
+    The screenshot is taken right away; both files are written in the background.
+    A destination gets at most one screenshot per kind per run; the log is always written.
+    
+    Args:
+        driver: Selenium WebDriver instance
+        kind: File name prefix (e.g., "NO_RATES", "WRONG_COUNTRY", "MISMATCH")
+        destination_name: Full destination string
+        lines: Log file lines; a timestamp line is appended
+        level: Console prefix, "ERROR" or "WARNING"
+    
+    Returns:
+        datetime: Time stamped on both files
+    """
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    safe_name = destination_name.replace(',', '').replace(' ', '_')
+    
+    error_dir = os.path.join(os.getcwd(), 'error_checks')
+    os.makedirs(error_dir, exist_ok=True)
+    base_path = os.path.join(error_dir, f"{kind}_{safe_name}_{timestamp}")
+    
+    with _screenshots_lock:
+        first_screenshot = (kind, destination_name) not in _screenshots_taken
+        _screenshots_taken.add((kind, destination_name))
+    
+    png = None
+    if first_screenshot:
+        try:
+            png = driver.get_screenshot_as_png()
+        except Exception as e:
+            print(f"[WARNING] Could not save screenshot: {e}")
+    
+    with _error_log_lock:
+        _error_log.append((kind, os.path.basename(base_path) + ".txt"))
+    
+    log_text = '\n'.join(lines) + f"\n\nTimestamp: {now}\n"
+    log_name = "Error log" if level == "ERROR" else "Warning log"
+    submit_error_write(
+        _write_error_files, base_path + ".png", png, base_path + ".txt", log_text, level, log_name
+    )
+    
+    return now
+
+
+def get_error_log():
+    """
+    Get the error log files saved so far in this run
+    
+    Returns:
+        list: (kind, file name) tuples in the order they were saved
+    """
+    with _error_log_lock:
+        return list(_error_log)
+
+
 def get_error_summary_path():
     """Get the path to the error summary file"""
     return os.path.join(os.getcwd(), 'error_checks', 'error_summary.txt')
@@ -18,11 +163,52 @@ def initialize_error_summary():
     
     if not os.path.exists(summary_path):
         with open(summary_path, 'w', encoding='utf-8') as f:
-            f.write("=" * 60 + "\n")
-            f.write("ERROR SUMMARY - URL Checker\n")
-            f.write("=" * 60 + "\n")
-            f.write(f"Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 60 + "\n\n")
+            rule = "=" * 60
+            f.write(
+                f"{rule}\n"
+                "ERROR SUMMARY - URL Checker\n"
+                f"{rule}\n"
+                f"Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                f"{rule}\n\n"
+            )
+
+
+def _needs_no_rates_header():
+    """Check once whether the summary file already has the 'No rates available' header"""
+    global _has_no_rates_header
+    if _has_no_rates_header is None:
+        summary_path = get_error_summary_path()
+        try:
+            with open(summary_path, 'r', encoding='utf-8') as f:
+                _has_no_rates_header = "No rates available" in f.read()
+        except OSError:
+            _has_no_rates_header = False
+    return not _has_no_rates_header
+
+
+def _buffer_entry(text, flush=False):
+    """Queue text for the summary file; write the buffer when it is full or flush is set"""
+    with _summary_lock:
+        _summary_buffer.append(text)
+        full = len(_summary_buffer) >= SUMMARY_FLUSH_EVERY
+    if flush or full:
+        flush_error_summary()
+
+
+def flush_error_summary():
+    """Append all buffered entries to the summary file in one write"""
+    with _summary_lock:
+        if not _summary_buffer:
+            return
+        text = ''.join(_summary_buffer)
+        _summary_buffer.clear()
+        
+        try:
+            initialize_error_summary()
+            with open(get_error_summary_path(), 'a', encoding='utf-8') as f:
+                f.write(text)
+        except Exception as e:
+            print(f"[WARNING] Could not update error summary: {e}")
 
 
 def append_no_rates(destination_name: str, city: str, country: str):
@@ -35,26 +221,18 @@ def append_no_rates(destination_name: str, city: str, country: str):
         city: City name
         country: Country name
     """
-    initialize_error_summary()
-    summary_path = get_error_summary_path()
+    global _has_no_rates_header
+    with _summary_lock:
+        needs_header = _needs_no_rates_header()
+        _has_no_rates_header = True
     
-    try:
-        # Check if we need to add the "No rates available" header
-        with open(summary_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            needs_header = "No rates available" not in content
-        
-        with open(summary_path, 'a', encoding='utf-8') as f:
-            if needs_header:
-                f.write("\n" + "=" * 60 + "\n")
-                f.write("No rates available\n")
-                f.write("=" * 60 + "\n")
-            
-            f.write(f"{city}, {country}\n")
-        
-        print(f"[INFO] Added to error summary: No rates for {city}, {country}")
-    except Exception as e:
-        print(f"[WARNING] Could not update error summary: {e}")
+    entry = f"{city}, {country}\n"
+    if needs_header:
+        rule = "=" * 60
+        entry = f"\n{rule}\nNo rates available\n{rule}\n" + entry
+    
+    _buffer_entry(entry)
+    print(f"[INFO] Added to error summary: No rates for {city}, {country}")
 
 
 def append_error(
@@ -72,21 +250,17 @@ def append_error(
         error_message: Description of the error
         timestamp: Optional timestamp string
     """
-    initialize_error_summary()
-    summary_path = get_error_summary_path()
-    
     if timestamp is None:
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
-    try:
-        with open(summary_path, 'a', encoding='utf-8') as f:
-            f.write("\n" + "-" * 60 + "\n")
-            f.write(f"ERROR: {error_type}\n")
-            f.write("-" * 60 + "\n")
-            f.write(f"Destination: {destination_name}\n")
-            f.write(f"Error: {error_message}\n")
-            f.write(f"Timestamp: {timestamp}\n")
-        
-        print(f"[INFO] Added to error summary: {error_type} for {destination_name}")
-    except Exception as e:
-        print(f"[WARNING] Could not update error summary: {e}")
+    rule = "-" * 60
+    entry = (
+        f"\n{rule}\n"
+        f"ERROR: {error_type}\n"
+        f"{rule}\n"
+        f"Destination: {destination_name}\n"
+        f"Error: {error_message}\n"
+        f"Timestamp: {timestamp}\n"
+    )
+    _buffer_entry(entry, flush=error_type in _FLUSH_NOW_TYPES)
+    print(f"[INFO] Added to error summary: {error_type} for {destination_name}")
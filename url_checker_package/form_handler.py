@@ -6,10 +6,23 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
+from selenium.common.exceptions import ElementClickInterceptedException, WebDriverException
 
 from .config import ELEMENT_WAIT_TIMEOUT
 
+# Locators used on every destination
+_DROPDOWN_XPATH = "//label[contains(text(), '{}')]/following::div[1]"
+_SELECT_ALL_OPTION = (By.XPATH, "//div[contains(text(), 'Select All')] | //span[contains(text(), 'Select All')]")
+_FIRST_CHECKBOX = (By.XPATH, "//input[@type='checkbox']")
+_DATE_INPUT = (By.XPATH, "//label[contains(text(), 'Application Date')]/following::input[1]")
+_WEIGHT_INPUT = (By.XPATH, "//label[contains(text(), 'Weight')]/following::input[1]")
+_SEARCH_BUTTON = (By.XPATH, "//button[.//span[contains(.,'Search')] or contains(.,'Search')]")
+_IMPORT_LABEL = (By.XPATH, "//label[contains(text(), 'Import')]")
+_COOKIE_ACCEPT_BUTTON = (By.ID, "onetrust-accept-btn-handler")
+
+_SCROLL_CENTER_JS = "arguments[0].scrollIntoView({block: 'center'});"
+_SCROLL_AND_CLICK_JS = _SCROLL_CENTER_JS + " arguments[0].click();"
+
 
 def click_dropdown_select_all(driver, label_text):
     """
@@ -26,19 +39,19 @@ def click_dropdown_select_all(driver, label_text):
         
         # Find and click dropdown
         dropdown_div = wait.until(
-            EC.element_to_be_clickable((
-                By.XPATH, 
-                f"//label[contains(text(), '{label_text}')]/following::div[1]"
-            ))
+            EC.element_to_be_clickable((By.XPATH, _DROPDOWN_XPATH.format(label_text)))
         )
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", dropdown_div)
-        dropdown_div.click()
+        # A native click scrolls the element into view itself; centre it only if something covers it
+        try:
+            dropdown_div.click()
+        except ElementClickInterceptedException:
+            driver.execute_script(_SCROLL_CENTER_JS, dropdown_div)
+            dropdown_div.click()
         
         # Try to click 'Select All'
         try:
-            select_all_xpath = "//div[contains(text(), 'Select All')] | //span[contains(text(), 'Select All')]"
             select_all = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, select_all_xpath))
+                EC.element_to_be_clickable(_SELECT_ALL_OPTION)
             )
             driver.execute_script("arguments[0].click();", select_all)
             print(f"   [SUCCESS] Selected 'All' for {label_text}.")
@@ -46,7 +59,7 @@ def click_dropdown_select_all(driver, label_text):
             # Fallback: click first checkbox
             print(f"   [INFO] 'Select All' not found for {label_text}. Clicking first checkbox...")
             first_opt = WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, "//input[@type='checkbox']"))
+                EC.presence_of_element_located(_FIRST_CHECKBOX)
             )
             driver.execute_script("arguments[0].click();", first_opt)
         
@@ -71,10 +84,7 @@ def set_date_and_weight(driver, date_value="2026-01-07", weight_value="21000"):
         
         # Set date
         date_input = wait.until(
-            EC.element_to_be_clickable((
-                By.XPATH, 
-                "//label[contains(text(), 'Application Date')]/following::input[1]"
-            ))
+            EC.element_to_be_clickable(_DATE_INPUT)
         )
         date_input.click()
         date_input.send_keys(Keys.CONTROL + "a")
@@ -84,10 +94,7 @@ def set_date_and_weight(driver, date_value="2026-01-07", weight_value="21000"):
         
         # Set weight
         weight_input = wait.until(
-            EC.element_to_be_clickable((
-                By.XPATH, 
-                "//label[contains(text(), 'Weight')]/following::input[1]"
-            ))
+            EC.element_to_be_clickable(_WEIGHT_INPUT)
         )
         weight_input.click()
         weight_input.send_keys(Keys.CONTROL + "a")
@@ -120,37 +127,27 @@ def click_search_button(driver):
         
         # Find Search button
         search_btn = wait.until(
-            EC.presence_of_element_located((
-                By.XPATH,
-                "//button[.//span[contains(.,'Search')] or contains(.,'Search')]"
-            ))
+            EC.presence_of_element_located(_SEARCH_BUTTON)
         )
         
-        # Scroll into view
-        driver.execute_script("arguments[0].scrollIntoView({block:'center'});", search_btn)
-        
         # Wait for button to be enabled
         wait.until(lambda d: search_btn.is_enabled())
         
-        # Try ActionChains click first, fallback to JavaScript
+        # Scroll and click in one round-trip, fall back to a real pointer click
         try:
-            wait.until(
-                EC.element_to_be_clickable((
-                    By.XPATH, 
-                    "//button[.//span[contains(.,'Search')] or contains(.,'Search')]"
-                ))
-            )
-            ActionChains(driver).move_to_element(search_btn).pause(0.05).click().perform()
+            driver.execute_script(_SCROLL_AND_CLICK_JS, search_btn)
             print("[SUCCESS] Search button clicked")
-        except (ElementClickInterceptedException, TimeoutException):
-            driver.execute_script("arguments[0].click();", search_btn)
-            print("[SUCCESS] Search button clicked (JavaScript)")
+        except WebDriverException:
+            ActionChains(driver).move_to_element(search_btn).pause(0.05).click().perform()
+            print("[SUCCESS] Search button clicked (ActionChains)")
         
         return True
         
     except Exception as e:
         print(f"[ERROR] Failed to click Search button: {e}")
+        import sys
         import traceback
+        sys.stdout.flush()  # Keep the traceback after the lines above when redirected
         traceback.print_exc()
         return False
 
@@ -164,7 +161,7 @@ def select_import_mode(driver):
     """
     try:
         WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//label[contains(text(), 'Import')]"))
+            EC.element_to_be_clickable(_IMPORT_LABEL)
         ).click()
         print("[SUCCESS] Import mode selected")
     except Exception as e:
@@ -180,7 +177,7 @@ def handle_cookie_popup(driver):
     """
     try:
         WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.ID, "onetrust-accept-btn-handler"))
+            EC.element_to_be_clickable(_COOKIE_ACCEPT_BUTTON)
         ).click()
         print("[INFO] Accepted cookies")
     except:
@@ -1,10 +1,15 @@
 """Main processing workflow for extracting destination configurations"""
 
 import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.support.ui import WebDriverWait
 
-from .config import BASE_URL, PAGE_LOAD_TIMEOUT
+from .config import BASE_URL, PAGE_LOAD_TIMEOUT, PAGE_LOAD_INTERVAL
+from .browser import setup_browser
 from .destination_selector import select_destination
+from .error_summary import append_error, save_error_artifacts, submit_error_write
 from .form_handler import (
     handle_cookie_popup,
     select_import_mode,
@@ -14,6 +19,27 @@ from .form_handler import (
 )
 from .url_extractor import wait_for_results, extract_url_parameters
 
+# When the next search page load may start (time.monotonic), shared by all browsers
+_next_page_load = 0.0
+_page_load_lock = threading.Lock()
+
+
+def _wait_for_page_load_slot():
+    """
+    Space search page loads at least PAGE_LOAD_INTERVAL apart
+    
+    Only the remainder of the interval is slept, so a destination that took
+    longer than PAGE_LOAD_INTERVAL to process never waits.
+    """
+    global _next_page_load
+    with _page_load_lock:
+        now = time.monotonic()
+        start = max(now, _next_page_load)
+        _next_page_load = start + PAGE_LOAD_INTERVAL
+    
+    if start > now:
+        time.sleep(start - now)
+
 
 def process_destination(driver, destination_name):
     """
@@ -41,6 +67,7 @@ def process_destination(driver, destination_name):
     try:
         # Navigate to search page
         print("[LOADING] Opening ONE Line search page...")
+        _wait_for_page_load_slot()
         driver.get(BASE_URL)
         
         # Wait for page to load
@@ -63,37 +90,15 @@ def process_destination(driver, destination_name):
             error = dest_result.get('error', 'Unknown error')
             print(f"[ERROR] Destination selection failed: {error}")
             
-            # Save error screenshot
-            import os
-            from datetime import datetime
-            from .error_summary import append_error
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_name = destination_name.replace(',', '').replace(' ', '_')
-            error_dir = os.path.join(os.getcwd(), 'error_checks')
-            os.makedirs(error_dir, exist_ok=True)
-            
-            screenshot_path = os.path.join(error_dir, f"SELECTION_FAILED_{safe_name}_{timestamp}.png")
-            try:
-                driver.save_screenshot(screenshot_path)
-                print(f"[ERROR] Screenshot saved: {screenshot_path}")
-            except:
-                pass
-            
-            log_path = os.path.join(error_dir, f"SELECTION_FAILED_{safe_name}_{timestamp}.txt")
-            try:
-                with open(log_path, 'w', encoding='utf-8') as f:
-                    f.write(f"ERROR: Destination Selection Failed\n")
-                    f.write(f"{'='*60}\n\n")
-                    f.write(f"Destination: {destination_name}\n")
-                    f.write(f"Error: {error}\n\n")
-                    f.write(f"Timestamp: {datetime.now()}\n")
-                print(f"[ERROR] Error log saved: {log_path}")
-            except:
-                pass
-            
-            # Add to error summary
-            append_error("SELECTION_FAILED", destination_name, error, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            # Save error screenshot and log, then add to error summary
+            logged_at = save_error_artifacts(driver, "SELECTION_FAILED", destination_name, [
+                "ERROR: Destination Selection Failed",
+                "=" * 60,
+                "",
+                f"Destination: {destination_name}",
+                f"Error: {error}",
+            ])
+            submit_error_write(append_error, "SELECTION_FAILED", destination_name, error, logged_at.strftime('%Y-%m-%d %H:%M:%S'))
             
             return None
         
@@ -125,7 +130,9 @@ def process_destination(driver, destination_name):
         
     except Exception as e:
         print(f"[ERROR] Failed to process destination: {e}")
+        import sys
         import traceback
+        sys.stdout.flush()  # Keep the traceback after the lines above when redirected
         traceback.print_exc()
         
         # Save screenshot for debugging
@@ -136,3 +143,66 @@ def process_destination(driver, destination_name):
             pass
         
         return None
+
+
+def process_destinations(destination_names, num_workers=4):
+    """
+    Process destinations concurrently, one browser per worker thread
+    
+    Each worker starts its own browser and takes the next destination from a
+    shared queue until none are left, so no driver is used by two threads.
+    Results are yielded as soon as each destination finishes.
+    
+    Args:
+        destination_names: List of full destination strings
+        num_workers: Number of browsers to run side by side
+        
+    Yields:
+        tuple: (destination, config dict or None) in completion order
+    """
+    pending = queue.Queue()
+    for destination_name in destination_names:
+        pending.put(destination_name)
+    finished = queue.Queue()
+    
+    def worker():
+        try:
+            driver = setup_browser()
+        except Exception as e:
+            # Remaining destinations are picked up by the other workers
+            print(f"[ERROR] Could not start browser for worker: {e}")
+            finished.put(None)
+            return
+        
+        try:
+            while True:
+                try:
+                    destination_name = pending.get_nowait()
+                except queue.Empty:
+                    return
+                finished.put((destination_name, process_destination(driver, destination_name)))
+        finally:
+            # A failed quit must not keep the sentinel from being sent
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"[WARNING] Could not close worker browser: {e}")
+            finished.put(None)  # This worker is done
+    
+    num_workers = max(1, min(num_workers, len(destination_names)))
+    print(f"[INFO] Starting {num_workers} browser worker(s)...")
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        for _ in range(num_workers):
+            executor.submit(worker)
+        
+        running = num_workers
+        while running:
+            result = finished.get()
+            if result is None:
+                running -= 1
+            else:
+                yield result
+    
+    # Left over only if every browser failed to start
+    while not pending.empty():
+        yield pending.get_nowait(), None
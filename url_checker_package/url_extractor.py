@@ -1,13 +1,31 @@
 """URL parameter extraction"""
 
-import time
 from urllib.parse import urlparse, parse_qs
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
-from .config import SEARCH_RESULT_TIMEOUT
+from .config import SEARCH_RESULT_TIMEOUT, POLL_INTERVAL
+from .error_summary import save_error_artifacts
+
+# Everything _check_results_count looks at, read in one round-trip: the text of
+# elements mentioning "Total:", whether a "no data" message is shown, and the row count
+_RESULTS_STATE_JS = """
+    function matching(xpath) {
+        return document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    }
+    var found = matching("//*[contains(text(), 'Total:')]");
+    var totals = [];
+    for (var i = 0; i < found.snapshotLength; i++) {
+        var el = found.snapshotItem(i);
+        totals.push((el.innerText || el.textContent || '').trim());
+    }
+    var noData = matching(
+        "//*[contains(text(), 'No data') or contains(text(), 'no result') or contains(text(), '0 result')]"
+    ).snapshotLength > 0;
+    return {totals: totals, noData: noData, rows: matching("//table//tbody//tr").snapshotLength};
+"""
 
 
 def wait_for_results(driver):
@@ -18,13 +36,26 @@ def wait_for_results(driver):
         driver: Selenium WebDriver instance
     """
     print("[STEP 7] Waiting for results...")
-    time.sleep(5)
     
-    # Check current URL
-    current_url_before = driver.current_url
-    print(f"[DEBUG] URL after search click: {current_url_before[:100]}...")
+    # A successful search navigates to a URL carrying the location code
+    try:
+        WebDriverWait(driver, SEARCH_RESULT_TIMEOUT, poll_frequency=POLL_INTERVAL).until(
+            lambda d: "destinationLocationCode" in d.current_url
+        )
+    except TimeoutException:
+        print(f"[DEBUG] Final URL: {driver.current_url[:150]}")
+        print("[ERROR] URL did not change after clicking Search - search may have failed")
+        print("[DEBUG] Taking screenshot for debugging...")
+        try:
+            driver.save_screenshot("search_failed.png")
+            print("[DEBUG] Screenshot saved: search_failed.png")
+        except:
+            pass
+        return
+    
+    print(f"[DEBUG] URL after search click: {driver.current_url[:100]}...")
     
-    # Try to wait for Download All button (indicates results loaded)
+    # Download All button indicates the results table has rendered
     try:
         WebDriverWait(driver, SEARCH_RESULT_TIMEOUT).until(
             EC.visibility_of_element_located((
@@ -35,17 +66,6 @@ def wait_for_results(driver):
         print("[SUCCESS] Results loaded!")
     except TimeoutException:
         print("[WARNING] Download All button not found - checking URL anyway...")
-        current_url_after = driver.current_url
-        print(f"[DEBUG] Final URL: {current_url_after[:150]}")
-        
-        if "destinationLocationCode" not in current_url_after:
-            print("[ERROR] URL did not change after clicking Search - search may have failed")
-            print("[DEBUG] Taking screenshot for debugging...")
-            try:
-                driver.save_screenshot("search_failed.png")
-                print("[DEBUG] Screenshot saved: search_failed.png")
-            except:
-                pass
 
 
 def extract_url_parameters(driver):
@@ -59,11 +79,7 @@ def extract_url_parameters(driver):
     Returns:
         dict: Configuration with locationCode, pols, pods, has_results or None if extraction fails
     """
-    import os
-    from datetime import datetime
-    
     print("[STEP 8] Extracting URL parameters...")
-    time.sleep(2)
     
     print("[EXTRACTING] Analyzing URL parameters...")
     
@@ -106,39 +122,21 @@ def extract_url_parameters(driver):
                 
                 # Save warning to error_checks
                 destination_name = params.get('destinationLocationName', ['UNKNOWN'])[0]
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                safe_name = destination_name.replace(',', '').replace(' ', '_').replace('%2C', '')
-                
-                error_dir = os.path.join(os.getcwd(), 'error_checks')
-                os.makedirs(error_dir, exist_ok=True)
-                
-                # Screenshot
-                screenshot_path = os.path.join(error_dir, f"ZERO_RESULTS_{safe_name}_{timestamp}.png")
-                try:
-                    driver.save_screenshot(screenshot_path)
-                    print(f"[WARNING] Screenshot saved: {screenshot_path}")
-                except Exception as e:
-                    print(f"[WARNING] Could not save screenshot: {e}")
-                
-                # Warning log
-                log_path = os.path.join(error_dir, f"ZERO_RESULTS_{safe_name}_{timestamp}.txt")
-                try:
-                    with open(log_path, 'w', encoding='utf-8') as f:
-                        f.write(f"WARNING: Zero Results Found\n")
-                        f.write(f"{'='*60}\n\n")
-                        f.write(f"Destination: {destination_name}\n")
-                        f.write(f"Location Code: {location_code}\n")
-                        f.write(f"POLs: {pols if pols else 'None'}\n")
-                        f.write(f"PODs: {pods if pods else 'None'}\n\n")
-                        f.write(f"Status: Search completed successfully but returned 0 tariff records\n")
-                        f.write(f"This may indicate:\n")
-                        f.write(f"  - No tariff available for this destination\n")
-                        f.write(f"  - Service not available to this location\n")
-                        f.write(f"  - Configuration issue with PODs/POLs\n\n")
-                        f.write(f"Timestamp: {datetime.now()}\n")
-                    print(f"[WARNING] Warning log saved: {log_path}")
-                except Exception as e:
-                    print(f"[WARNING] Could not save warning log: {e}")
+                save_error_artifacts(driver, "ZERO_RESULTS", destination_name.replace('%2C', ''), [
+                    "WARNING: Zero Results Found",
+                    "=" * 60,
+                    "",
+                    f"Destination: {destination_name}",
+                    f"Location Code: {location_code}",
+                    f"POLs: {pols if pols else 'None'}",
+                    f"PODs: {pods if pods else 'None'}",
+                    "",
+                    "Status: Search completed successfully but returned 0 tariff records",
+                    "This may indicate:",
+                    "  - No tariff available for this destination",
+                    "  - Service not available to this location",
+                    "  - Configuration issue with PODs/POLs",
+                ], level="WARNING")
             
             return config
         else:
@@ -160,47 +158,28 @@ def _check_results_count(driver):
         bool: True if results > 0, False if results = 0
     """
     try:
-        # Look for "Total: X" or similar result count indicator
-        # Try multiple strategies
-        time.sleep(1)
+        # Results have rendered (or stopped loading) by now; see wait_for_results
+        state = driver.execute_script(_RESULTS_STATE_JS)
         
         # Strategy 1: Look for "Total:" text
-        try:
-            total_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Total:')]")
-            for elem in total_elements:
-                text = elem.text
-                if 'Total: 0' in text or 'Total:0' in text:
-                    print(f"[DEBUG] Found zero results indicator: {text}")
-                    return False
-                elif 'Total:' in text:
-                    print(f"[DEBUG] Found results indicator: {text}")
-                    return True
-        except:
-            pass
+        for text in state['totals']:
+            if 'Total: 0' in text or 'Total:0' in text:
+                print(f"[DEBUG] Found zero results indicator: {text}")
+                return False
+            elif 'Total:' in text:
+                print(f"[DEBUG] Found results indicator: {text}")
+                return True
         
         # Strategy 2: Look for empty table / no data message
-        try:
-            no_data_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'No data') or contains(text(), 'no result') or contains(text(), '0 result')]")
-            if no_data_elements:
-                print(f"[DEBUG] Found 'no data' message")
-                return False
-        except:
-            pass
+        if state['noData']:
+            print(f"[DEBUG] Found 'no data' message")
+            return False
         
         # Strategy 3: Check for table rows
-        try:
-            table_rows = driver.find_elements(By.XPATH, "//table//tbody//tr")
-            if len(table_rows) == 0:
-                print(f"[DEBUG] No table rows found")
-                return False
-            elif len(table_rows) > 0:
-                print(f"[DEBUG] Found {len(table_rows)} table rows")
-                return True
-        except:
-            pass
-        
-        # Default: assume has results if we can't determine
-        print(f"[DEBUG] Could not determine result count, assuming has results")
+        if state['rows'] == 0:
+            print(f"[DEBUG] No table rows found")
+            return False
+        print(f"[DEBUG] Found {state['rows']} table rows")
         return True
         
     except Exception as e:
@@ -5,39 +5,79 @@ Usage:
     python url_checker_refactored.py "PARIS, FRANCE" "ROME, ITALY"
     or
     python url_checker_refactored.py (reads from destinations.txt)
+
+Add -n N (or set URL_CHECKER_WORKERS=N) to check N destinations at a time,
+one browser each.
+Destinations that already have a location code are skipped unless -f is given.
 """
 
+import io
 import os
+import re
 import sys
-import time
+import argparse
+import itertools
 
 # --- CONFIG: IGNORE SSL ERRORS ---
 os.environ["WDM_SSL_VERIFY"] = "0"
 os.environ["WDM_LOCAL"] = "1"
 
-from url_checker_package.config import CONFIG_FILE_NAME, DESTINATIONS_FILE_NAME
+from url_checker_package.config import CONFIG_FILE_NAME, DESTINATIONS_FILE_NAME, WORKERS
 from url_checker_package.browser import setup_browser
 from url_checker_package.config_manager import (
     get_config_file_path,
     load_configs,
-    save_configs,
+    mark_dirty,
+    flush_configs,
     load_destinations_from_file
 )
-from url_checker_package.processor import process_destination
+from url_checker_package.processor import process_destination, process_destinations
+from url_checker_package.error_summary import wait_for_error_writes, get_error_log
 
+# Output buffer size when stdout is redirected to a file or pipe (bytes)
+STDOUT_BUFFER_SIZE = 64 * 1024
 
-def generate_error_summary():
-    """Generate a summary of all errors from error_checks folder"""
-    error_dir = os.path.join(os.getcwd(), 'error_checks')
+# "CITY, COUNTRY" or "CITY, REGION, COUNTRY" with no empty parts
+_DESTINATION_RE = re.compile(r'^[^,]*[^,\s][^,]*(,[^,]*[^,\s][^,]*){1,2}$')
+
+# Error kinds mapped to their summary category (anything else is OTHER)
+_ERROR_CATEGORIES = {
+    'SELECTION_FAILED': 'SELECTION_FAILED',
+    'NO_RESULTS': 'NO_RESULTS',
+    'ZERO_RESULTS': 'NO_RESULTS',
+    'MISMATCH': 'MISMATCH',
+}
+
+
+def _print_category(title, error_files, hint=None, shown=5):
+    """
+    Print one error category with its first few files
     
-    if not os.path.exists(error_dir):
+    Args:
+        title: Category heading
+        error_files: Error file names in this category (nothing is printed if empty)
+        hint: Optional one-line explanation under the heading
+        shown: Number of file names to list
+    """
+    if not error_files:
         return
     
-    # Find all .txt error files
-    error_files = [f for f in os.listdir(error_dir) if f.endswith('.txt')]
+    lines = [f"{title} ({len(error_files)}):"]
+    if hint:
+        lines.append(f"   - {hint}")
+    lines.extend(f"     • {f}" for f in itertools.islice(error_files, shown))
+    if len(error_files) > shown:
+        lines.append(f"     ... and {len(error_files) - shown} more")
+    print('\n'.join(lines))
+
+
+def generate_error_summary():
+    """Generate a summary of the error files saved to error_checks in this run"""
+    error_dir = os.path.join(os.getcwd(), 'error_checks')
+    error_log = get_error_log()
     
-    if not error_files:
-        print("\n[INFO] No error files found in error_checks folder")
+    if not error_log:
+        print("\n[INFO] No error files were saved in this run")
         return
     
     print("\n" + "=" * 60)
@@ -51,79 +91,102 @@ def generate_error_summary():
         'OTHER': []
     }
     
-    for error_file in error_files:
-        file_path = os.path.join(error_dir, error_file)
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # Extract destination name from filename
-            if 'SELECTION_FAILED' in error_file:
-                errors_by_type['SELECTION_FAILED'].append(error_file)
-            elif 'NO_RESULTS' in error_file or 'ZERO_RESULTS' in error_file:
-                errors_by_type['NO_RESULTS'].append(error_file)
-            elif 'MISMATCH' in error_file:
-                errors_by_type['MISMATCH'].append(error_file)
-            else:
-                errors_by_type['OTHER'].append(error_file)
-        except Exception as e:
-            print(f"[WARNING] Could not read {error_file}: {e}")
+    for kind, error_file in error_log:
+        errors_by_type[_ERROR_CATEGORIES.get(kind, 'OTHER')].append(error_file)
     
     # Print summary
     total_errors = sum(len(v) for v in errors_by_type.values())
     print(f"\nTotal error files: {total_errors}\n")
     
-    if errors_by_type['SELECTION_FAILED']:
-        print(f"❌ SELECTION FAILED ({len(errors_by_type['SELECTION_FAILED'])}):")
-        print("   - Destination could not be selected from dropdown")
-        for f in errors_by_type['SELECTION_FAILED'][:5]:  # Show first 5
-            print(f"     • {f}")
-        if len(errors_by_type['SELECTION_FAILED']) > 5:
-            print(f"     ... and {len(errors_by_type['SELECTION_FAILED']) - 5} more")
-    
-    if errors_by_type['NO_RESULTS']:
-        print(f"\n⚠ ZERO RESULTS ({len(errors_by_type['NO_RESULTS'])}):")
-        print("   - Search completed but returned 0 results")
-        for f in errors_by_type['NO_RESULTS'][:5]:
-            print(f"     • {f}")
-        if len(errors_by_type['NO_RESULTS']) > 5:
-            print(f"     ... and {len(errors_by_type['NO_RESULTS']) - 5} more")
-    
-    if errors_by_type['MISMATCH']:
-        print(f"\n⚠ CITY MISMATCH ({len(errors_by_type['MISMATCH'])}):")
-        print("   - Selected city doesn't match input (typo/alternate name)")
-        for f in errors_by_type['MISMATCH'][:5]:
-            print(f"     • {f}")
-        if len(errors_by_type['MISMATCH']) > 5:
-            print(f"     ... and {len(errors_by_type['MISMATCH']) - 5} more")
-    
-    if errors_by_type['OTHER']:
-        print(f"\n❓ OTHER ERRORS ({len(errors_by_type['OTHER'])}):")
-        for f in errors_by_type['OTHER'][:5]:
-            print(f"     • {f}")
-        if len(errors_by_type['OTHER']) > 5:
-            print(f"     ... and {len(errors_by_type['OTHER']) - 5} more")
+    _print_category("❌ SELECTION FAILED", errors_by_type['SELECTION_FAILED'],
+                    "Destination could not be selected from dropdown")
+    _print_category("\n⚠ ZERO RESULTS", errors_by_type['NO_RESULTS'],
+                    "Search completed but returned 0 results")
+    _print_category("\n⚠ CITY MISMATCH", errors_by_type['MISMATCH'],
+                    "Selected city doesn't match input (typo/alternate name)")
+    _print_category("\n❓ OTHER ERRORS", errors_by_type['OTHER'])
     
     print(f"\n📁 All error files are in: {error_dir}")
     print("=" * 60)
 
 
+def _process_serially(driver, destinations):
+    """
+    Process destinations one after another in a single browser
+    
+    Yields:
+        tuple: (destination, config dict or None)
+    """
+    for destination in destinations:
+        yield destination, process_destination(driver, destination)
+
+
+def _partition_destinations(destinations, configs, force=False):
+    """
+    Split destinations into those needing a browser and those that can be skipped
+    
+    Args:
+        destinations: Destination strings to check
+        configs: Existing destination configurations
+        force: Also re-check destinations that already have a location code
+        
+    Returns:
+        tuple: (to_process, already_configured, malformed) lists
+    """
+    to_process, already_configured, malformed = [], [], []
+    for destination in destinations:
+        if not _DESTINATION_RE.match(destination):
+            malformed.append(destination)
+        elif not force and configs.get(destination, {}).get('locationCode'):
+            already_configured.append(destination)
+        else:
+            to_process.append(destination)
+    return to_process, already_configured, malformed
+
+
+def _buffer_stdout():
+    """Give redirected stdout a large buffer; a terminal stays line-buffered"""
+    if sys.stdout.isatty():
+        return
+    
+    sys.stdout.flush()
+    raw = io.FileIO(sys.stdout.fileno(), 'w', closefd=False)
+    sys.stdout = io.TextIOWrapper(
+        io.BufferedWriter(raw, buffer_size=STDOUT_BUFFER_SIZE),
+        encoding=sys.stdout.encoding,
+        errors=sys.stdout.errors
+    )
+
+
 def main():
     """Main function - orchestrates the entire workflow"""
+    parser = argparse.ArgumentParser(description="Extract ONE Line location codes for destinations")
+    parser.add_argument("destinations", nargs="*",
+                        help='destinations such as "PARIS, FRANCE" (default: destinations.txt)')
+    parser.add_argument("-n", "--workers", type=int, default=WORKERS,
+                        help="parallel browsers (default: URL_CHECKER_WORKERS or 1)")
+    parser.add_argument("-f", "--force", action="store_true",
+                        help="re-check destinations that already have a location code")
+    args = parser.parse_args()
+    
+    _buffer_stdout()
+    
     print("=" * 60)
     print("ONE Line URL Checker - Location Code Extractor")
     print("=" * 60)
     
+    config_file = get_config_file_path(CONFIG_FILE_NAME)
+    destinations_file = get_config_file_path(DESTINATIONS_FILE_NAME)
+    
     # Determine destination sources
     destinations = []
     
-    if len(sys.argv) > 1:
+    if args.destinations:
         # Command line arguments
-        destinations = sys.argv[1:]
+        destinations = args.destinations
         print(f"\n[INFO] Using {len(destinations)} destination(s) from command line")
     else:
         # Read from destinations.txt file
-        destinations_file = get_config_file_path(DESTINATIONS_FILE_NAME)
         destinations = load_destinations_from_file(destinations_file)
         
         if not destinations:
@@ -139,35 +202,46 @@ def main():
         print("  or create destinations.txt file with one city per line")
         return
     
-    print(f"\n[INFO] Processing {len(destinations)} destination(s)")
-    
     # Load existing configs (will initialize from destinations.txt if doesn't exist)
-    config_file = get_config_file_path(CONFIG_FILE_NAME)
-    destinations_file = get_config_file_path(DESTINATIONS_FILE_NAME)
     configs = load_configs(config_file, destinations_file)
     print(f"[INFO] Loaded {len(configs)} existing configurations")
     
-    # Setup browser
-    driver = setup_browser()
+    # Skip malformed and already configured destinations before starting a browser
+    destinations, already_configured, malformed = _partition_destinations(
+        destinations, configs, force=args.force
+    )
+    if already_configured:
+        print(f"[INFO] Skipping {len(already_configured)} destination(s) that already have a location code (use --force to re-check)")
+    for destination in malformed:
+        print(f"[WARNING] Skipping '{destination}': expected \"CITY, COUNTRY\" or \"CITY, REGION, COUNTRY\"")
+    
+    if not destinations:
+        print("\n[SUMMARY] Nothing to check")
+        return
+    
+    print(f"\n[INFO] Processing {len(destinations)} destination(s)")
+    
+    # Setup browser (parallel runs start one browser per worker instead)
+    driver = None if args.workers > 1 else setup_browser()
     
     try:
         # Process each destination
         new_configs = {}
         warnings = []
         
-        for destination in destinations:
-            config = process_destination(driver, destination)
-            
+        if driver is None:
+            results = process_destinations(destinations, args.workers)
+        else:
+            results = _process_serially(driver, destinations)
+        
+        for destination, config in results:
             if config:
-                # Check for zero results warning
-                has_results = config.get('has_results', True)
-                
-                # Remove has_results before saving (not part of config schema)
-                if 'has_results' in config:
-                    del config['has_results']
+                # Zero results warning flag; popped so it isn't saved (not part of config schema)
+                has_results = config.pop('has_results', True)
                 
                 new_configs[destination] = config
                 configs[destination] = config
+                mark_dirty(config_file, destination)
                 print(f"\n[SUCCESS] Configuration saved for: {destination}")
                 print(f"   Location Code: {config.get('locationCode', 'NOT FOUND')}")
                 print(f"   PODs: {config.get('pods', 'NOT FOUND')}")
@@ -181,12 +255,13 @@ def main():
                 print(f"   ERROR: Location code NOT FOUND")
                 print(f"   Please verify the city name format or try manually")
             
-            # Small delay between destinations
-            time.sleep(2)
+            # Serial runs emit each destination's output as one block; parallel
+            # workers print progress directly, so their lines can interleave
+            sys.stdout.flush()
         
         # Save updated configs
         if new_configs:
-            if save_configs(configs, config_file):
+            if flush_configs(config_file):
                 print(f"\n[SUMMARY] Successfully added {len(new_configs)} destination(s)")
                 for dest, conf in new_configs.items():
                     print(f"  • {dest}: {conf['locationCode']}")
@@ -200,10 +275,13 @@ def main():
             print("\n[SUMMARY] No new configurations to save")
     
     finally:
-        print("\n[CLEANUP] Closing browser...")
-        driver.quit()
+        if driver is not None:
+            print("\n[CLEANUP] Closing browser...")
+            sys.stdout.flush()
+            driver.quit()
         
-        # Generate error summary from all .txt files in error_checks
+        # Summarize the error files saved in this run
+        wait_for_error_writes()
         generate_error_summary()
     
     print("\n" + "=" * 60)